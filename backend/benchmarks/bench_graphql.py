@@ -0,0 +1,178 @@
+"""
+Benchmark graphql_to_postman.py phase by phase on synthetic schemas.
+
+Times GraphQLSchemaParser, create_postman_collection and
+save_postman_collection at each requested size and schema format, records
+their peak memory with tracemalloc and writes the results as JSON. The
+adversarial cases time the parser and the lazy definition index on text
+built to make the lexer and scanner patterns backtrack. Pass --baseline
+(e.g. graphql_baseline.json, committed next to this script) to fail when a
+phase's peak memory grows beyond --max-regression or its CPU time beyond
+--max-time-regression. Wall-clock times follow the machine's load and are
+only reported; CPU times are gated with a wider margin, ignoring increases
+under --min-seconds, since a backtracking pattern shows up as a many-fold
+slowdown anyway.
+
+Usage: python bench_graphql.py [--sizes 100 1000 5000] [--output results.json] [--baseline graphql_baseline.json]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+
+from bench_utils import compare_to_baseline, environment_info, measure, save_results
+from generate_graphql_schema import ADVERSARIAL_CASES, generate_adversarial_schema, generate_graphql_schema
+
+import graphql_to_postman
+
+
+@contextlib.contextmanager
+def quiet():
+    """Discard the converter's progress output while a phase runs"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def parse_schema(content, jobs=1):
+    with quiet():
+        return graphql_to_postman.GraphQLSchemaParser(content, jobs=jobs, cache_dir=None)
+
+
+def bench_size(types, output_format, workdir, args):
+    name = f"{types}_types_{output_format}"
+    output_file = os.path.join(workdir, f"collection_{name}.json")
+    content = generate_graphql_schema(output_format, types=types, fan_out=args.fan_out,
+                                      interface_density=args.interface_density, union_density=args.union_density,
+                                      inputs=args.inputs, recursive_inputs=args.recursive_inputs,
+                                      root_fields=args.root_fields)
+
+    phases = {}
+    parser, seconds, cpu_seconds, peak = measure(lambda: parse_schema(content, args.jobs), args.repeat)
+    phases['parse_schema'] = {"seconds": seconds, "cpu_seconds": cpu_seconds, "peak_bytes": peak}
+
+    budget = graphql_to_postman.SelectionBudget(max_fields=args.max_fields)
+
+    def create_collection():
+        converter = graphql_to_postman.GraphQLToPostmanConverter(parser, budget=budget, fragments=args.fragments)
+        with quiet():
+            return converter.create_postman_collection(name, args.jobs)
+
+    collection, seconds, cpu_seconds, peak = measure(create_collection, args.repeat)
+    phases['create_postman_collection'] = {"seconds": seconds, "cpu_seconds": cpu_seconds, "peak_bytes": peak}
+
+    _, seconds, cpu_seconds, peak = measure(
+        lambda: graphql_to_postman.save_postman_collection(collection, output_file), args.repeat)
+    phases['save_postman_collection'] = {"seconds": seconds, "cpu_seconds": cpu_seconds, "peak_bytes": peak}
+
+    return {
+        "name": name,
+        "types": types,
+        "format": output_format,
+        "schema_bytes": len(content),
+        "output_bytes": os.path.getsize(output_file),
+        "phases": phases,
+    }
+
+
+def bench_adversarial(case, args):
+    content = generate_adversarial_schema(case, args.adversarial_size)
+
+    def parse():
+        try:
+            return parse_schema(content)
+        except ValueError as e:
+            # Malformed cases measure how quickly the error is reported
+            return e
+
+    phases = {}
+    result, seconds, cpu_seconds, peak = measure(parse, args.repeat)
+    phases['parse_schema'] = {"seconds": seconds, "cpu_seconds": cpu_seconds, "peak_bytes": peak}
+    _, seconds, cpu_seconds, peak = measure(lambda: graphql_to_postman.index_schema_definitions(content), args.repeat)
+    phases['index_schema_definitions'] = {"seconds": seconds, "cpu_seconds": cpu_seconds, "peak_bytes": peak}
+
+    return {
+        "name": f"adversarial_{case}",
+        "schema_bytes": len(content),
+        "error": str(result) if isinstance(result, ValueError) else None,
+        "phases": phases,
+    }
+
+
+def print_case(case):
+    for phase, values in case['phases'].items():
+        print(f"  {phase:<28} {values['seconds']:8.3f}s  peak {values['peak_bytes'] / 1e6:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GraphQL to Postman conversion")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000],
+                        help="Object type counts to benchmark (default: 100 1000 5000)")
+    parser.add_argument('--formats', nargs='+', choices=['sdl', 'introspection'], default=['sdl', 'introspection'],
+                        help="Schema formats to benchmark (default: both)")
+    parser.add_argument('--fan-out', type=int, default=8, help="Fields per object type besides id and name")
+    parser.add_argument('--interface-density', type=float, default=0.2,
+                        help="Fraction of object types implementing an interface")
+    parser.add_argument('--union-density', type=float, default=0.05, help="Unions per object type")
+    parser.add_argument('--inputs', type=int, default=20, help="Filter input types")
+    parser.add_argument('--recursive-inputs', type=int, default=4, help="Self-referencing input types")
+    parser.add_argument('--root-fields', type=int, default=200, help="Query fields (mutations get half as many)")
+    parser.add_argument('--max-fields', type=int, default=500, help="--max-fields selection budget to benchmark")
+    parser.add_argument('--fragments', action='store_true', help="Benchmark the named-fragment output mode")
+    parser.add_argument('--jobs', type=int, default=1, help="Worker processes for parsing and conversion")
+    parser.add_argument('--adversarial-size', type=int, default=1000,
+                        help="Definitions in each adversarial case (0 skips them)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per phase; the fastest is kept (default: 3)")
+    parser.add_argument('--output', default='graphql_bench_results.json', help="Results file to write")
+    parser.add_argument('--baseline', help="Previous results file to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.5,
+                        help="With --baseline, exit with an error when a phase's peak memory grows by more than "
+                             "this fraction (default: 0.5 for 50%%)")
+    parser.add_argument('--max-time-regression', type=float, default=2.0,
+                        help="With --baseline, exit with an error when a phase's CPU time grows by more than "
+                             "this fraction (default: 2.0, i.e. three times the baseline)")
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help="Ignore CPU time increases smaller than this many seconds (default: 0.05)")
+    args = parser.parse_args()
+
+    results = {
+        "benchmark": "graphql_to_postman",
+        "environment": environment_info(),
+        "options": {
+            "fan_out": args.fan_out, "interface_density": args.interface_density,
+            "union_density": args.union_density, "inputs": args.inputs, "recursive_inputs": args.recursive_inputs,
+            "root_fields": args.root_fields, "max_fields": args.max_fields, "fragments": args.fragments,
+            "jobs": args.jobs, "adversarial_size": args.adversarial_size,
+        },
+        "cases": [],
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for types in args.sizes:
+            for output_format in args.formats:
+                print(f"[INFO] Benchmarking {types} types ({output_format})...")
+                case = bench_size(types, output_format, workdir, args)
+                print_case(case)
+                results['cases'].append(case)
+
+    if args.adversarial_size > 0:
+        for name in ADVERSARIAL_CASES:
+            print(f"[INFO] Benchmarking adversarial case '{name}'...")
+            case = bench_adversarial(name, args)
+            print_case(case)
+            results['cases'].append(case)
+
+    save_results(results, args.output)
+    print(f"[OUTPUT] Saved results to: {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.max_regression,
+                                          args.max_time_regression, args.min_seconds)
+        if regressions:
+            print(f"[ERROR] {len(regressions)} regression(s) beyond {args.max_regression:.0%} memory "
+                  f"or {args.max_time_regression:.0%} time")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark raml_to_postman.py phase by phase on synthetic specs.
+
+Times load_raml, build_postman_collection and save_postman_collection at
+each requested size, records their peak memory with tracemalloc and writes
+the results as JSON. Pass --baseline raml_baseline.json, committed next to
+this script and generated with the default options, to fail when a phase's
+peak memory grows beyond --max-regression or its CPU time beyond
+--max-time-regression; the gate works as in bench_graphql.py. Only the
+cases that were run are compared, so `--sizes 100 1000` gives a quick
+check against the same file. Keep the other options at the defaults the
+baseline was generated with, and regenerate it with
+--output raml_baseline.json when a change is expected to move the numbers.
+
+Usage: python bench_raml.py [--sizes 100 1000 10000] [--output results.json] [--baseline raml_baseline.json]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from bench_utils import compare_to_baseline, environment_info, measure, save_results
+from generate_raml_spec import generate_raml_spec
+
+import raml_to_postman
+
+
+def bench_size(endpoints, workdir, args):
+    spec_file = os.path.join(workdir, f"spec_{endpoints}.raml")
+    output_file = os.path.join(workdir, f"collection_{endpoints}.json")
+    with open(spec_file, 'w', encoding='utf-8') as f:
+        f.write(generate_raml_spec(endpoints, depth=args.depth, types=args.types,
+                                   recursive_types=args.recursive_types, responses=args.responses))
+
+    phases = {}
+    raml_data, seconds, cpu_seconds, peak = measure(
+        lambda: raml_to_postman.load_raml(spec_file, fast=args.fast_load), args.repeat)
+    phases['load_raml'] = {"seconds": seconds, "cpu_seconds": cpu_seconds, "peak_bytes": peak}
+
+    collection, seconds, cpu_seconds, peak = measure(
+        lambda: raml_to_postman.build_postman_collection(raml_data, args.original_request, args.jobs), args.repeat)
+    phases['build_postman_collection'] = {"seconds": seconds, "cpu_seconds": cpu_seconds, "peak_bytes": peak}
+
+    _, seconds, cpu_seconds, peak = measure(
+        lambda: raml_to_postman.save_postman_collection(collection, output_file), args.repeat)
+    phases['save_postman_collection'] = {"seconds": seconds, "cpu_seconds": cpu_seconds, "peak_bytes": peak}
+    del collection
+
+    if args.stream:
+        _, seconds, cpu_seconds, peak = measure(
+            lambda: raml_to_postman.stream_postman_collection(raml_data, output_file, args.original_request,
+                                                              args.jobs), args.repeat)
+        phases['stream_postman_collection'] = {"seconds": seconds, "cpu_seconds": cpu_seconds, "peak_bytes": peak}
+
+    return {
+        "name": f"{endpoints}_endpoints",
+        "endpoints": endpoints,
+        "output_bytes": os.path.getsize(output_file),
+        "phases": phases,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RAML to Postman conversion")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="Endpoint counts to benchmark (default: 100 1000 10000)")
+    parser.add_argument('--depth', type=int, default=3, help="Resource nesting depth of the synthetic specs")
+    parser.add_argument('--types', type=int, default=40, help="Named types in the synthetic specs")
+    parser.add_argument('--recursive-types', type=int, default=4, help="Self-referencing types")
+    parser.add_argument('--responses', type=int, default=3, help="Responses per method")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per phase; the fastest is kept (default: 3)")
+    parser.add_argument('--fast-load', action='store_true', help="Benchmark the safe YAML loader")
+    parser.add_argument('--original-request', default='full', help="--original-request mode to benchmark")
+    parser.add_argument('--jobs', type=int, default=1, help="Worker processes for extraction")
+    parser.add_argument('--stream', action='store_true', help="Also benchmark stream_postman_collection")
+    parser.add_argument('--output', default='raml_bench_results.json', help="Results file to write")
+    parser.add_argument('--baseline', help="Previous results file to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.5,
+                        help="With --baseline, exit with an error when a phase's peak memory grows by more than "
+                             "this fraction (default: 0.5 for 50%%)")
+    parser.add_argument('--max-time-regression', type=float, default=2.0,
+                        help="With --baseline, exit with an error when a phase's CPU time grows by more than "
+                             "this fraction (default: 2.0, i.e. three times the baseline)")
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help="Ignore CPU time increases smaller than this many seconds (default: 0.05)")
+    args = parser.parse_args()
+
+    results = {
+        "benchmark": "raml_to_postman",
+        "environment": environment_info(),
+        "options": {
+            "depth": args.depth, "types": args.types, "recursive_types": args.recursive_types,
+            "responses": args.responses, "fast_load": args.fast_load,
+            "original_request": args.original_request, "jobs": args.jobs,
+        },
+        "cases": [],
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for endpoints in args.sizes:
+            print(f"[INFO] Benchmarking {endpoints} endpoints...")
+            case = bench_size(endpoints, workdir, args)
+            for phase, values in case['phases'].items():
+                print(f"  {phase:<28} {values['seconds']:8.3f}s  peak {values['peak_bytes'] / 1e6:8.1f} MB")
+            results['cases'].append(case)
+
+    save_results(results, args.output)
+    print(f"[OUTPUT] Saved results to: {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.max_regression,
+                                          args.max_time_regression, args.min_seconds)
+        if regressions:
+            print(f"[ERROR] {len(regressions)} regression(s) beyond {args.max_regression:.0%} memory "
+                  f"or {args.max_time_regression:.0%} time")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Shared timing, memory and baseline helpers for the converter benchmarks."""
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def measure(func, repeat=1):
+    """
+    Run func `repeat` times and return (result, best_seconds,
+    best_cpu_seconds, peak_bytes). CPU seconds count this process only, so
+    they barely move when other processes compete for the machine but leave
+    out the work of --jobs worker processes. Timing runs without
+    tracemalloc; peak memory is taken from one extra traced run so tracing
+    overhead does not skew the times.
+    """
+    best = None
+    best_cpu = None
+    result = None
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        start_cpu = time.process_time()
+        result = func()
+        elapsed_cpu = time.process_time() - start_cpu
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        best_cpu = elapsed_cpu if best_cpu is None else min(best_cpu, elapsed_cpu)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, best, best_cpu, peak
+
+
+def environment_info():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+    }
+
+
+def save_results(results, output_file):
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+
+def compare_to_baseline(results, baseline_file, max_regression=None, max_time_regression=None, min_seconds=0.0):
+    """
+    Print each phase's time, CPU time and peak memory relative to a
+    baseline results file with the same layout. Returns the list of (case,
+    phase, metric, ratio) whose peak memory grew beyond 1 + max_regression
+    or whose CPU time grew beyond 1 + max_time_regression and by more than
+    min_seconds, which keeps the noise of very fast phases out of the gate.
+    Wall-clock times follow the machine's load, so they are shown but never
+    gated.
+    """
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    baseline_cases = {case['name']: case for case in baseline.get('cases', [])}
+
+    limits = {'seconds': None, 'cpu_seconds': max_time_regression, 'peak_bytes': max_regression}
+    regressions = []
+    for case in results['cases']:
+        base_case = baseline_cases.get(case['name'])
+        if not base_case:
+            print(f"[BASELINE] {case['name']}: not in baseline")
+            continue
+        for phase, values in case['phases'].items():
+            base_values = base_case['phases'].get(phase)
+            if not base_values:
+                continue
+            for metric, limit in limits.items():
+                if not base_values.get(metric) or metric not in values:
+                    continue
+                ratio = values[metric] / base_values[metric]
+                if metric == 'cpu_seconds' and values[metric] - base_values[metric] <= min_seconds:
+                    limit = None
+                flag = ""
+                if limit is not None and ratio > 1 + limit:
+                    regressions.append((case['name'], phase, metric, ratio))
+                    flag = "  <-- REGRESSION"
+                print(f"[BASELINE] {case['name']} {phase} {metric}: {ratio:.2f}x{flag}")
+    return regressions
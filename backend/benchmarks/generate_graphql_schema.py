@@ -0,0 +1,324 @@
+"""
+Generate deterministic synthetic GraphQL schemas, as SDL or as an
+introspection result, for benchmarking graphql_to_postman.py. Also
+generates adversarial SDL that stresses the lexer and definition scanner.
+
+Usage: python generate_graphql_schema.py <output_file> [--types N] [--format sdl|introspection] ...
+       python generate_graphql_schema.py <output_file> --adversarial CASE [--size N]
+"""
+import argparse
+import json
+import random
+
+SCALARS = ['String', 'Int', 'Float', 'Boolean', 'ID']
+STATUS_VALUES = ['ACTIVE', 'INACTIVE', 'PENDING', 'ARCHIVED']
+
+
+def _named(kind, name):
+    return {"kind": kind, "name": name, "ofType": None}
+
+
+def _non_null(type_ref):
+    return {"kind": "NON_NULL", "name": None, "ofType": type_ref}
+
+
+def _list_of(type_ref):
+    return {"kind": "LIST", "name": None, "ofType": type_ref}
+
+
+def _input_value(name, type_ref, default=None):
+    return {"name": name, "description": None, "type": type_ref, "defaultValue": default}
+
+
+def _field(name, type_ref, args=(), description=None):
+    return {"name": name, "description": description, "args": list(args), "type": type_ref,
+            "isDeprecated": False, "deprecationReason": None}
+
+
+def _type(kind, name, description=None, fields=None, input_fields=None, interfaces=None, possible_types=None,
+          enum_values=None):
+    return {
+        "kind": kind,
+        "name": name,
+        "description": description,
+        "fields": fields,
+        "inputFields": input_fields,
+        "interfaces": interfaces if kind in ('OBJECT', 'INTERFACE') else None,
+        "enumValues": [{"name": value, "description": None, "isDeprecated": False, "deprecationReason": None}
+                       for value in enum_values] if enum_values is not None else None,
+        "possibleTypes": possible_types,
+    }
+
+
+def generate_graphql_introspection(types=100, fan_out=8, interface_density=0.2, union_density=0.05, inputs=10,
+                                   recursive_inputs=2, root_fields=20, seed=0):
+    """
+    Return an introspection __schema with `types` object types of `fan_out`
+    fields each beyond their id and name. About fan_out / 2 fields of each
+    type point at other object types, half of those as lists, and every
+    fourth takes paging and filter arguments. `interface_density` of the
+    object types implement one of a pool of interfaces, and
+    types * union_density unions group random object types. The first
+    `recursive_inputs` of the `inputs` filter input types refer back to
+    themselves. Query gets `root_fields` fields and Mutation half as many.
+    The same arguments always produce the same schema.
+    """
+    rng = random.Random(seed)
+    types = max(1, types)
+    inputs = max(1, inputs)
+    object_names = [f"Type{index}" for index in range(types)]
+    input_names = [f"Filter{index}" for index in range(inputs)]
+    interface_names = [f"Node{index}" for index in range(max(1, round(types * interface_density / 10)))] \
+        if interface_density > 0 else []
+    union_names = [f"Result{index}" for index in range(round(types * union_density))]
+    abstract_names = interface_names + union_names
+
+    def ref(kind, name, required=False, is_list=False):
+        type_ref = _named(kind, name)
+        if is_list:
+            type_ref = _list_of(_non_null(type_ref))
+        return _non_null(type_ref) if required else type_ref
+
+    def paging_args():
+        return [_input_value("first", ref('SCALAR', 'Int'), "10"),
+                _input_value("after", ref('SCALAR', 'String')),
+                _input_value("filter", ref('INPUT_OBJECT', rng.choice(input_names)))]
+
+    schema_types = []
+    implementers = {name: [] for name in interface_names}
+    for index, name in enumerate(object_names):
+        fields = [_field("id", ref('SCALAR', 'ID', required=True)), _field("name", ref('SCALAR', 'String'))]
+        for number in range(fan_out):
+            args = paging_args() if number % 4 == 3 else []
+            roll = rng.random()
+            if roll < 0.45:
+                type_ref = ref('SCALAR', rng.choice(SCALARS), required=rng.random() < 0.3)
+            elif roll < 0.5:
+                type_ref = ref('ENUM', 'Status')
+            elif roll < 0.9 or not abstract_names:
+                type_ref = ref('OBJECT', rng.choice(object_names), is_list=rng.random() < 0.5)
+            else:
+                abstract = rng.choice(abstract_names)
+                type_ref = ref('INTERFACE' if abstract in implementers else 'UNION', abstract,
+                               is_list=rng.random() < 0.5)
+            fields.append(_field(f"field{number}", type_ref, args))
+        interfaces = []
+        if interface_names and rng.random() < interface_density:
+            interface_name = rng.choice(interface_names)
+            implementers[interface_name].append(name)
+            interfaces.append(ref('INTERFACE', interface_name))
+        schema_types.append(_type('OBJECT', name, f"Synthetic object type {index}", fields=fields,
+                                  interfaces=interfaces))
+
+    for name in interface_names:
+        fields = [_field("id", ref('SCALAR', 'ID', required=True)), _field("name", ref('SCALAR', 'String'))]
+        schema_types.append(_type('INTERFACE', name, fields=fields, interfaces=[],
+                                  possible_types=[ref('OBJECT', member) for member in implementers[name]]))
+    for name in union_names:
+        members = rng.sample(object_names, min(len(object_names), rng.randint(2, 4)))
+        schema_types.append(_type('UNION', name, possible_types=[ref('OBJECT', member) for member in members]))
+
+    for index, name in enumerate(input_names):
+        input_fields = [_input_value("query", ref('SCALAR', 'String')),
+                        _input_value("status", ref('ENUM', 'Status'), "ACTIVE"),
+                        _input_value("ids", ref('SCALAR', 'ID', is_list=True))]
+        if index + 1 < inputs:
+            input_fields.append(_input_value("nested", ref('INPUT_OBJECT', input_names[rng.randrange(index + 1, inputs)])))
+        if index < recursive_inputs:
+            input_fields.append(_input_value("and", ref('INPUT_OBJECT', name, is_list=True)))
+            input_fields.append(_input_value("not", ref('INPUT_OBJECT', name)))
+        schema_types.append(_type('INPUT_OBJECT', name, input_fields=input_fields))
+    schema_types.append(_type('ENUM', 'Status', enum_values=STATUS_VALUES))
+
+    def root_field_name(verb, index):
+        # Fields beyond one per type wrap around; a suffix keeps their names unique
+        target = object_names[index % types]
+        return f"{verb}{target}" if index < types else f"{verb}{target}_{index // types}"
+
+    queries = []
+    for index in range(root_fields):
+        target = object_names[index % types]
+        if index % 3 == 2:
+            queries.append(_field(root_field_name("list", index), ref('OBJECT', target, required=True, is_list=True),
+                                  paging_args()))
+        else:
+            queries.append(_field(root_field_name("get", index), ref('OBJECT', target),
+                                  [_input_value("id", ref('SCALAR', 'ID', required=True))]))
+    schema_types.append(_type('OBJECT', 'Query', fields=queries, interfaces=[]))
+    mutations = [_field(root_field_name("update", index), ref('OBJECT', object_names[index % types]),
+                        [_input_value("id", ref('SCALAR', 'ID', required=True)),
+                         _input_value("input", ref('INPUT_OBJECT', rng.choice(input_names), required=True))])
+                 for index in range(root_fields // 2)]
+    if mutations:
+        schema_types.append(_type('OBJECT', 'Mutation', fields=mutations, interfaces=[]))
+
+    return {
+        "queryType": {"name": "Query"},
+        "mutationType": {"name": "Mutation"} if mutations else None,
+        "subscriptionType": None,
+        "types": schema_types,
+        "directives": [],
+    }
+
+
+def _sdl_type_ref(type_ref):
+    if type_ref['kind'] == 'NON_NULL':
+        return _sdl_type_ref(type_ref['ofType']) + "!"
+    if type_ref['kind'] == 'LIST':
+        return "[" + _sdl_type_ref(type_ref['ofType']) + "]"
+    return type_ref['name']
+
+
+def _sdl_input_value(value):
+    default = f" = {value['defaultValue']}" if value.get('defaultValue') is not None else ""
+    return f"{value['name']}: {_sdl_type_ref(value['type'])}{default}"
+
+
+def introspection_to_sdl(schema):
+    """Render an introspection __schema as SDL, type by type in the same order"""
+    blocks = []
+    for graphql_type in schema['types']:
+        lines = []
+        if graphql_type.get('description'):
+            lines.append(f'"""{graphql_type["description"]}"""')
+        kind = graphql_type['kind']
+        name = graphql_type['name']
+        if kind in ('OBJECT', 'INTERFACE'):
+            keyword = 'type' if kind == 'OBJECT' else 'interface'
+            interfaces = [ref['name'] for ref in graphql_type.get('interfaces') or ()]
+            implements = f" implements {' & '.join(interfaces)}" if interfaces else ""
+            lines.append(f"{keyword} {name}{implements} {{")
+            for field in graphql_type['fields']:
+                args = f"({', '.join(_sdl_input_value(arg) for arg in field['args'])})" if field['args'] else ""
+                lines.append(f"  {field['name']}{args}: {_sdl_type_ref(field['type'])}")
+            lines.append("}")
+        elif kind == 'INPUT_OBJECT':
+            lines.append(f"input {name} {{")
+            lines.extend(f"  {_sdl_input_value(value)}" for value in graphql_type['inputFields'])
+            lines.append("}")
+        elif kind == 'ENUM':
+            lines.append(f"enum {name} {{ {' '.join(value['name'] for value in graphql_type['enumValues'])} }}")
+        elif kind == 'UNION':
+            lines.append(f"union {name} = {' | '.join(ref['name'] for ref in graphql_type['possibleTypes'])}")
+        elif kind == 'SCALAR':
+            lines.append(f"scalar {name}")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate_graphql_schema(output_format='sdl', **options):
+    """Return schema text as SDL or as an introspection response ({"data": {"__schema": ...}})"""
+    schema = generate_graphql_introspection(**options)
+    if output_format == 'introspection':
+        return json.dumps({"data": {"__schema": schema}}, indent=2)
+    return introspection_to_sdl(schema)
+
+
+def _adversarial_comments(size):
+    # Long runs of blank lines, commas and comments between and inside definitions
+    filler = "\n" * 50 + ",,,, " * 20 + "\n" + "# comment line with { braces ( and \"quotes\n" * 50
+    blocks = [f"{filler}type Type{index} {{{filler}  id: ID!{filler}  next: Type{(index + 1) % size}\n}}"
+              for index in range(size)]
+    return "\n".join(blocks) + "\ntype Query { first: Type0 }\n"
+
+
+def _adversarial_strings(size):
+    # Descriptions full of escaped quotes and block strings with escaped triple quotes
+    quoted = '\\"' * 200
+    block = 'text \\""" more "" quotes ' * 40
+    blocks = [f'"""{block}"""\ntype Type{index} {{\n  "{quoted}"\n  id: ID!\n'
+              f'  "{quoted}" name(arg: String = "{quoted}"): String\n}}'
+              for index in range(size)]
+    return "\n".join(blocks) + "\ntype Query { first: Type0 }\n"
+
+
+def _adversarial_deep_defaults(size):
+    # Defaults nested deeper than the definition scanner matches in one go,
+    # next to many descriptions in the same body
+    nested = "1"
+    for depth in range(12):
+        nested = f"{{level{depth}: [{nested}, {{x: \"}}\"}}]}}"
+    fields = "\n".join(f'  """Field {number}"""\n  field{number}: Int' for number in range(30))
+    blocks = [f"type Type{index} {{\n  deep(value: Input = {nested}): Int\n{fields}\n}}" for index in range(size)]
+    return "input Input { value: Int }\n" + "\n".join(blocks) + "\ntype Query { first: Type0 }\n"
+
+
+def _adversarial_unterminated(size):
+    # A large valid schema whose last description never closes, so every
+    # pattern has to fail at the end of the text
+    text = _adversarial_strings(size)
+    return text + '\n"""never closed\ntype Broken { id: ID! }\n' + '"' * 1000 + "\n"
+
+
+def _adversarial_one_line(size):
+    # The whole schema on one line with legacy comma separated interfaces
+    blocks = [f"type Type{index} implements NodeA, NodeB {{ id: ID!, name: String, next: Type{(index + 1) % size} }}"
+              for index in range(size)]
+    return "interface NodeA { id: ID! } interface NodeB { name: String } " + " ".join(blocks) + \
+        " type Query { first: Type0 }"
+
+
+def _adversarial_wide_type(size):
+    # One type with an enormous body of fields with arguments
+    fields = "\n".join(f"  field{number}(first: Int = {number}, filter: [String!] = [\"a\", \"b\"]): Wide"
+                       for number in range(size * 20))
+    return f"type Wide {{\n  id: ID!\n{fields}\n}}\ntype Query {{ wide: Wide }}\n"
+
+
+def _adversarial_trailing_whitespace(size):
+    # Definitions followed by a long tail of commas, comments, indentation
+    # and blank lines, ending in whitespace with nothing after it
+    blocks = [f"type Type{index} {{ id: ID! next: Type{(index + 1) % size} }}" for index in range(size)]
+    tail = (",, \t\n" + "# trailing comment\n" + "   \n" * 20 + "\n" * 20) * size
+    return "\n".join(blocks) + "\ntype Query { first: Type0 }\n" + tail
+
+
+ADVERSARIAL_CASES = {
+    'comments': _adversarial_comments,
+    'strings': _adversarial_strings,
+    'deep_defaults': _adversarial_deep_defaults,
+    'unterminated': _adversarial_unterminated,
+    'one_line': _adversarial_one_line,
+    'wide_type': _adversarial_wide_type,
+    'trailing_whitespace': _adversarial_trailing_whitespace,
+}
+
+
+def generate_adversarial_schema(case, size=200):
+    """Return the SDL text of an adversarial case with about `size` definitions"""
+    return ADVERSARIAL_CASES[case](max(1, size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic GraphQL schema")
+    parser.add_argument('output_file', help="Schema file to write")
+    parser.add_argument('--format', choices=['sdl', 'introspection'], default='sdl', help="Output format")
+    parser.add_argument('--types', type=int, default=100, help="Number of object types")
+    parser.add_argument('--fan-out', type=int, default=8, help="Fields per object type besides id and name")
+    parser.add_argument('--interface-density', type=float, default=0.2,
+                        help="Fraction of object types implementing an interface")
+    parser.add_argument('--union-density', type=float, default=0.05, help="Unions per object type")
+    parser.add_argument('--inputs', type=int, default=10, help="Number of filter input types")
+    parser.add_argument('--recursive-inputs', type=int, default=2, help="How many input types reference themselves")
+    parser.add_argument('--root-fields', type=int, default=20, help="Query fields (mutations get half as many)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--adversarial', choices=sorted(ADVERSARIAL_CASES),
+                        help="Write an adversarial SDL case instead of a regular schema")
+    parser.add_argument('--size', type=int, default=200, help="Definitions in the adversarial case")
+    args = parser.parse_args()
+
+    if args.adversarial:
+        schema = generate_adversarial_schema(args.adversarial, args.size)
+    else:
+        schema = generate_graphql_schema(args.format, types=args.types, fan_out=args.fan_out,
+                                         interface_density=args.interface_density,
+                                         union_density=args.union_density, inputs=args.inputs,
+                                         recursive_inputs=args.recursive_inputs, root_fields=args.root_fields,
+                                         seed=args.seed)
+    with open(args.output_file, 'w', encoding='utf-8') as f:
+        f.write(schema)
+    print(f"[SUCCESS] Wrote synthetic GraphQL schema to: {args.output_file}")
+
+
+if __name__ == "__main__":
+    main()
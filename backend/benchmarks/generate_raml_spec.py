@@ -0,0 +1,104 @@
+"""
+Generate deterministic synthetic RAML specifications for benchmarking
+raml_to_postman.py.
+
+Usage: python generate_raml_spec.py <output_file> [--endpoints N] [--depth D] ...
+"""
+import argparse
+import random
+
+HTTP_METHODS = ['get', 'post', 'put', 'patch', 'delete']
+PRIMITIVES = ['string', 'integer', 'number', 'boolean', 'datetime', 'date']
+
+
+def generate_raml_spec(endpoints=100, depth=2, methods_per_resource=2, types=20, recursive_types=2,
+                       responses=2, properties=6, seed=0):
+    """
+    Return the text of a RAML 1.0 spec with roughly `endpoints` operations.
+    Operations are spread over chains of nested resources `depth` levels
+    deep, each resource carrying `methods_per_resource` methods. Bodies and
+    responses reference `types` named object types, the first
+    `recursive_types` of which refer back to themselves. The same arguments
+    always produce the same text.
+    """
+    rng = random.Random(seed)
+    methods_per_resource = max(1, min(methods_per_resource, len(HTTP_METHODS)))
+    depth = max(1, depth)
+    type_names = [f"Type{index}" for index in range(max(1, types))]
+
+    lines = [
+        "#%RAML 1.0",
+        f"title: Synthetic API {endpoints}",
+        "version: v1",
+        "baseUri: https://api.example.com/{version}",
+        "types:",
+    ]
+    for index, type_name in enumerate(type_names):
+        lines.append(f"  {type_name}:")
+        lines.append("    type: object")
+        lines.append("    properties:")
+        for prop in range(properties):
+            lines.append(f"      field{prop}: {rng.choice(PRIMITIVES)}")
+        if index < recursive_types:
+            lines.append(f"      parent: {type_name}")
+            lines.append(f"      children: {type_name}[]")
+        if index + 1 < len(type_names):
+            # Link to a later type so examples nest a few levels
+            lines.append(f"      related: {type_names[rng.randrange(index + 1, len(type_names))]}")
+
+    resource_count = -(-endpoints // methods_per_resource)
+    chains = -(-resource_count // depth)
+    emitted = 0
+    for chain in range(chains):
+        for level in range(depth):
+            if emitted >= resource_count:
+                break
+            indent = "  " * level
+            segment = f"/resource{chain}" if level == 0 else ("/{id" + str(level) + "}" if level % 2 else f"/items{level}")
+            lines.append(f"{indent}{segment}:")
+            for method in HTTP_METHODS[:methods_per_resource]:
+                type_name = rng.choice(type_names)
+                lines.append(f"{indent}  {method}:")
+                lines.append(f"{indent}    description: {method.upper()} on resource {chain}.{level}")
+                if method == 'get':
+                    lines.append(f"{indent}    queryParameters:")
+                    lines.append(f"{indent}      page:")
+                    lines.append(f"{indent}        type: integer")
+                    lines.append(f"{indent}        required: false")
+                else:
+                    lines.append(f"{indent}    body:")
+                    lines.append(f"{indent}      application/json:")
+                    lines.append(f"{indent}        type: {type_name}")
+                lines.append(f"{indent}    responses:")
+                for response in range(responses):
+                    status = 200 if response == 0 else 400 + response - 1
+                    lines.append(f"{indent}      {status}:")
+                    lines.append(f"{indent}        body:")
+                    lines.append(f"{indent}          application/json:")
+                    lines.append(f"{indent}            type: {type_name if response == 0 else 'string'}")
+            emitted += 1
+
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic RAML spec")
+    parser.add_argument('output_file', help="RAML file to write")
+    parser.add_argument('--endpoints', type=int, default=100, help="Approximate number of operations")
+    parser.add_argument('--depth', type=int, default=2, help="Nesting depth of resource chains")
+    parser.add_argument('--methods-per-resource', type=int, default=2, help="Methods per resource (1-5)")
+    parser.add_argument('--types', type=int, default=20, help="Number of named types")
+    parser.add_argument('--recursive-types', type=int, default=2, help="How many types reference themselves")
+    parser.add_argument('--responses', type=int, default=2, help="Documented responses per method")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    spec = generate_raml_spec(args.endpoints, args.depth, args.methods_per_resource, args.types,
+                              args.recursive_types, args.responses, seed=args.seed)
+    with open(args.output_file, 'w', encoding='utf-8') as f:
+        f.write(spec)
+    print(f"[SUCCESS] Wrote synthetic RAML spec to: {args.output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Long-lived conversion worker for the Express backend.
+
+Reads one JSON request per line on stdin and writes one JSON response per
+line on stdout, so interpreter startup, imports and parsed schemas are paid
+for once per worker instead of once per upload. Progress messages from the
+converters go to stderr.
+
+Request:  {"id": 1, "kind": "raml" | "graphql", "input": "<file>", "options": {...}}
+Response: {"id": 1, "ok": true, "collection": {...}, "seconds": 0.42}
+          {"id": 1, "ok": false, "error": "..."}
+
+Options use the converters' long command line option names with
+underscores, e.g. {"original_request": "slim"} or {"endpoint_url": "...",
+"max_fields": 100}.
+
+Usage: python conversion_worker.py [--raml-cache-dir DIR] [--memory-cache N]
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+
+import graphql_to_postman
+import raml_to_postman
+
+CONVERSION_KINDS = ('raml', 'graphql')
+
+
+def convert(request, schema_cache, raml_cache_dir=None, allow_includes=False):
+    """Run one request and return its collection"""
+    kind = request.get('kind')
+    input_file = request.get('input')
+    options = request.get('options') or {}
+    if kind not in CONVERSION_KINDS:
+        raise ValueError(f"Unknown kind {kind!r}, expected one of: {', '.join(CONVERSION_KINDS)}")
+    if not isinstance(input_file, str) or not input_file:
+        raise ValueError("Request needs an 'input' file path")
+    if not isinstance(options, dict):
+        raise ValueError("'options' must be a JSON object")
+
+    if kind == 'raml':
+        if raml_cache_dir:
+            options = {'cache_dir': raml_cache_dir, **options}
+        if not allow_includes:
+            # Inputs are uploads; their directory holds other uploads too
+            options = {**options, 'no_includes': True}
+        return raml_to_postman.convert_raml(input_file, options)
+    return graphql_to_postman.convert_graphql(input_file, options, schema_cache)
+
+
+def handle_request(line, schema_cache, raml_cache_dir=None, allow_includes=False):
+    """Return the response line for one request line; failures become error responses"""
+    request_id = None
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        request_id = request.get('id')
+        start = time.perf_counter()
+        collection = convert(request, schema_cache, raml_cache_dir, allow_includes)
+        return json.dumps({"id": request_id, "ok": True, "collection": collection,
+                           "seconds": round(time.perf_counter() - start, 3)})
+    except Exception as e:
+        print(f"[ERROR] Request {request_id}: {str(e)}", file=sys.stderr)
+        return json.dumps({"id": request_id, "ok": False, "error": str(e)})
+
+
+def serve(schema_cache, raml_cache_dir=None, allow_includes=False, requests=sys.stdin, responses=sys.stdout):
+    """Answer requests until stdin is closed"""
+    # The converters print progress; keep it off the response stream
+    with contextlib.redirect_stdout(sys.stderr):
+        for line in iter(requests.readline, ''):
+            if not line.strip():
+                continue
+            responses.write(handle_request(line, schema_cache, raml_cache_dir, allow_includes) + "\n")
+            responses.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve RAML and GraphQL conversions as JSON lines on stdin/stdout")
+    parser.add_argument('--raml-cache-dir', metavar='DIR',
+                        help="Cache parsed RAML documents in DIR unless a request sets its own cache_dir")
+    parser.add_argument('--allow-includes', action='store_true',
+                        help="Let RAML inputs use !include and uses: within their own directory. Off by default "
+                             "because inputs are uploads")
+    parser.add_argument('--memory-cache', type=int, default=8, metavar='N',
+                        help="Keep the N most recently parsed GraphQL schemas in memory (default: 8, 0 to disable)")
+    args = parser.parse_args()
+
+    print("[INFO] Conversion worker ready", file=sys.stderr)
+    try:
+        serve(graphql_to_postman.SchemaMemoryCache(args.memory_cache), args.raml_cache_dir, args.allow_includes)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
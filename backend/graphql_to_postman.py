@@ -1,9 +1,20 @@
+import argparse
+import gc
+import glob
+import hashlib
 import json
+import os
+import pickle
 import re
 import sys
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass, field
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Tuple, Union
+from dataclasses import asdict, dataclass, field
 from enum import Enum
+from fnmatch import fnmatchcase, translate
 from urllib.parse import urlparse
 
 
@@ -18,18 +29,28 @@ class GraphQLTypeKind(Enum):
     NON_NULL = "NON_NULL"
 
 
-@dataclass
+@dataclass(slots=True)
+class GraphQLArgument:
+    name: str
+    type_name: str
+    required: bool = False
+    default: Any = None
+
+
+@dataclass(slots=True)
 class GraphQLField:
     name: str
     type_name: str
     description: Optional[str] = None
-    args: Dict[str, Any] = field(default_factory=dict)
+    args: Tuple[GraphQLArgument, ...] = ()
     is_required: bool = False
     is_list: bool = False
     deprecated: bool = False
+    # Scalar, enum or unknown type, selected by name alone. Resolved once the schema is parsed.
+    is_leaf: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphQLType:
     name: str
     kind: GraphQLTypeKind
@@ -41,13 +62,554 @@ class GraphQLType:
     possible_types: List[str] = field(default_factory=list)
 
 
+@dataclass
+class SelectionBudget:
+    """
+    Limits on the selection set generated for each operation. Rules are
+    "Type" or "Type.field" patterns and may use * wildcards.
+    """
+    max_fields: Optional[int] = 500
+    max_list_nesting: Optional[int] = None
+    list_size: int = 10
+    include: List[str] = field(default_factory=list)
+    exclude: List[str] = field(default_factory=list)
+
+
+@dataclass
+class OperationFilter:
+    """Root field name patterns, with * wildcards, choosing the operations to generate"""
+    include: List[str] = field(default_factory=list)
+    exclude: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        # One regex per list, as root types can have thousands of fields
+        self._include = re.compile('|'.join(map(translate, self.include))) if self.include else None
+        self._exclude = re.compile('|'.join(map(translate, self.exclude))) if self.exclude else None
+
+    def matches(self, name: str) -> bool:
+        if self._include is not None and not self._include.match(name):
+            return False
+        return self._exclude is None or not self._exclude.match(name)
+
+
+@dataclass
+class OperationCost:
+    """Selected fields, and estimated result nodes assuming list_size items per list"""
+    fields: int
+    cost: int
+    nested_lists: int = 0
+
+
+@dataclass
+class SelectionNode:
+    """A type being selected while filling a selection set breadth first"""
+    type_name: str
+    depth: int
+    list_level: int
+    credit: int = 0
+    selected: Dict[str, Any] = field(default_factory=dict)
+    fragments: Dict[str, Any] = field(default_factory=dict)
+
+
+# Skips whitespace, commas and comments, then captures one token, or an
+# empty string at the end of the text. The skipped runs only match whole and
+# every position matches something, so tokenizing is a single left-to-right
+# pass even when the text ends in whitespace or comments.
+TOKEN_PATTERN = re.compile(r'''
+    (?:[\s,\ufeff]+(?![\s,\ufeff])|\#[^\n\r]*(?![^\n\r]))*
+    (
+        """(?:\\"""|(?!""")[\s\S])*"""
+      | "(?:\\.|[^"\\\n\r])*"
+      | -?[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?
+      | [_A-Za-z][_0-9A-Za-z]*
+      | \.\.\.
+      | [\S]
+      | \Z
+    )
+''', re.VERBOSE)
+
+NAME_START = frozenset('_ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz')
+PUNCTUATORS = frozenset(['!', '$', '&', '(', ')', '...', ':', '=', '@', '[', ']', '{', '|', '}'])
+
+# Marks the end of the token list so lookahead never runs off the end
+EOF_TOKEN = ''
+
+
+def tokenize_schema(content: str) -> List[str]:
+    """Split SDL into tokens, dropping whitespace, commas and comments"""
+    tokens = TOKEN_PATTERN.findall(content)
+    # Drop the empty matches at the end of the text
+    while tokens and not tokens[-1]:
+        tokens.pop()
+    tokens.append(EOF_TOKEN)
+    return tokens
+
+
+def block_string_value(raw: str) -> str:
+    """Dedent a triple-quoted description the way the GraphQL spec does"""
+    lines = raw[3:-3].replace('\\"""', '"""').splitlines()
+    indents = [len(line) - len(line.lstrip(' \t')) for line in lines[1:] if line.strip()]
+    common = min(indents) if indents else 0
+    lines = lines[:1] + [line[common:] for line in lines[1:]]
+    while lines and not lines[0].strip():
+        lines.pop(0)
+    while lines and not lines[-1].strip():
+        lines.pop()
+    return '\n'.join(lines)
+
+
+def string_value(raw: str) -> str:
+    if raw.startswith('"""'):
+        return block_string_value(raw)
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw[1:-1]
+
+
+# Only strings, comments, braces and parentheses matter when looking for the
+# end of a top-level definition. Each match skips straight to the next of
+# those and captures the character when it is a brace or parenthesis.
+BOUNDARY_PATTERN = re.compile(r'''
+    [^"\#{}()]*
+    (?:
+        """(?:\\"""|(?!""")[\s\S])*"""
+      | "(?:\\.|[^"\\\n\r])*"
+      | \#[^\n\r]*
+      | ([{}()])
+    )
+''', re.VERBOSE)
+
+
+def split_schema_definitions(content: str, parts: int) -> List[tuple]:
+    """
+    Split SDL into at most `parts` chunks of whole top-level definitions,
+    returning (chunk, first_line) pairs. A chunk only ends right after a
+    closing brace outside any braces or parentheses, which always ends a
+    type, input, enum, interface or schema body.
+    """
+    target = max(1, len(content) // max(1, parts))
+    chunks = []
+    start = 0
+    line = 1
+    depth = 0
+    pos = 0
+    while True:
+        # A failed match means no boundary is left; the rest joins the last chunk.
+        # finditer would retry at every following position instead.
+        match = BOUNDARY_PATTERN.match(content, pos)
+        if match is None:
+            break
+        pos = match.end()
+        char = match.group(1)
+        if char is None:
+            continue
+        if char in '{(':
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 0 and char == '}' and match.end() - start >= target:
+            chunks.append((content[start:match.end()], line))
+            line += content.count('\n', start, match.end())
+            start = match.end()
+    if content[start:].strip() or not chunks:
+        chunks.append((content[start:], line))
+    return chunks
+
+
+DEFINITION_KEYWORDS = frozenset(['type', 'interface', 'input', 'enum', 'union', 'scalar', 'schema', 'directive'])
+
+# Tokens that put a following name in a type name position, where a keyword
+# such as `type` is just a name and cannot start a definition
+NAME_POSITION_TOKENS = frozenset(['=', '|', '&', '@', 'implements', 'extend'])
+
+# One token of the text between top-level definition bodies: a name, a
+# description, a comment, an opening brace or parenthesis, or punctuation.
+# Comments are skipped with the whitespace, so a run of them is not
+# rescanned by SIMPLE_DEFINITION_PATTERN once per comment.
+HEADER_PATTERN = re.compile(r'''
+    (?:[\s,\ufeff]+(?![\s,\ufeff])|\#[^\n\r]*(?![^\n\r]))*
+    (?:
+        ([_A-Za-z][_0-9A-Za-z]*)
+      | ("""(?:\\"""|(?!""")[\s\S])*"""|"(?:\\.|[^"\\\n\r])*")
+      | \#[^\n\r]*
+      | ([{(])
+      | ([^\s,{("\#_A-Za-z]+)
+    )
+''', re.VERBOSE)
+
+
+def _bracketed(inner: str = '') -> str:
+    """Pattern for a bracketed span whose own nested brackets match inner"""
+    # Runs and comments only match whole, so a failed match backtracks linearly
+    return (r'[{(](?:[^"\#{}()]+(?=["\#{}()])'
+            r'|"""(?:\\"""|(?!""")[\s\S])*"""'
+            r'|"(?:\\.|[^"\\\n\r])*"(?!")'
+            r'|\#[^\n\r]*(?![^\n\r])' + (f'|{inner}' if inner else '') + r')*[})]')
+
+
+# A body or argument list with brackets nested up to three deep, in one match
+BRACKETS_PATTERN = re.compile(_bracketed(_bracketed(_bracketed())))
+
+# The common header "[description] [extend] type Name [implements A & B] {",
+# up to its body. Anything else goes through HEADER_PATTERN token by token.
+SIMPLE_DEFINITION_PATTERN = re.compile(r'''
+    (?:[\s,\ufeff]+(?![\s,\ufeff])|\#[^\n\r]*(?![^\n\r]))*
+    (?P<start>)
+    (?:
+        (?:"""(?:\\"""|(?!""")[\s\S])*"""|"(?:\\.|[^"\\\n\r])*"(?!"))
+        (?:[\s,]+(?![\s,])|\#[^\n\r]*(?![^\n\r]))*
+    )?
+    (?P<extend>extend[\s,]+)?
+    (?P<keyword>type|interface|input|enum)[\s,]+
+    (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+    (?:[\s,]+implements[\s,]+(?:&[\s,]*)?
+       (?P<interfaces>[_A-Za-z][_0-9A-Za-z]*(?:[\s,]*&[\s,]*[_A-Za-z][_0-9A-Za-z]*)*))?
+    [\s,]*(?=\{)
+''', re.VERBOSE)
+INTERFACE_NAME_PATTERN = re.compile(r'[_A-Za-z][_0-9A-Za-z]*')
+
+
+def index_schema_definitions(content: str) -> List[tuple]:
+    """
+    Find the top-level definitions of SDL without parsing their bodies,
+    returning (start, keyword, name, is_extension, interfaces) in source
+    order. A definition's text runs from its start, which includes its
+    description, up to the next definition's start. Schema and directive
+    definitions have no name.
+    """
+    definitions = []
+    current = None
+    previous = None
+    description = None
+    in_implements = False
+    pos = 0
+    end = len(content)
+    while pos < end:
+        if previous in (None, '}') and description is None:
+            simple = SIMPLE_DEFINITION_PATTERN.match(content, pos)
+            brackets = simple and BRACKETS_PATTERN.match(content, simple.end())
+            if brackets:
+                interfaces = simple.group('interfaces')
+                current = [simple.start('start'), simple.group('keyword'), simple.group('name'),
+                           simple.group('extend') is not None,
+                           INTERFACE_NAME_PATTERN.findall(interfaces) if interfaces else []]
+                definitions.append(current)
+                in_implements = False
+                pos = brackets.end()
+                continue
+        match = HEADER_PATTERN.match(content, pos)
+        if match is None:
+            break
+        pos = match.end()
+        name, string, bracket, punctuator = match.groups()
+        if name is not None:
+            if current is not None and current[1] is None and name in DEFINITION_KEYWORDS:
+                current[1] = name
+            elif current is not None and current[2] is None and current[1] not in (None, 'schema', 'directive'):
+                current[2] = name
+            elif (name in DEFINITION_KEYWORDS or name == 'extend') and previous not in NAME_POSITION_TOKENS:
+                extend = name == 'extend'
+                current = [match.start(1) if description is None else description,
+                           None if extend else name, None, extend, []]
+                definitions.append(current)
+                description = None
+                in_implements = False
+            elif name == 'implements':
+                in_implements = True
+            elif in_implements and previous != '@':
+                current[4].append(name)
+            previous = name
+        elif string is not None:
+            if description is None:
+                description = match.start(2)
+            previous = '"'
+        elif bracket is not None:
+            # Skip the body, or a parenthesized argument list, to its closing bracket
+            in_implements = False
+            brackets = BRACKETS_PATTERN.match(content, match.start(3))
+            depth = 1
+            if brackets:
+                pos = brackets.end()
+                depth = 0
+            while depth:
+                boundary = BOUNDARY_PATTERN.match(content, pos)
+                if boundary is None:
+                    pos = end
+                    break
+                pos = boundary.end()
+                char = boundary.group(1)
+                if char is not None:
+                    depth += 1 if char in '{(' else -1
+            previous = '}' if bracket == '{' else ')'
+        elif punctuator is not None:
+            if '@' in punctuator:
+                in_implements = False
+            previous = punctuator[-1]
+    return [tuple(definition) for definition in definitions]
+
+
+# Scalars every GraphQL server provides. Introspection results list them as
+# types, but an SDL file never declares them.
+SPECIFIED_SCALARS = frozenset(['String', 'Int', 'Float', 'Boolean', 'ID'])
+
+
+def is_json_schema(content: str) -> bool:
+    return content.lstrip('\ufeff \t\r\n').startswith('{')
+
+
+def parse_introspection(content: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the __schema object when content is an introspection result,
+    either bare or wrapped in a {"data": ...} response. Returns None for SDL.
+    """
+    if not is_json_schema(content):
+        return None
+    with paused_gc():
+        document = json.loads(content.lstrip('\ufeff'))
+    if isinstance(document.get('data'), dict):
+        document = document['data']
+    if not isinstance(document.get('__schema'), dict):
+        raise ValueError("JSON schema file has no __schema introspection result")
+    return document['__schema']
+
+
+def unwrap_type_ref(type_ref: Dict[str, Any]) -> tuple:
+    """Return (named type, is_required, is_list) for an introspection ofType chain"""
+    is_required = type_ref['kind'] == 'NON_NULL'
+    if is_required:
+        type_ref = type_ref['ofType']
+    is_list = type_ref['kind'] == 'LIST'
+    while type_ref.get('ofType'):
+        type_ref = type_ref['ofType']
+    return type_ref['name'], is_required, is_list
+
+
+def introspection_field(field_data: Dict[str, Any]) -> GraphQLField:
+    type_name, is_required, is_list = unwrap_type_ref(field_data['type'])
+    args = []
+    for arg in field_data.get('args') or ():
+        arg_type, arg_required, _ = unwrap_type_ref(arg['type'])
+        args.append(GraphQLArgument(sys.intern(arg['name']), sys.intern(arg_type), arg_required,
+                                    arg.get('defaultValue')))
+    return GraphQLField(
+        name=sys.intern(field_data['name']),
+        type_name=sys.intern(type_name),
+        description=field_data.get('description'),
+        args=tuple(args),
+        is_required=is_required,
+        is_list=is_list,
+        deprecated=bool(field_data.get('isDeprecated'))
+    )
+
+
+def introspection_definitions(schema: Dict[str, Any]) -> tuple:
+    """
+    Build the same ([(GraphQLType, is_extension)], [(operation, type_name)])
+    lists the SDL parser produces, straight from an introspection __schema.
+    """
+    definitions = []
+    for type_data in schema.get('types') or ():
+        name = type_data['name']
+        if name.startswith('__') or name in SPECIFIED_SCALARS:
+            continue
+        graphql_type = GraphQLType(
+            name=sys.intern(name),
+            kind=GraphQLTypeKind(type_data['kind']),
+            description=type_data.get('description')
+        )
+        graphql_type.fields = [introspection_field(f) for f in type_data.get('fields') or ()]
+        graphql_type.input_fields = [introspection_field(f) for f in type_data.get('inputFields') or ()]
+        graphql_type.enum_values = [value['name'] for value in type_data.get('enumValues') or ()]
+        graphql_type.interfaces = [sys.intern(ref['name']) for ref in type_data.get('interfaces') or ()]
+        graphql_type.possible_types = [sys.intern(ref['name']) for ref in type_data.get('possibleTypes') or ()]
+        definitions.append((graphql_type, False))
+    
+    schema_roots = []
+    for operation in ('query', 'mutation', 'subscription'):
+        root = schema.get(f'{operation}Type')
+        schema_roots.append((operation, root['name'] if root else None))
+    return definitions, schema_roots
+
+
+# Bump when parsing changes what ends up in GraphQLSchemaParser.types, so
+# cached schemas from older versions are parsed again
+GRAPHQL_PARSER_VERSION = 1
+DEFAULT_SCHEMA_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'graphql_to_postman')
+DEFAULT_SCHEMA_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def schema_cache_path(content: Union[str, List[tuple]], cache_dir: str) -> str:
+    """Return the cache file for a schema's text, or for a list of (file, text) sources"""
+    digest = hashlib.sha256()
+    digest.update(f"{GRAPHQL_PARSER_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:".encode('utf-8'))
+    if isinstance(content, str):
+        digest.update(content.encode('utf-8'))
+    else:
+        for _, text in content:
+            data = text.encode('utf-8')
+            digest.update(f"{len(data)}:".encode('utf-8'))
+            digest.update(data)
+    return os.path.join(cache_dir, digest.hexdigest() + '.pickle')
+
+
+def _pack_field(graphql_field: GraphQLField) -> tuple:
+    args = tuple((arg.name, arg.type_name, arg.required, arg.default) for arg in graphql_field.args)
+    return (graphql_field.name, graphql_field.type_name, graphql_field.description, args,
+            graphql_field.is_required, graphql_field.is_list, graphql_field.deprecated)
+
+
+def _unpack_field(packed: tuple) -> GraphQLField:
+    name, type_name, description, args, is_required, is_list, deprecated = packed
+    return GraphQLField(name, type_name, description, tuple(GraphQLArgument(*arg) for arg in args),
+                        is_required, is_list, deprecated)
+
+
+def pack_schema_types(types: Dict[str, GraphQLType]) -> tuple:
+    """
+    Flatten parsed types into plain tuples for the schema cache. Unlike
+    pickled dataclasses they load the same whether this file was imported
+    or run as a script, and are smaller and quicker to load.
+    """
+    return tuple(_pack_type(t) for t in types.values())
+
+
+def _pack_type(t: GraphQLType) -> tuple:
+    return (t.name, t.kind.value, t.description, tuple(_pack_field(f) for f in t.fields), tuple(t.enum_values),
+            tuple(_pack_field(f) for f in t.input_fields), tuple(t.interfaces), tuple(t.possible_types))
+
+
+def unpack_schema_types(packed: tuple) -> Dict[str, GraphQLType]:
+    types = {}
+    for name, kind, description, fields, enum_values, input_fields, interfaces, possible_types in packed:
+        types[name] = GraphQLType(
+            name=name,
+            kind=GraphQLTypeKind(kind),
+            description=description,
+            fields=[_unpack_field(f) for f in fields],
+            enum_values=list(enum_values),
+            input_fields=[_unpack_field(f) for f in input_fields],
+            interfaces=list(interfaces),
+            possible_types=list(possible_types)
+        )
+    return types
+
+
+def _read_schema_cache(cache_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(cache_path, 'rb') as f, paused_gc():
+            entry = pickle.load(f)
+            if entry.get('version') != GRAPHQL_PARSER_VERSION:
+                return None
+            entry['types'] = unpack_schema_types(entry['types'])
+        # Reading counts as a use for LRU eviction
+        os.utime(cache_path)
+        return entry
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # A truncated or stale entry is not fatal, the schema is parsed again
+        print(f"[WARNING] Ignoring unreadable schema cache entry '{cache_path}': {str(e)}")
+        return None
+
+
+def _write_schema_cache(cache_path: str, entry: Dict[str, Any], max_bytes: int):
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Atomic rename so concurrent conversions never see a partial entry
+        os.replace(tmp_path, cache_path)
+        evict_schema_cache(cache_dir, max_bytes, keep=cache_path)
+    except Exception as e:
+        print(f"[WARNING] Could not write schema cache entry '{cache_path}': {str(e)}")
+
+
+def evict_schema_cache(cache_dir: str, max_bytes: int, keep: Optional[str] = None):
+    """Delete the least recently used cache entries until the cache fits in max_bytes"""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith('.pickle') and entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def paused_gc():
+    """
+    Pause the cyclic garbage collector while building many acyclic
+    objects; otherwise every few hundred allocations trigger a collection
+    that rescans everything built so far.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+_chunk_parser = None
+
+
+def _parse_definitions_chunk(chunk: tuple) -> bytes:
+    """
+    Process pool entry point: parse one chunk of SDL into definitions.
+    Names are interned as they are parsed, so repeated names pickle once,
+    and the result is pickled here so the parent can unpickle it with the
+    garbage collector paused.
+    """
+    global _chunk_parser
+    if _chunk_parser is None:
+        _chunk_parser = GraphQLSchemaParser('')
+    content, first_line, source_name = chunk
+    definitions, schema_roots = _chunk_parser.parse_definitions(content, first_line, source_name)
+    return pickle.dumps((definitions, schema_roots), pickle.HIGHEST_PROTOCOL)
+
+
+def intern_type_names(graphql_type: GraphQLType):
+    """Intern the names of a type unpickled from a worker process"""
+    intern = sys.intern
+    graphql_type.name = intern(graphql_type.name)
+    graphql_type.interfaces = [intern(name) for name in graphql_type.interfaces]
+    graphql_type.possible_types = [intern(name) for name in graphql_type.possible_types]
+    for graphql_field in graphql_type.fields + graphql_type.input_fields:
+        graphql_field.name = intern(graphql_field.name)
+        graphql_field.type_name = intern(graphql_field.type_name)
+        for arg in graphql_field.args:
+            arg.name = intern(arg.name)
+            arg.type_name = intern(arg.type_name)
+
+
 class GraphQLSchemaParser:
-    def __init__(self, schema_content: str):
+    def __init__(self, schema_content: Union[str, List[tuple]], jobs: int = 1, cache_dir: Optional[str] = None,
+                 cache_max_bytes: int = DEFAULT_SCHEMA_CACHE_BYTES, operations: Optional[OperationFilter] = None):
         self.schema_content = schema_content
+        self.jobs = jobs
+        self.operations = operations
+        # True when only the types reachable from the selected operations were parsed
+        self.partial = False
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
         self.types: Dict[str, GraphQLType] = {}
         self.queries: List[GraphQLField] = []
         self.mutations: List[GraphQLField] = []
         self.subscriptions: List[GraphQLField] = []
+        self.root_type_names = {'query': 'Query', 'mutation': 'Mutation', 'subscription': 'Subscription'}
         
         self.scalar_types = {
             'String', 'Int', 'Float', 'Boolean', 'ID', 'DateTime', 'Date', 
@@ -56,243 +618,574 @@ class GraphQLSchemaParser:
         
         self.parse_schema()
 
-    def clean_schema(self, content: str) -> str:
-        content = re.sub(r'#.*$', '', content, flags=re.MULTILINE)
-        content = re.sub(r'""".*?"""', '', content, flags=re.DOTALL)
-        content = re.sub(r'\s+', ' ', content)
-        return content.strip()
+    def __getstate__(self):
+        # Worker processes only need the parsed result, not the schema text
+        state = self.__dict__.copy()
+        state['schema_content'] = ''
+        return state
 
     def parse_schema(self):
+        cache_path = schema_cache_path(self.schema_content, self.cache_dir) if self.cache_dir else None
+        if cache_path:
+            entry = _read_schema_cache(cache_path)
+            if entry is not None:
+                self.types = entry['types']
+                self.root_type_names = entry['root_type_names']
+                self.resolve_leaf_fields()
+                self.resolve_root_types()
+                return
+        
+        self.parse_schema_content()
+        if cache_path and not self.partial:
+            _write_schema_cache(cache_path, {
+                'version': GRAPHQL_PARSER_VERSION,
+                'types': pack_schema_types(self.types),
+                'root_type_names': self.root_type_names
+            }, self.cache_max_bytes)
+
+    def schema_sources(self) -> List[tuple]:
+        """Return the schema as (file name, text) pairs; a single text has no file name"""
+        if isinstance(self.schema_content, str):
+            return [(None, self.schema_content)]
+        return self.schema_content
+
+    def parse_schema_content(self):
         try:
-            clean_content = self.clean_schema(self.schema_content)
-            self.parse_types(clean_content)
-            self.parse_root_types(clean_content)
+            sources = self.schema_sources()
+            if self.operations is not None and not any(is_json_schema(content) for _, content in sources):
+                self.parse_schema_lazy()
+                return
+            results = [None] * len(sources)
+            pending = []
+            for index, (source_name, content) in enumerate(sources):
+                introspection = parse_introspection(content)
+                if introspection is not None:
+                    with paused_gc():
+                        results[index] = introspection_definitions(introspection)
+                elif self.jobs > 1:
+                    pending.append(index)
+                else:
+                    results[index] = self.parse_definitions(content, source_name=source_name)
+            if pending:
+                parsed = self.parse_sources_parallel([sources[index] for index in pending])
+                for index, result in zip(pending, parsed):
+                    results[index] = result
+            
+            definitions, schema_roots = [], []
+            for source_definitions, source_roots in results:
+                definitions.extend(source_definitions)
+                schema_roots.extend(source_roots)
+            self.apply_definitions(definitions, schema_roots)
+            self.resolve_possible_types()
+            self.resolve_leaf_fields()
+            self.resolve_root_types()
         except Exception as e:
             print(f"[ERROR] Failed to parse GraphQL schema: {str(e)}")
             raise
 
-    def parse_types(self, content: str):
-        type_patterns = [
-            r'type\s+(\w+)\s*(?:implements\s+([^{]+))?\s*\{([^}]*)\}',
-            r'input\s+(\w+)\s*\{([^}]+)\}',
-            r'enum\s+(\w+)\s*\{([^}]+)\}',
-            r'interface\s+(\w+)\s*\{([^}]+)\}',
-            r'union\s+(\w+)\s*=\s*([^}\n]+)',
-            r'scalar\s+(\w+)'
-        ]
-        
-        for pattern in type_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
+    def parse_schema_lazy(self):
+        """
+        Parse only the definitions reachable from the selected operations.
+        Every SDL source is indexed first; then, starting from the selected
+        root fields, the definitions of each type reached through return,
+        argument, input field and possible types, and the implementations of
+        reached interfaces, are parsed. They are applied in source order, so
+        the types match those of a full parse.
+        """
+        sources = self.schema_sources()
+        ranges = {}
+        implementers = {}
+        schema_ranges = []
+        total = 0
+        for source_index, (_, content) in enumerate(sources):
+            index = index_schema_definitions(content)
+            for position, (start, keyword, name, _, interfaces) in enumerate(index):
+                end = index[position + 1][0] if position + 1 < len(index) else len(content)
+                if keyword == 'schema':
+                    schema_ranges.append((source_index, start, end))
+                elif keyword != 'directive' and name is not None:
+                    total += 1
+                    ranges.setdefault(name, []).append((source_index, start, end))
+                    for interface_name in interfaces:
+                        implementers.setdefault(interface_name, []).append(name)
+        
+        parsed = {}
+        
+        def parse_range(source_index: int, start: int, end: int) -> tuple:
+            key = (source_index, start)
+            if key not in parsed:
+                source_name, content = sources[source_index]
                 try:
-                    self.process_type_match(match, pattern)
-                except Exception as e:
-                    print(f"[WARNING] Failed to parse type: {str(e)}")
-                    continue
-
-    def process_type_match(self, match, pattern: str):
-        groups = match.groups()
+                    parsed[key] = self.parse_definitions(content[start:end], source_name=source_name)
+                except ValueError:
+                    # Only count the lines before the definition when reporting an error
+                    parsed[key] = self.parse_definitions(content[start:end], content.count('\n', 0, start) + 1,
+                                                         source_name)
+            return parsed[key]
         
-        if 'type' in pattern and 'input' not in pattern and 'interface' not in pattern:
-            type_name = groups[0]
-            implements = groups[1].strip() if groups[1] else ""
-            fields_content = groups[2] if len(groups) > 2 else ""
-            
-            graphql_type = GraphQLType(
-                name=type_name,
-                kind=GraphQLTypeKind.OBJECT,
-                interfaces=self.parse_implements(implements)
-            )
-            
-            if fields_content:
-                graphql_type.fields = self.parse_fields(fields_content)
-            
-            self.types[type_name] = graphql_type
-            
-        elif 'input' in pattern:
-            type_name = groups[0]
-            fields_content = groups[1]
-            
-            graphql_type = GraphQLType(
-                name=type_name,
-                kind=GraphQLTypeKind.INPUT_OBJECT
-            )
-            
-            graphql_type.input_fields = self.parse_fields(fields_content)
-            self.types[type_name] = graphql_type
-            
-        elif 'enum' in pattern:
-            type_name = groups[0]
-            enum_content = groups[1]
-            
-            graphql_type = GraphQLType(
-                name=type_name,
-                kind=GraphQLTypeKind.ENUM,
-                enum_values=self.parse_enum_values(enum_content)
-            )
-            
-            self.types[type_name] = graphql_type
-            
-        elif 'union' in pattern:
-            type_name = groups[0]
-            union_types = groups[1]
-            
-            graphql_type = GraphQLType(
-                name=type_name,
-                kind=GraphQLTypeKind.UNION,
-                possible_types=[t.strip() for t in union_types.split('|')]
-            )
-            
-            self.types[type_name] = graphql_type
-            
-        elif 'interface' in pattern:
-            type_name = groups[0]
-            fields_content = groups[1]
-            
-            graphql_type = GraphQLType(
-                name=type_name,
-                kind=GraphQLTypeKind.INTERFACE,
-                fields=self.parse_fields(fields_content)
-            )
-            
-            self.types[type_name] = graphql_type
-            
-        elif 'scalar' in pattern:
-            type_name = groups[0]
-            
-            graphql_type = GraphQLType(
-                name=type_name,
-                kind=GraphQLTypeKind.SCALAR
-            )
+        for schema_range in schema_ranges:
+            self.apply_definitions([], parse_range(*schema_range)[1])
+        
+        # Root types only follow their selected fields, unless reached from another type
+        pending = [(type_name, False) for type_name in self.root_type_names.values() if type_name in ranges]
+        reached = set()
+        with paused_gc():
+            while pending:
+                type_name, whole = pending.pop()
+                if type_name in reached:
+                    continue
+                names = set()
+                if whole:
+                    reached.add(type_name)
+                    names.update(implementers.get(type_name, ()))
+                for type_range in ranges[type_name]:
+                    for graphql_type, _ in parse_range(*type_range)[0]:
+                        if whole:
+                            names.update(type_dependencies(graphql_type))
+                            continue
+                        for graphql_field in graphql_type.fields:
+                            if self.operations.matches(graphql_field.name):
+                                names.add(graphql_field.type_name)
+                                names.update(arg.type_name for arg in graphql_field.args)
+                pending.extend((name, True) for name in names if name in ranges and name not in reached)
             
-            self.types[type_name] = graphql_type
+            definitions = []
+            for key in sorted(parsed):
+                definitions.extend(parsed[key][0])
+            self.apply_definitions(definitions, [])
+        self.partial = True
+        print(f"[LAZY] Parsed {sum(len(parsed[key][0]) for key in parsed)} of {total} definitions")
+        self.resolve_possible_types()
+        self.resolve_leaf_fields()
+        self.resolve_root_types()
 
-    def parse_implements(self, implements_str: str) -> List[str]:
-        if not implements_str:
-            return []
+    def parse_sources_parallel(self, sources: List[tuple]) -> List[tuple]:
+        """
+        Parse SDL sources in a process pool, each split into chunks of
+        top-level definitions, and return their (definitions, schema roots)
+        in source order.
+        """
+        parts = max(1, self.jobs * 4 // len(sources))
+        chunks = []
+        chunk_sources = []
+        for index, (source_name, content) in enumerate(sources):
+            for chunk, first_line in split_schema_definitions(content, parts):
+                chunks.append((chunk, first_line, source_name))
+                chunk_sources.append(index)
+        if len(chunks) <= 1:
+            return [self.parse_definitions(content, source_name=source_name) for source_name, content in sources]
         
-        implements_str = re.sub(r'implements\s+', '', implements_str, flags=re.IGNORECASE)
-        return [t.strip() for t in implements_str.split('&') if t.strip()]
+        results = [([], []) for _ in sources]
+        with ProcessPoolExecutor(max_workers=min(self.jobs, len(chunks))) as executor:
+            for index, result in zip(chunk_sources, executor.map(_parse_definitions_chunk, chunks)):
+                with paused_gc():
+                    definitions, schema_roots = pickle.loads(result)
+                    for graphql_type, _ in definitions:
+                        intern_type_names(graphql_type)
+                    results[index][0].extend(definitions)
+                    results[index][1].extend((operation, sys.intern(type_name))
+                                             for operation, type_name in schema_roots)
+        return results
 
-    def parse_fields(self, fields_content: str) -> List[GraphQLField]:
-        fields = []
-        # Match fieldName(args...): ReturnType or fieldName: ReturnType
-        pattern = r'(\w+\s*(?:\([^)]*\))?\s*:\s*[^}]+?)(?=\s+\w+\s*(?:\(|:)|$)'
-        matches = re.findall(pattern, fields_content)
-        for line in matches:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            # Remove inline comments
-            line = line.split('#')[0].strip()
-            field = self.parse_single_field(line)
-            if field:
-                fields.append(field)
-        return fields
+    def parse_definitions(self, content: str, first_line: int = 1, source_name: Optional[str] = None) -> tuple:
+        """
+        Parse SDL text into ([(GraphQLType, is_extension)], [(operation,
+        type_name)]) without touching self.types. source_name is only used
+        in syntax errors.
+        """
+        self._source = content
+        self._first_line = first_line
+        self._source_name = source_name
+        self._definitions = []
+        self._schema_roots = []
+        try:
+            self._tokens = tokenize_schema(content)
+            self._pos = 0
+            with paused_gc():
+                self.parse_document()
+            return self._definitions, self._schema_roots
+        finally:
+            self._tokens = []
+            self._source = ''
+            self._definitions = []
+            self._schema_roots = []
 
-    def parse_single_field(self, field_line: str) -> Optional[GraphQLField]:
-        if not field_line or field_line.startswith('#'):
-            return None
+    def apply_definitions(self, definitions: List[tuple], schema_roots: List[tuple]):
+        """
+        Add type definitions in order, then merge extensions in order, so an
+        `extend type` reaches its base type whichever file declares it.
+        """
+        for graphql_type, extend in definitions:
+            if not extend:
+                self.types[graphql_type.name] = graphql_type
+        for graphql_type, extend in definitions:
+            if extend:
+                self.add_type_extension(graphql_type)
+        for operation, type_name in schema_roots:
+            self.root_type_names[operation] = type_name
+
+    # Token helpers
+
+    def syntax_error(self, message: str) -> ValueError:
+        # Token positions are not kept, so find the line only when reporting
+        source = self._source
+        line = source.count('\n')
+        if self._tokens[self._pos] is EOF_TOKEN:
+            message = "Unexpected end of schema"
+        for index, match in enumerate(TOKEN_PATTERN.finditer(source)):
+            if index == self._pos:
+                line = source.count('\n', 0, match.start(1))
+                break
+        location = f" of {self._source_name}" if self._source_name else ""
+        return ValueError(f"{message} on line {line + self._first_line}{location}")
+
+    def advance(self) -> str:
+        token = self._tokens[self._pos]
+        if token is EOF_TOKEN:
+            raise self.syntax_error("Unexpected token")
+        self._pos += 1
+        return token
+
+    def expect(self, text: str):
+        if self._tokens[self._pos] != text:
+            raise self.syntax_error(f"Expected '{text}' but found '{self._tokens[self._pos]}'")
+        self._pos += 1
+
+    def expect_name(self) -> str:
+        token = self._tokens[self._pos]
+        if token[:1] not in NAME_START:
+            raise self.syntax_error(f"Expected a name but found '{token}'")
+        self._pos += 1
+        return token
+
+    def skip(self, text: str) -> bool:
+        if self._tokens[self._pos] == text:
+            self._pos += 1
+            return True
+        return False
+
+    # Grammar
+
+    def parse_document(self):
+        while self._tokens[self._pos] is not EOF_TOKEN:
+            self.parse_definition()
+
+    def parse_description(self) -> Optional[str]:
+        token = self._tokens[self._pos]
+        if token[:1] == '"':
+            self._pos += 1
+            return string_value(token)
+        return None
+
+    def parse_definition(self):
+        description = self.parse_description()
+        extend = self.skip('extend')
+        keyword = self.expect_name()
         
-        field_line = field_line.rstrip(',').strip()
-        pattern = r'^(\w+)(?:\(([^)]*)\))?\s*:\s*(.+)$'
-        match = re.match(pattern, field_line)
+        if keyword == 'schema':
+            self.parse_directives()
+            self.parse_schema_definition()
+            return
+        if keyword == 'directive':
+            self.parse_directive_definition()
+            return
         
-        if not match:
-            return None
+        name = sys.intern(self.expect_name())
+        if keyword == 'type':
+            graphql_type = GraphQLType(name=name, kind=GraphQLTypeKind.OBJECT, description=description)
+            graphql_type.interfaces = self.parse_implements()
+            self.parse_directives()
+            graphql_type.fields = self.parse_fields_definition()
+        elif keyword == 'interface':
+            graphql_type = GraphQLType(name=name, kind=GraphQLTypeKind.INTERFACE, description=description)
+            graphql_type.interfaces = self.parse_implements()
+            self.parse_directives()
+            graphql_type.fields = self.parse_fields_definition()
+        elif keyword == 'input':
+            graphql_type = GraphQLType(name=name, kind=GraphQLTypeKind.INPUT_OBJECT, description=description)
+            self.parse_directives()
+            graphql_type.input_fields = self.parse_input_fields_definition()
+        elif keyword == 'enum':
+            graphql_type = GraphQLType(name=name, kind=GraphQLTypeKind.ENUM, description=description)
+            self.parse_directives()
+            graphql_type.enum_values = self.parse_enum_values()
+        elif keyword == 'union':
+            graphql_type = GraphQLType(name=name, kind=GraphQLTypeKind.UNION, description=description)
+            self.parse_directives()
+            graphql_type.possible_types = self.parse_union_members()
+        elif keyword == 'scalar':
+            graphql_type = GraphQLType(name=name, kind=GraphQLTypeKind.SCALAR, description=description)
+            self.parse_directives()
+        else:
+            self._pos -= 2
+            raise self.syntax_error(f"Unknown definition '{keyword}'")
         
-        field_name = match.group(1)
-        args_str = match.group(2) or ""
-        type_str = match.group(3)
-        
-        is_required = type_str.endswith('!')
-        is_list = '[' in type_str and ']' in type_str
-        type_name = self.clean_type_name(type_str)
-        args = self.parse_arguments(args_str) if args_str else {}
-        
-        return GraphQLField(
-            name=field_name,
-            type_name=type_name,
-            args=args,
-            is_required=is_required,
-            is_list=is_list
-        )
+        self._definitions.append((graphql_type, extend))
 
-    def clean_type_name(self, type_str: str) -> str:
-        return re.sub(r'[!\[\]\s]', '', type_str)
-
-    def parse_arguments(self, args_str: str) -> Dict[str, Any]:
-        args = {}
-        
-        if not args_str.strip():
-            return args
-        
-        arg_parts = [arg.strip() for arg in args_str.split(',') if arg.strip()]
-        
-        for arg_part in arg_parts:
-            try:
-                match = re.match(r'^(\w+)\s*:\s*([^=]+)(?:\s*=\s*(.+))?$', arg_part)
-                if match:
-                    arg_name = match.group(1)
-                    arg_type = match.group(2).strip()
-                    default_value = match.group(3)
-                    
-                    args[arg_name] = {
-                        'type': self.clean_type_name(arg_type),
-                        'required': arg_type.endswith('!'),
-                        'default': default_value
-                    }
-            except Exception as e:
-                print(f"[WARNING] Failed to parse argument '{arg_part}': {str(e)}")
-                continue
-        
-        return args
+    def add_type_extension(self, extension: GraphQLType):
+        base = self.types.get(extension.name)
+        if base is None:
+            self.types[extension.name] = extension
+            return
+        base.fields.extend(extension.fields)
+        base.input_fields.extend(extension.input_fields)
+        base.enum_values.extend(extension.enum_values)
+        base.possible_types.extend(extension.possible_types)
+        base.interfaces.extend(i for i in extension.interfaces if i not in base.interfaces)
+
+    def parse_schema_definition(self):
+        if not self.skip('{'):
+            return
+        while not self.skip('}'):
+            operation = self.expect_name()
+            self.expect(':')
+            self._schema_roots.append((operation, self.expect_name()))
+
+    def parse_directive_definition(self):
+        self.expect('@')
+        self.expect_name()
+        if self._tokens[self._pos] == '(':
+            self.parse_arguments_definition()
+        self.skip('repeatable')
+        self.expect('on')
+        self.skip('|')
+        self.expect_name()
+        while self.skip('|'):
+            self.expect_name()
+
+    def parse_implements(self) -> List[str]:
+        interfaces = []
+        if not self.skip('implements'):
+            return interfaces
+        self.skip('&')
+        interfaces.append(sys.intern(self.expect_name()))
+        tokens = self._tokens
+        while True:
+            if self.skip('&'):
+                interfaces.append(sys.intern(self.expect_name()))
+            elif tokens[self._pos][:1] in NAME_START and tokens[self._pos + 1] in ('&', '{', '@'):
+                # Legacy comma separated list: implements A, B {
+                interfaces.append(sys.intern(self.expect_name()))
+            else:
+                return interfaces
+
+    def parse_directives(self) -> List[str]:
+        """Skip over directives, returning their names"""
+        names = []
+        while self.skip('@'):
+            names.append(self.expect_name())
+            if self.skip('('):
+                while not self.skip(')'):
+                    self.expect_name()
+                    self.expect(':')
+                    self.parse_value()
+        return names
+
+    def parse_value(self) -> str:
+        """Parse a constant value and return it printed in canonical form"""
+        token = self.advance()
+        if token == '[':
+            items = []
+            while not self.skip(']'):
+                items.append(self.parse_value())
+            return f"[{', '.join(items)}]"
+        if token == '{':
+            items = []
+            while not self.skip('}'):
+                name = self.expect_name()
+                self.expect(':')
+                items.append(f"{name}: {self.parse_value()}")
+            return f"{{{', '.join(items)}}}"
+        if token == '$':
+            return '$' + self.expect_name()
+        if token in PUNCTUATORS:
+            self._pos -= 1
+            raise self.syntax_error(f"Unexpected '{token}' in value")
+        return token
+
+    def parse_type_reference(self) -> tuple:
+        """Return (named type, is_required, is_list) for a type such as [User!]!"""
+        tokens = self._tokens
+        if tokens[self._pos] == '[':
+            self._pos += 1
+            type_name, _, _ = self.parse_type_reference()
+            self.expect(']')
+            is_list = True
+        else:
+            type_name = sys.intern(self.expect_name())
+            is_list = False
+        if tokens[self._pos] == '!':
+            self._pos += 1
+            return type_name, True, is_list
+        return type_name, False, is_list
+
+    def parse_fields_definition(self) -> List[GraphQLField]:
+        fields = []
+        if not self.skip('{'):
+            return fields
+        tokens = self._tokens
+        while tokens[self._pos] != '}':
+            description = self.parse_description()
+            name = sys.intern(self.expect_name())
+            args = self.parse_arguments_definition() if tokens[self._pos] == '(' else ()
+            self.expect(':')
+            type_name, is_required, is_list = self.parse_type_reference()
+            directives = self.parse_directives() if tokens[self._pos] == '@' else ()
+            fields.append(GraphQLField(
+                name=name,
+                type_name=type_name,
+                description=description,
+                args=args,
+                is_required=is_required,
+                is_list=is_list,
+                deprecated='deprecated' in directives
+            ))
+        self._pos += 1
+        return fields
+
+    def parse_input_value(self) -> tuple:
+        tokens = self._tokens
+        description = self.parse_description()
+        name = sys.intern(self.expect_name())
+        self.expect(':')
+        type_name, is_required, is_list = self.parse_type_reference()
+        default = None
+        if tokens[self._pos] == '=':
+            self._pos += 1
+            default = self.parse_value()
+        directives = self.parse_directives() if tokens[self._pos] == '@' else ()
+        return name, type_name, is_required, is_list, default, description, directives
+
+    def parse_arguments_definition(self) -> Tuple[GraphQLArgument, ...]:
+        args = []
+        self.expect('(')
+        while not self.skip(')'):
+            name, type_name, is_required, _, default, _, _ = self.parse_input_value()
+            args.append(GraphQLArgument(name, type_name, is_required, default))
+        return tuple(args)
+
+    def parse_input_fields_definition(self) -> List[GraphQLField]:
+        fields = []
+        if not self.skip('{'):
+            return fields
+        while not self.skip('}'):
+            name, type_name, is_required, is_list, _, description, directives = self.parse_input_value()
+            fields.append(GraphQLField(
+                name=name,
+                type_name=type_name,
+                description=description,
+                is_required=is_required,
+                is_list=is_list,
+                deprecated='deprecated' in directives
+            ))
+        return fields
 
-    def parse_enum_values(self, enum_content: str) -> List[str]:
+    def parse_enum_values(self) -> List[str]:
         values = []
-        value_lines = [line.strip() for line in enum_content.split('\n') if line.strip()]
-        
-        for line in value_lines:
-            value = re.sub(r'#.*$', '', line).strip()
-            if value:
-                values.append(value)
-        
+        if not self.skip('{'):
+            return values
+        while not self.skip('}'):
+            self.parse_description()
+            values.append(self.expect_name())
+            self.parse_directives()
         return values
 
-    def parse_root_types(self, content: str):
-        root_type_pattern = r'type\s+(Query|Mutation|Subscription)\s*\{([^}]+)\}'
-        
-        matches = re.finditer(root_type_pattern, content, re.IGNORECASE)
-        
-        for match in matches:
-            type_name = match.group(1)
-            fields_content = match.group(2)
-            
-            temp_type = GraphQLType(
-                name=type_name,
-                kind=GraphQLTypeKind.OBJECT
-            )
-            
-            if fields_content:
-                temp_type.fields = self.parse_fields(fields_content)
+    def parse_union_members(self) -> List[str]:
+        members = []
+        if self.skip('='):
+            self.skip('|')
+            members.append(sys.intern(self.expect_name()))
+            while self.skip('|'):
+                members.append(sys.intern(self.expect_name()))
+        return members
+
+    def resolve_possible_types(self):
+        """Fill in the object types implementing each interface, which SDL only states on the objects"""
+        for graphql_type in self.types.values():
+            if graphql_type.kind != GraphQLTypeKind.OBJECT:
+                continue
+            for interface_name in graphql_type.interfaces:
+                interface = self.types.get(interface_name)
+                if (interface is not None and interface.kind == GraphQLTypeKind.INTERFACE
+                        and graphql_type.name not in interface.possible_types):
+                    interface.possible_types.append(graphql_type.name)
+
+    def resolve_leaf_fields(self):
+        """Flag the fields whose type is selected by name alone, so selections need no type lookups"""
+        types = self.types
+        scalar_types = self.scalar_types
+        leaf_kinds = (GraphQLTypeKind.SCALAR, GraphQLTypeKind.ENUM)
+        for graphql_type in types.values():
+            for graphql_field in graphql_type.fields:
+                field_type = types.get(graphql_field.type_name)
+                graphql_field.is_leaf = (graphql_field.type_name in scalar_types or field_type is None
+                                         or field_type.kind in leaf_kinds)
+
+    def resolve_root_types(self):
+        for operation, type_name in self.root_type_names.items():
+            root_type = self.types.get(type_name)
+            if root_type is None:
+                continue
             
-            if type_name.lower() == 'query':
-                self.queries = temp_type.fields
+            fields = root_type.fields
+            if self.operations is not None:
+                fields = [graphql_field for graphql_field in fields if self.operations.matches(graphql_field.name)]
+            if operation == 'query':
+                self.queries = fields
                 print(f"Found {len(self.queries)} queries: {[q.name for q in self.queries]}")
-            elif type_name.lower() == 'mutation':
-                self.mutations = temp_type.fields
+            elif operation == 'mutation':
+                self.mutations = fields
                 print(f"Found {len(self.mutations)} mutations: {[m.name for m in self.mutations]}")
-            elif type_name.lower() == 'subscription':
-                self.subscriptions = temp_type.fields
+            elif operation == 'subscription':
+                self.subscriptions = fields
                 print(f"Found {len(self.subscriptions)} subscriptions: {[s.name for s in self.subscriptions]}")
 
 
+# (folder name, operation type) in collection order
+ROOT_OPERATIONS = (('queries', 'query'), ('mutations', 'mutation'), ('subscriptions', 'subscription'))
+
+_operation_converter = None
+
+
+def _init_operation_worker(parser: 'GraphQLSchemaParser', endpoint_url: str, budget: SelectionBudget,
+                           fragments: bool):
+    """Process pool initializer: receive the parsed schema once per worker"""
+    global _operation_converter
+    _operation_converter = GraphQLToPostmanConverter(parser, endpoint_url, budget, fragments)
+
+
+def _create_operation_in_worker(operation: tuple) -> tuple:
+    return _operation_converter.create_operation_item(*operation)
+
+
 class GraphQLToPostmanConverter:
-    def __init__(self, parser: GraphQLSchemaParser, endpoint_url: str = "https://api.example.com/graphql"):
+    def __init__(self, parser: GraphQLSchemaParser, endpoint_url: str = "https://api.example.com/graphql",
+                 budget: Optional[SelectionBudget] = None, fragments: bool = False):
         self.parser = parser
         self.endpoint_url = endpoint_url
+        self.budget = budget or SelectionBudget()
+        self.fragments = fragments
+        self._fragment_cache: Dict[tuple, tuple] = {}
+        self._fragment_definitions: Dict[str, str] = {}
+        self._fragment_bodies: Dict[str, str] = {}
+        self.operation_costs: Dict[tuple, OperationCost] = {}
+        self._selection_cache: Dict[tuple, str] = {}
+        self._cost_cache: Dict[tuple, tuple] = {}
+        self._budget_cache: Dict[tuple, tuple] = {}
+        self._field_groups: Dict[str, tuple] = {}
+        self._examples: Dict[tuple, Dict[str, Any]] = {}
+        self._expanding: set = set()
+        self._reachable_inputs: Dict[str, frozenset] = {}
+        self._serialized_variables: Dict[tuple, str] = {}
+        self._serialized_arguments: Dict[str, str] = {}
+        self._selectable_cache: Dict[str, List[GraphQLField]] = {}
+        self._include_rules = [rule if '.' in rule else f"{rule}.*" for rule in self.budget.include]
     
     def generate_example_value(self, type_name: str, depth: int = 0) -> Any:
+        """
+        Example value for a type. Input object examples are cached and
+        shared, so treat the returned value as read-only.
+        """
         if depth > 5:
             return None
         
@@ -305,16 +1198,54 @@ class GraphQLToPostmanConverter:
             if graphql_type.kind == GraphQLTypeKind.ENUM:
                 return graphql_type.enum_values[0] if graphql_type.enum_values else "ENUM_VALUE"
             elif graphql_type.kind == GraphQLTypeKind.INPUT_OBJECT:
-                example = {}
-                for field in graphql_type.input_fields:
-                    if field.is_required or depth < 2:
-                        example[field.name] = self.generate_example_value(field.type_name, depth + 1)
-                return example
+                return self._input_object_example(graphql_type, depth)
             elif graphql_type.kind == GraphQLTypeKind.OBJECT:
                 return f"<{type_name} object>"
         
         return f"example_{type_name}"
     
+    def _input_types_reachable(self, type_name: str) -> frozenset:
+        """Input object types reachable through the fields of an input type, itself included when recursive"""
+        reachable = self._reachable_inputs.get(type_name)
+        if reachable is None:
+            found = set()
+            pending = [type_name]
+            while pending:
+                for field in self.parser.types[pending.pop()].input_fields:
+                    field_type = self.parser.types.get(field.type_name)
+                    if (field_type is not None and field_type.kind == GraphQLTypeKind.INPUT_OBJECT
+                            and field.type_name not in found):
+                        found.add(field.type_name)
+                        pending.append(field.type_name)
+            reachable = self._reachable_inputs[type_name] = frozenset(found)
+        return reachable
+    
+    def _input_object_example(self, graphql_type: GraphQLType, depth: int) -> Dict[str, Any]:
+        # Cycles are cut at inputs already being expanded, so the example only
+        # depends on which of the inputs it reaches are being expanded around it
+        key = (graphql_type.name, depth,
+               frozenset(self._expanding & self._input_types_reachable(graphql_type.name)))
+        if key in self._examples:
+            return self._examples[key]
+        
+        self._expanding.add(graphql_type.name)
+        try:
+            example = {}
+            for field in graphql_type.input_fields:
+                if not (field.is_required or depth < 2):
+                    continue
+                if field.type_name in self._expanding:
+                    # Recursive input: cut the cycle, keeping required fields present
+                    if field.is_required:
+                        example[field.name] = None
+                    continue
+                example[field.name] = self.generate_example_value(field.type_name, depth + 1)
+        finally:
+            self._expanding.discard(graphql_type.name)
+        
+        self._examples[key] = example
+        return example
+    
     def get_scalar_example(self, scalar_type: str) -> Any:
         examples = {
             'String': "example string",
@@ -341,13 +1272,10 @@ class GraphQLToPostmanConverter:
             arg_parts = []
             var_parts = []
             
-            for arg_name, arg_info in field.args.items():
-                var_name = f"${arg_name}"
-                arg_type = arg_info['type']
-                is_required = arg_info.get('required', False)
-                
-                var_parts.append(f"{var_name}: {arg_type}{'!' if is_required else ''}")
-                arg_parts.append(f"{arg_name}: {var_name}")
+            for arg in field.args:
+                var_name = f"${arg.name}"
+                var_parts.append(f"{var_name}: {arg.type_name}{'!' if arg.required else ''}")
+                arg_parts.append(f"{arg.name}: {var_name}")
             
             if var_parts:
                 variables_str = f"({', '.join(var_parts)})"
@@ -355,63 +1283,403 @@ class GraphQLToPostmanConverter:
             if arg_parts:
                 args_str = f"({', '.join(arg_parts)})"
         
-        selection_set = self.build_selection_set(field.type_name)
-        return f"{operation_type} {operation_name}{variables_str} {{\n  {field.name}{args_str}{selection_set}\n}}"
+        selection_set, cost, fragment_names = self.build_operation_selection(field)
+        self.operation_costs[(operation_type, field.name)] = cost
+        query = f"{operation_type} {operation_name}{variables_str} {{\n  {field.name}{args_str}{selection_set}\n}}"
+        if fragment_names:
+            query += "\n\n" + "\n\n".join(self._fragment_definitions[name] for name in fragment_names)
+        return query
+    
+    def build_operation_selection(self, field: GraphQLField) -> tuple:
+        """
+        Return (selection set, OperationCost, fragment names) for a root
+        field. The full selection is used while it fits the budget;
+        otherwise the budget is filled breadth first, scalars and IDs before
+        nested objects. In fragment mode either one is spread from named
+        fragments; budgeted selections differ per root type, so their
+        fragments are named after it (UserBudget, UserBudgetPost, ...).
+        """
+        budget = self.budget
+        multiplier = budget.list_size if field.is_list else 1
+        fields, cost, nested_lists = self.selection_cost(field.type_name)
+        nested_lists += field.is_list
+        fragment_names = ()
+        if ((budget.max_fields is None or fields + 1 <= budget.max_fields)
+                and (budget.max_list_nesting is None or nested_lists <= budget.max_list_nesting)):
+            if self.fragments:
+                fragment_name, fragment_names = self._fragment(field.type_name.strip('[]').replace('!', ''), 0)
+                selection = f" {{\n    ...{fragment_name}\n  }}" if fragment_name else ""
+            else:
+                selection = self.build_selection_set(field.type_name)
+        else:
+            key = (field.type_name, field.is_list)
+            entry = self._budget_cache.get(key)
+            if entry is None:
+                root = self._fill_selection_budget(field.type_name, int(field.is_list))
+                selection, fields, cost, nested_lists = self._render_selection(root)
+                if self.fragments and selection:
+                    # The list level only changes the selection under max_list_nesting
+                    in_list = field.is_list and budget.max_list_nesting is not None
+                    definitions = {}
+                    root_name = self._budget_fragment(root, f"{root.type_name}Budget{'InList' if in_list else ''}",
+                                                      definitions, True)
+                    selection = f" {{\n    ...{root_name}\n  }}"
+                    # Definitions are added innermost first; list the operation's own fragment first
+                    fragment_names = tuple(reversed(definitions))
+                    self._fragment_definitions.update(definitions)
+                entry = self._budget_cache[key] = (selection, fields, cost, nested_lists, fragment_names)
+            selection, fields, cost, nested_lists, fragment_names = entry
+            nested_lists += field.is_list
+        return selection, OperationCost(fields + 1, multiplier * (1 + cost), nested_lists), fragment_names
     
     def build_selection_set(self, type_name: str, depth: int = 0) -> str:
+        """
+        Full selection set for a type, ignoring the field budget. Selection
+        sets only depend on the type and depth, so each one is built once
+        and shared by every operation that reaches it.
+        """
         if depth > 3:
             return ""
         
         if type_name.startswith('[') and type_name.endswith(']'):
-            inner_type = type_name[1:-1].replace('!', '')
-            return self.build_selection_set(inner_type, depth)
-        
+            type_name = type_name[1:-1]
         clean_type = type_name.replace('!', '')
         
-        if clean_type in self.parser.scalar_types:
+        key = (clean_type, depth)
+        selection = self._selection_cache.get(key)
+        if selection is None:
+            selection = self._selection_cache[key] = self._build_selection_set(clean_type, depth)
+        return selection
+    
+    def _build_selection_set(self, clean_type: str, depth: int) -> str:
+        if clean_type in self.parser.scalar_types or clean_type not in self.parser.types:
             return ""
         
-        if clean_type in self.parser.types:
-            graphql_type = self.parser.types[clean_type]
-            
-            if graphql_type.kind == GraphQLTypeKind.OBJECT:
-                if not graphql_type.fields:
-                    return ""
-                
-                selected_fields = []
-                for field in graphql_type.fields:
-                    if field.type_name in self.parser.scalar_types:
-                        selected_fields.append(field.name)
+        graphql_type = self.parser.types[clean_type]
+        selected_fields = []
+        if graphql_type.kind in (GraphQLTypeKind.OBJECT, GraphQLTypeKind.INTERFACE):
+            for field in self.selectable_fields(graphql_type):
+                if field.is_leaf:
+                    selected_fields.append(field.name)
+                else:
+                    nested_selection = self.build_selection_set(field.type_name, depth + 1)
+                    if nested_selection:
+                        selected_fields.append(f"{field.name}{nested_selection}")
                     else:
-                        nested_selection = self.build_selection_set(field.type_name, depth + 1)
-                        if nested_selection:
-                            selected_fields.append(f"{field.name}{nested_selection}")
-                        else:
-                            selected_fields.append(field.name)
-                
-                if selected_fields:
-                    return " {\n    " + "\n    ".join(selected_fields) + "\n  }"
+                        selected_fields.append(field.name)
+        elif graphql_type.kind == GraphQLTypeKind.UNION:
+            selected_fields.append("__typename")
+        
+        if graphql_type.kind in (GraphQLTypeKind.INTERFACE, GraphQLTypeKind.UNION):
+            # Fragments sit at the same level as the abstract type's own fields
+            for possible_type in graphql_type.possible_types:
+                fragment_selection = self.build_selection_set(possible_type, depth)
+                if fragment_selection:
+                    selected_fields.append(f"... on {possible_type}{fragment_selection}")
         
+        if selected_fields:
+            return " {\n    " + "\n    ".join(selected_fields) + "\n  }"
         return ""
     
+    def _fragment(self, type_name: str, depth: int) -> tuple:
+        """
+        Return (fragment name, names of every fragment it needs, itself
+        first) for the full selection of a type at a depth, or (None, ())
+        when that selection is empty. Fragments follow the same (type,
+        depth) split as build_selection_set, so they select exactly the same
+        fields and can never spread each other in a cycle.
+        """
+        key = (type_name, depth)
+        entry = self._fragment_cache.get(key)
+        if entry is not None:
+            return entry
+        
+        graphql_type = self.parser.types.get(type_name)
+        entry = (None, ())
+        if depth <= 3 and graphql_type is not None and type_name not in self.parser.scalar_types:
+            selected_fields = []
+            needed = []
+            if graphql_type.kind in (GraphQLTypeKind.OBJECT, GraphQLTypeKind.INTERFACE):
+                for field in self.selectable_fields(graphql_type):
+                    nested_name = None
+                    if not field.is_leaf:
+                        nested_name, nested_needed = self._fragment(field.type_name, depth + 1)
+                        needed.extend(nested_needed)
+                    selected_fields.append(f"{field.name} {{\n    ...{nested_name}\n  }}" if nested_name else field.name)
+            elif graphql_type.kind == GraphQLTypeKind.UNION:
+                selected_fields.append("__typename")
+            
+            if graphql_type.kind in (GraphQLTypeKind.INTERFACE, GraphQLTypeKind.UNION):
+                for possible_type in graphql_type.possible_types:
+                    fragment_name, fragment_needed = self._fragment(possible_type, depth)
+                    if fragment_name:
+                        selected_fields.append(f"...{fragment_name}")
+                        needed.extend(fragment_needed)
+            
+            if selected_fields:
+                body = "\n  ".join(selected_fields)
+                deeper_name, deeper_needed = self._fragment(type_name, depth + 1)
+                if deeper_name and self._fragment_bodies[deeper_name] == body:
+                    # Same fields one level down (leaf-only types), so share that fragment
+                    entry = (deeper_name, deeper_needed)
+                else:
+                    name = f"{type_name}Fields{depth or ''}"
+                    self._fragment_bodies[name] = body
+                    self._fragment_definitions[name] = f"fragment {name} on {type_name} {{\n  {body}\n}}"
+                    entry = (name, tuple(dict.fromkeys([name] + needed)))
+        self._fragment_cache[key] = entry
+        return entry
+    
+    def selection_cost(self, type_name: str, depth: int = 0) -> tuple:
+        """
+        Return (fields, cost, nested lists) of the full selection set of a
+        type without building it, memoized like build_selection_set.
+        """
+        if depth > 3:
+            return 0, 0, 0
+        
+        clean_type = type_name.strip('[]').replace('!', '')
+        key = (clean_type, depth)
+        entry = self._cost_cache.get(key)
+        if entry is not None:
+            return entry
+        
+        graphql_type = self.parser.types.get(clean_type)
+        fields = cost = nested_lists = 0
+        if graphql_type is not None and clean_type not in self.parser.scalar_types:
+            list_size = self.budget.list_size
+            if graphql_type.kind in (GraphQLTypeKind.OBJECT, GraphQLTypeKind.INTERFACE):
+                for field in self.selectable_fields(graphql_type):
+                    nested_fields, nested_cost, nested_depth = (0, 0, 0) \
+                        if field.is_leaf else self.selection_cost(field.type_name, depth + 1)
+                    fields += 1 + nested_fields
+                    cost += (list_size if field.is_list else 1) * (1 + nested_cost)
+                    nested_lists = max(nested_lists, field.is_list + nested_depth)
+            elif graphql_type.kind == GraphQLTypeKind.UNION:
+                fields += 1
+                cost += 1
+            
+            if graphql_type.kind in (GraphQLTypeKind.INTERFACE, GraphQLTypeKind.UNION):
+                for possible_type in graphql_type.possible_types:
+                    fragment_fields, fragment_cost, fragment_depth = self.selection_cost(possible_type, depth)
+                    fields += fragment_fields
+                    cost += fragment_cost
+                    nested_lists = max(nested_lists, fragment_depth)
+        
+        entry = self._cost_cache[key] = (fields, cost, nested_lists)
+        return entry
+    
+    def selectable_fields(self, graphql_type: GraphQLType) -> List[GraphQLField]:
+        """Fields of a type left after the budget's include and exclude rules"""
+        fields = self._selectable_cache.get(graphql_type.name)
+        if fields is not None:
+            return fields
+        
+        include = [rule.split('.', 1)[1] for rule in self._include_rules
+                   if fnmatchcase(graphql_type.name, rule.split('.', 1)[0])]
+        exclude = self.budget.exclude
+        fields = []
+        for field in graphql_type.fields:
+            if include and not any(fnmatchcase(field.name, rule) for rule in include):
+                continue
+            qualified_name = f"{graphql_type.name}.{field.name}"
+            if any(fnmatchcase(qualified_name, rule) or fnmatchcase(field.type_name, rule) for rule in exclude):
+                continue
+            fields.append(field)
+        self._selectable_cache[graphql_type.name] = fields
+        return fields
+    
+    def _leaf_and_object_fields(self, graphql_type: GraphQLType) -> tuple:
+        """Selectable fields split into leaves (IDs first) and nested objects"""
+        groups = self._field_groups.get(graphql_type.name)
+        if groups is not None:
+            return groups
+        
+        leaves = []
+        objects = []
+        if graphql_type.kind in (GraphQLTypeKind.OBJECT, GraphQLTypeKind.INTERFACE):
+            for field in self.selectable_fields(graphql_type):
+                if field.is_leaf:
+                    leaves.append(field)
+                else:
+                    objects.append(field)
+        leaves.sort(key=lambda f: f.type_name != 'ID' and f.name != 'id')
+        groups = self._field_groups[graphql_type.name] = (leaves, objects)
+        return groups
+    
+    def _fill_selection_budget(self, type_name: str, list_level: int) -> SelectionNode:
+        """
+        Choose fields breadth first until max_fields is used up, so shallow
+        fields win over deep ones. Within a type, ID fields come first,
+        then other leaf fields, then nested objects. A nested object
+        reserves room for one of its own fields when it is chosen.
+        """
+        budget = self.budget
+        types = self.parser.types
+        remaining = budget.max_fields - 1 if budget.max_fields is not None else float('inf')
+        root = SelectionNode(type_name, 0, list_level)
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            remaining += node.credit
+            graphql_type = types.get(node.type_name)
+            if graphql_type is None:
+                continue
+            
+            leaves, objects = self._leaf_and_object_fields(graphql_type)
+            if graphql_type.kind == GraphQLTypeKind.UNION and remaining > 0:
+                node.selected["__typename"] = None
+                remaining -= 1
+            
+            for field in leaves:
+                if remaining <= 0:
+                    break
+                node.selected[field.name] = None
+                remaining -= 1
+            
+            if node.depth < 3:
+                for field in objects:
+                    if remaining < 2:
+                        break
+                    child_level = node.list_level + field.is_list
+                    if budget.max_list_nesting is not None and child_level > budget.max_list_nesting:
+                        continue
+                    child = SelectionNode(field.type_name, node.depth + 1, child_level, credit=1)
+                    node.selected[field.name] = child
+                    remaining -= 2
+                    queue.append(child)
+            
+            if graphql_type.kind in (GraphQLTypeKind.INTERFACE, GraphQLTypeKind.UNION):
+                for possible_type in graphql_type.possible_types:
+                    child = SelectionNode(possible_type, node.depth, node.list_level)
+                    node.fragments[possible_type] = child
+                    queue.append(child)
+        return root
+    
+    def _render_selection(self, node: SelectionNode) -> tuple:
+        """Print a filled SelectionNode in schema field order; returns (selection, fields, cost, nested lists)"""
+        graphql_type = self.parser.types.get(node.type_name)
+        if graphql_type is None:
+            return "", 0, 0, 0
+        
+        list_size = self.budget.list_size
+        selected_fields = []
+        fields = cost = nested_lists = 0
+        if "__typename" in node.selected:
+            selected_fields.append("__typename")
+            fields += 1
+            cost += 1
+        for field in graphql_type.fields:
+            if field.name not in node.selected:
+                continue
+            multiplier = list_size if field.is_list else 1
+            child = node.selected[field.name]
+            if child is None:
+                selected_fields.append(field.name)
+                fields += 1
+                cost += multiplier
+                continue
+            nested_selection, nested_fields, nested_cost, nested_depth = self._render_selection(child)
+            if not nested_selection:
+                continue
+            selected_fields.append(f"{field.name}{nested_selection}")
+            fields += 1 + nested_fields
+            cost += multiplier * (1 + nested_cost)
+            nested_lists = max(nested_lists, field.is_list + nested_depth)
+        for possible_type, child in node.fragments.items():
+            fragment_selection, fragment_fields, fragment_cost, fragment_depth = self._render_selection(child)
+            if fragment_selection:
+                selected_fields.append(f"... on {possible_type}{fragment_selection}")
+                fields += fragment_fields
+                cost += fragment_cost
+                nested_lists = max(nested_lists, fragment_depth)
+        
+        if selected_fields:
+            return " {\n    " + "\n    ".join(selected_fields) + "\n  }", fields, cost, nested_lists
+        return "", 0, 0, 0
+    
+    def _budget_fragment(self, node: SelectionNode, prefix: str, definitions: Dict[str, str],
+                         is_root: bool = False) -> Optional[str]:
+        """
+        Name of a fragment selecting the same fields as _render_selection
+        prints for a filled SelectionNode, or None when it selects nothing.
+        The fragment and those it spreads are added to definitions; nodes
+        of the same type selecting the same fields share one fragment.
+        """
+        graphql_type = self.parser.types.get(node.type_name)
+        if graphql_type is None:
+            return None
+        
+        selected_fields = []
+        if "__typename" in node.selected:
+            selected_fields.append("__typename")
+        for field in graphql_type.fields:
+            if field.name not in node.selected:
+                continue
+            child = node.selected[field.name]
+            if child is None:
+                selected_fields.append(field.name)
+                continue
+            nested_name = self._budget_fragment(child, prefix, definitions)
+            if nested_name:
+                selected_fields.append(f"{field.name} {{\n    ...{nested_name}\n  }}")
+        for possible_type, child in node.fragments.items():
+            fragment_name = self._budget_fragment(child, prefix, definitions)
+            if fragment_name:
+                selected_fields.append(f"...{fragment_name}")
+        if not selected_fields:
+            return None
+        
+        body = "\n  ".join(selected_fields)
+        definition_name = prefix if is_root else f"{prefix}{node.type_name}"
+        name = definition_name
+        number = 1
+        while name in definitions:
+            if definitions[name] == f"fragment {name} on {node.type_name} {{\n  {body}\n}}":
+                return name
+            number += 1
+            name = f"{definition_name}_{number}"
+        definitions[name] = f"fragment {name} on {node.type_name} {{\n  {body}\n}}"
+        return name
+    
     def generate_variables(self, field: GraphQLField) -> Dict[str, Any]:
         variables = {}
         
-        for arg_name, arg_info in field.args.items():
-            arg_type = arg_info['type']
-            variables[arg_name] = self.generate_example_value(arg_type)
+        for arg in field.args:
+            variables[arg.name] = self.generate_example_value(arg.type_name)
         
         return variables
     
+    def serialized_variables(self, field: GraphQLField) -> str:
+        """
+        Variables JSON for a field, the same text as json.dumps(variables,
+        indent=2). Each argument type's example is serialized once, already
+        indented for its place in the variables object, and reused.
+        """
+        key = tuple((arg.name, arg.type_name) for arg in field.args)
+        serialized = self._serialized_variables.get(key)
+        if serialized is None:
+            parts = [f"  {json.dumps(arg_name)}: {self._serialized_argument(arg_type)}" for arg_name, arg_type in key]
+            serialized = "{\n" + ",\n".join(parts) + "\n}" if parts else "{}"
+            self._serialized_variables[key] = serialized
+        return serialized
+    
+    def _serialized_argument(self, type_name: str) -> str:
+        serialized = self._serialized_arguments.get(type_name)
+        if serialized is None:
+            # JSON strings never contain raw newlines, so this only indents
+            serialized = json.dumps(self.generate_example_value(type_name), indent=2).replace("\n", "\n  ")
+            self._serialized_arguments[type_name] = serialized
+        return serialized
+    
     def create_postman_request(self, field: GraphQLField, operation_type: str) -> Dict[str, Any]:
         query = self.build_query_string(field, operation_type)
-        variables = self.generate_variables(field)
         
         body = {
             "mode": "graphql",
             "graphql": {
                 "query": query,
-                "variables": json.dumps(variables, indent=2) if variables else "{}"
+                "variables": self.serialized_variables(field)
             }
         }
         
@@ -426,79 +1694,77 @@ class GraphQLToPostmanConverter:
             "description": f"GraphQL {operation_type} operation: {field.name}"
         }
     
-    def create_postman_collection(self, collection_name: str = "GraphQL API") -> Dict[str, Any]:
-        folders = []
-        
-        # Create Queries folder
-        if self.parser.queries:
-            query_items = []
-            for query in self.parser.queries:
-                try:
-                    request = self.create_postman_request(query, "query")
-                    query_items.append({
-                        "name": query.name,
-                        "request": request,
-                        "response": []
-                    })
-                    print(f"Added query: {query.name}")
-                except Exception as e:
-                    print(f"[WARNING] Failed to create query '{query.name}': {str(e)}")
-                    continue
-            
-            if query_items:
-                folders.append({
-                    "name": "queries",
-                    "item": query_items
-                })
-        
-        # Create Mutations folder
-        if self.parser.mutations:
-            mutation_items = []
-            for mutation in self.parser.mutations:
-                try:
-                    request = self.create_postman_request(mutation, "mutation")
-                    mutation_items.append({
-                        "name": mutation.name,
-                        "request": request,
-                        "response": []
-                    })
-                    print(f"Added mutation: {mutation.name}")
-                except Exception as e:
-                    print(f"[WARNING] Failed to create mutation '{mutation.name}': {str(e)}")
-                    continue
-            
-            if mutation_items:
-                folders.append({
-                    "name": "mutations",
-                    "item": mutation_items
-                })
-        
-        # Create Subscriptions folder if any exist
-        if self.parser.subscriptions:
-            subscription_items = []
-            for subscription in self.parser.subscriptions:
-                try:
-                    request = self.create_postman_request(subscription, "subscription")
-                    subscription_items.append({
-                        "name": subscription.name,
-                        "request": request,
-                        "response": []
-                    })
-                    print(f"Added subscription: {subscription.name}")
-                except Exception as e:
-                    print(f"[WARNING] Failed to create subscription '{subscription.name}': {str(e)}")
-                    continue
-            
-            if subscription_items:
-                folders.append({
-                    "name": "subscriptions",
-                    "item": subscription_items
-                })
+    def root_fields(self, operation_type: str) -> List[GraphQLField]:
+        return {
+            'query': self.parser.queries,
+            'mutation': self.parser.mutations,
+            'subscription': self.parser.subscriptions
+        }[operation_type]
+    
+    def create_operation_item(self, operation_type: str, index: int) -> tuple:
+        """Return (collection item, OperationCost, error message) for one root field"""
+        field = self.root_fields(operation_type)[index]
+        try:
+            request = self.create_postman_request(field, operation_type)
+        except Exception as e:
+            return None, None, str(e)
+        item = {
+            "name": field.name,
+            "request": request,
+            "response": []
+        }
+        return item, self.operation_costs[(operation_type, field.name)], None
+    
+    def iter_operation_items(self, jobs: int = 1, operations: Optional[List[tuple]] = None):
+        """
+        Yield (operation_type, field, item, cost, error) for the given
+        (operation_type, index) pairs, by default every root field in schema
+        order. With jobs > 1 the requests are built in a process pool; each
+        worker gets the parsed schema once and keeps its own selection
+        caches, and results come back in submission order.
+        """
+        if operations is None:
+            operations = [(operation_type, index)
+                          for _, operation_type in ROOT_OPERATIONS
+                          for index in range(len(self.root_fields(operation_type)))]
+        if jobs > 1 and len(operations) > 1:
+            chunksize = max(1, -(-len(operations) // (jobs * 4)))
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_operation_worker,
+                                     initargs=(self.parser, self.endpoint_url, self.budget, self.fragments)) as executor:
+                results = executor.map(_create_operation_in_worker, operations, chunksize=chunksize)
+                for (operation_type, index), (item, cost, error) in zip(operations, results):
+                    yield operation_type, self.root_fields(operation_type)[index], item, cost, error
+        else:
+            for operation_type, index in operations:
+                item, cost, error = self.create_operation_item(operation_type, index)
+                yield operation_type, self.root_fields(operation_type)[index], item, cost, error
+    
+    def record_operation_result(self, operation_type: str, field: GraphQLField, cost: Optional[OperationCost],
+                                error: Optional[str]) -> bool:
+        """Log one result of iter_operation_items; returns False when it failed"""
+        if error is not None:
+            print(f"[WARNING] Failed to create {operation_type} '{field.name}': {error}")
+            return False
+        self.operation_costs[(operation_type, field.name)] = cost
+        print(f"Added {operation_type}: {field.name} ({cost.fields} fields, estimated cost {cost.cost})")
+        return True
+    
+    def create_postman_collection(self, collection_name: str = "GraphQL API", jobs: int = 1) -> Dict[str, Any]:
+        folder_items = {operation_type: [] for _, operation_type in ROOT_OPERATIONS}
+        for operation_type, field, item, cost, error in self.iter_operation_items(jobs):
+            if self.record_operation_result(operation_type, field, cost, error):
+                folder_items[operation_type].append(item)
         
         print(f"\n[DEBUG] Processed {len(self.parser.queries)} queries")
         print(f"[DEBUG] Processed {len(self.parser.mutations)} mutations")
         print(f"[DEBUG] Processed {len(self.parser.subscriptions)} subscriptions")
         
+        return self.collection_document(collection_name, folder_items)
+    
+    def collection_document(self, collection_name: str, folder_items: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """Wrap items, grouped by operation type, into the collection JSON structure"""
+        folders = [{"name": folder_name, "item": folder_items[operation_type]}
+                   for folder_name, operation_type in ROOT_OPERATIONS if folder_items[operation_type]]
         return {
             "info": {
                 "_postman_id": "auto-generated",
@@ -517,7 +1783,268 @@ class GraphQLToPostmanConverter:
         }
 
 
-def load_graphql_schema(file_path: str) -> str:
+INCREMENTAL_STATE_VERSION = 1
+
+# Stands in for an unchanged item while the updated collection is serialized;
+# json.dumps writes the NUL as \u0000, which generated text never contains
+ITEM_PLACEHOLDER = '\x00item:'
+ITEM_PLACEHOLDER_PATTERN = re.compile(r'"\\u0000item:(\d+)"')
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def incremental_state_path(output_file: str) -> str:
+    """State file kept next to the output collection for --incremental runs"""
+    return output_file + '.state.json'
+
+
+def incremental_fingerprint(endpoint_url: str, budget: SelectionBudget, fragments: bool = False) -> str:
+    """Everything besides the schema that affects generated items"""
+    text = json.dumps([INCREMENTAL_STATE_VERSION, endpoint_url, asdict(budget), fragments], sort_keys=True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def type_dependencies(graphql_type: GraphQLType) -> set:
+    """Names of the types whose definitions can change this type's selections or examples"""
+    names = set(graphql_type.possible_types)
+    for graphql_field in graphql_type.fields + graphql_type.input_fields:
+        names.add(graphql_field.type_name)
+        names.update(arg.type_name for arg in graphql_field.args)
+    return names
+
+
+def changed_type_names(old_types: Dict[str, GraphQLType], new_types: Dict[str, GraphQLType]) -> set:
+    """Types added, removed or changed between two parsed schemas"""
+    changed = set(old_types.keys() ^ new_types.keys())
+    for name in old_types.keys() & new_types.keys():
+        if _pack_type(old_types[name]) != _pack_type(new_types[name]):
+            changed.add(name)
+    return changed
+
+
+def affected_type_names(types: Dict[str, GraphQLType], changed: set) -> set:
+    """Changed types plus every type that reaches one through field, argument or member types"""
+    dependents = {}
+    for graphql_type in types.values():
+        for name in type_dependencies(graphql_type):
+            dependents.setdefault(name, []).append(graphql_type.name)
+    
+    affected = set(changed)
+    stack = list(changed)
+    while stack:
+        for dependent in dependents.get(stack.pop(), ()):
+            if dependent not in affected:
+                affected.add(dependent)
+                stack.append(dependent)
+    return affected
+
+
+def root_field_map(types: Dict[str, GraphQLType], root_type_names: Dict[str, str]) -> Dict[tuple, GraphQLField]:
+    fields = {}
+    for operation_type, type_name in root_type_names.items():
+        root_type = types.get(type_name)
+        if root_type is not None:
+            for graphql_field in root_type.fields:
+                fields.setdefault((operation_type, graphql_field.name), graphql_field)
+    return fields
+
+
+def _walk_json_container(text: str, index: int, decoder: json.JSONDecoder, on_value) -> int:
+    """
+    Walk the JSON object or array starting at text[index], calling
+    on_value(key, value_index) for each member (key is None in arrays).
+    on_value returns the index just past the value. Returns the index just
+    past the container.
+    """
+    index = JSON_WHITESPACE.match(text, index).end()
+    opening = text[index]
+    closing = '}' if opening == '{' else ']'
+    if opening not in '{[':
+        raise ValueError(f"Expected an object or array at offset {index}")
+    index = JSON_WHITESPACE.match(text, index + 1).end()
+    if text[index] == closing:
+        return index + 1
+    while True:
+        key = None
+        if opening == '{':
+            key, index = decoder.raw_decode(text, index)
+            index = JSON_WHITESPACE.match(text, index).end()
+            if text[index] != ':':
+                raise ValueError(f"Expected ':' at offset {index}")
+            index = JSON_WHITESPACE.match(text, index + 1).end()
+        index = JSON_WHITESPACE.match(text, on_value(key, index)).end()
+        if text[index] == ',':
+            index = JSON_WHITESPACE.match(text, index + 1).end()
+        elif text[index] == closing:
+            return index + 1
+        else:
+            raise ValueError(f"Expected ',' or '{closing}' at offset {index}")
+
+
+def scan_collection_items(text: str) -> Dict[tuple, str]:
+    """
+    Return {(folder name, item name): item JSON text} for a collection,
+    slicing each item out of the text as written instead of re-serializing it.
+    """
+    decoder = json.JSONDecoder()
+    items = {}
+    
+    def skip(key, index):
+        return decoder.raw_decode(text, index)[1]
+    
+    def folder(_, index):
+        folder_items = []
+        
+        def folder_item(_, item_index):
+            value, end = decoder.raw_decode(text, item_index)
+            if isinstance(value, dict) and 'name' in value:
+                folder_items.append((value['name'], text[item_index:end]))
+            return end
+        
+        def folder_member(key, member_index):
+            if key == 'name':
+                value, end = decoder.raw_decode(text, member_index)
+                state['name'] = value
+                return end
+            if key == 'item':
+                return _walk_json_container(text, member_index, decoder, folder_item)
+            return skip(key, member_index)
+        
+        state = {}
+        end = _walk_json_container(text, index, decoder, folder_member)
+        for name, raw in folder_items:
+            items.setdefault((state.get('name'), name), raw)
+        return end
+    
+    def collection_member(key, index):
+        if key == 'item':
+            return _walk_json_container(text, index, decoder, folder)
+        return skip(key, index)
+    
+    _walk_json_container(text, 0, decoder, collection_member)
+    return items
+
+
+def update_postman_collection(converter: GraphQLToPostmanConverter, collection_name: str,
+                             previous_types: Dict[str, GraphQLType], previous_root_type_names: Dict[str, str],
+                             collection_text: str, jobs: int = 1) -> tuple:
+    """
+    Regenerate only the operations a schema change can affect and return
+    (collection JSON text, regenerated count, folder count, request count). An operation is
+    regenerated when its root field changed, or its return or argument
+    types reach a changed type. Other items are copied from collection_text
+    byte for byte, keeping any edits made to them.
+    """
+    parser = converter.parser
+    previous_roots = root_field_map(previous_types, previous_root_type_names)
+    affected = affected_type_names(parser.types, changed_type_names(previous_types, parser.types))
+    previous_items = scan_collection_items(collection_text)
+    
+    operations = []
+    reused = {}
+    for folder_name, operation_type in ROOT_OPERATIONS:
+        for index, graphql_field in enumerate(converter.root_fields(operation_type)):
+            raw = previous_items.get((folder_name, graphql_field.name))
+            previous = previous_roots.get((operation_type, graphql_field.name))
+            if (raw is None or previous is None or _pack_field(previous) != _pack_field(graphql_field)
+                    or graphql_field.type_name in affected
+                    or any(arg.type_name in affected for arg in graphql_field.args)):
+                operations.append((operation_type, index))
+            else:
+                reused[(operation_type, index)] = raw
+    
+    regenerated = {}
+    if operations:
+        for operation_type, graphql_field, item, cost, error in converter.iter_operation_items(jobs, operations):
+            if converter.record_operation_result(operation_type, graphql_field, cost, error):
+                regenerated[(operation_type, graphql_field.name)] = item
+    
+    raw_items = []
+    folder_items = {operation_type: [] for _, operation_type in ROOT_OPERATIONS}
+    for _, operation_type in ROOT_OPERATIONS:
+        for index, graphql_field in enumerate(converter.root_fields(operation_type)):
+            if (operation_type, index) in reused:
+                folder_items[operation_type].append(f"{ITEM_PLACEHOLDER}{len(raw_items)}")
+                raw_items.append(reused[(operation_type, index)])
+            elif (operation_type, graphql_field.name) in regenerated:
+                folder_items[operation_type].append(regenerated[(operation_type, graphql_field.name)])
+    
+    text = json.dumps(converter.collection_document(collection_name, folder_items), indent=2, ensure_ascii=False)
+    text = ITEM_PLACEHOLDER_PATTERN.sub(lambda match: raw_items[int(match.group(1))], text)
+    folder_count = sum(1 for items in folder_items.values() if items)
+    total = sum(len(items) for items in folder_items.values())
+    return text, len(regenerated), folder_count, total
+
+
+def load_previous_schema(output_file: str, fingerprint: str, previous_schema: Optional[str],
+                         cache_dir: Optional[str]) -> Optional[tuple]:
+    """
+    Return (types, root type names) of the schema output_file was generated
+    from, or None when it is unknown and everything must be regenerated. It
+    comes from previous_schema when given, else from the schema cache entry
+    recorded in the incremental state file.
+    """
+    state = {}
+    try:
+        with open(incremental_state_path(output_file), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[WARNING] Ignoring previous incremental state: {str(e)}")
+    
+    if state and state.get('fingerprint') != fingerprint:
+        print("[INFO] Conversion options changed since the last run, regenerating every operation")
+        return None
+    if previous_schema:
+        previous = GraphQLSchemaParser(load_graphql_schema(previous_schema), cache_dir=cache_dir)
+        return previous.types, previous.root_type_names
+    if state.get('schema_key') and cache_dir:
+        entry = _read_schema_cache(os.path.join(cache_dir, state['schema_key'] + '.pickle'))
+        if entry is not None:
+            return entry['types'], entry['root_type_names']
+    print("[INFO] Previous schema not available, regenerating every operation")
+    return None
+
+
+def save_incremental_state(output_file: str, fingerprint: str, schema_content: str):
+    state = {
+        'version': INCREMENTAL_STATE_VERSION,
+        'fingerprint': fingerprint,
+        'schema_key': os.path.splitext(os.path.basename(schema_cache_path(schema_content, '')))[0]
+    }
+    with open(incremental_state_path(output_file), 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+SCHEMA_FILE_EXTENSIONS = ('.graphql', '.graphqls', '.gql')
+
+
+def schema_file_paths(path: str) -> List[str]:
+    """
+    Expand a schema directory (searched recursively for SDL files) or glob
+    pattern into a sorted list of files, so sources always apply in the
+    same order.
+    """
+    if os.path.isdir(path):
+        paths = [os.path.join(root, name)
+                 for root, _, names in os.walk(path)
+                 for name in names if name.endswith(SCHEMA_FILE_EXTENSIONS)]
+    else:
+        paths = [match for match in glob.glob(path, recursive=True) if os.path.isfile(match)]
+    return sorted(paths)
+
+
+def load_graphql_schema(file_path: str) -> Union[str, List[tuple]]:
+    """
+    Read a schema file, or every file of a schema directory or glob
+    concurrently as a list of (file name, text) pairs.
+    """
+    if os.path.isdir(file_path) or any(char in file_path for char in '*?['):
+        paths = schema_file_paths(file_path)
+        if not paths:
+            raise FileNotFoundError(f"No GraphQL schema files found for '{file_path}'")
+        with ThreadPoolExecutor(max_workers=min(16, len(paths))) as executor:
+            return list(zip(paths, executor.map(load_graphql_schema, paths)))
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
@@ -535,22 +2062,171 @@ def save_postman_collection(collection: Dict[str, Any], output_file: str):
         raise Exception(f"Failed to save Postman collection: {str(e)}")
 
 
+def operation_filter_from_args(args: argparse.Namespace) -> Optional[OperationFilter]:
+    if args.include_operation or args.exclude_operation:
+        return OperationFilter(args.include_operation, args.exclude_operation)
+    return None
+
+
+def parser_from_args(schema_content: Union[str, List[tuple]], args: argparse.Namespace) -> GraphQLSchemaParser:
+    return GraphQLSchemaParser(schema_content, jobs=args.jobs, cache_dir=None if args.no_cache else args.cache_dir,
+                               cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+                               operations=operation_filter_from_args(args))
+
+
+def budget_from_args(args: argparse.Namespace) -> SelectionBudget:
+    return SelectionBudget(
+        max_fields=args.max_fields or None,
+        max_list_nesting=args.max_list_nesting,
+        list_size=args.list_size,
+        include=args.include,
+        exclude=args.exclude
+    )
+
+
+# Command line options that only make sense when writing an output file
+FILE_ONLY_OPTIONS = ('schema_file', 'output_file', 'incremental', 'previous_schema')
+
+# Types of the options whose command line default is None
+OPTION_TYPES = {'max_list_nesting': int}
+OPTION_TYPE_NAMES = {bool: "true or false", int: "an integer", str: "a string", list: "a list of strings"}
+
+
+def check_option_type(name: str, value: Any, default: Any, expected: Optional[type] = None):
+    """Raise ValueError unless value has the type of the option's default (or expected, when that is None)"""
+    expected = type(default) if default is not None else expected
+    if value is None and default is None:
+        return
+    if expected is list:
+        valid = isinstance(value, list) and all(isinstance(item, str) for item in value)
+    else:
+        # bool is an int subclass, but true is not a job count
+        valid = isinstance(value, expected) and (expected is bool or not isinstance(value, bool))
+    if not valid:
+        raise ValueError(f"Option '{name}' must be {OPTION_TYPE_NAMES[expected]}, got {value!r}")
+
+
+def conversion_args(options: Optional[Dict[str, Any]] = None) -> argparse.Namespace:
+    """
+    Return command line defaults overridden by `options`, keyed by the long
+    option names with underscores (e.g. {"max_fields": 100, "fragments": true})
+    """
+    args = parse_args(['schema'])
+    options = options or {}
+    unknown = sorted(name for name in options if name not in vars(args) or name in FILE_ONLY_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unsupported GraphQL option(s): {', '.join(unknown)}")
+    for name, value in options.items():
+        check_option_type(name, value, getattr(args, name), OPTION_TYPES.get(name))
+        setattr(args, name, value)
+    return args
+
+
+class SchemaMemoryCache:
+    """
+    Parsed schemas kept in memory between conversions by a long-lived
+    process (see conversion_worker.py), least recently used first out.
+    """
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._parsers: 'OrderedDict[tuple, GraphQLSchemaParser]' = OrderedDict()
+
+    def parser(self, schema_content: Union[str, List[tuple]], args: argparse.Namespace) -> GraphQLSchemaParser:
+        key = (schema_cache_path(schema_content, ''), tuple(args.include_operation), tuple(args.exclude_operation))
+        parser = self._parsers.get(key)
+        if parser is not None:
+            self._parsers.move_to_end(key)
+            print("[INFO] Reusing parsed schema from memory")
+            return parser
+        parser = parser_from_args(schema_content, args)
+        if self.max_entries > 0:
+            self._parsers[key] = parser
+            while len(self._parsers) > self.max_entries:
+                self._parsers.popitem(last=False)
+        return parser
+
+
+def convert_graphql(schema_file: str, options: Optional[Dict[str, Any]] = None,
+                    memory_cache: Optional[SchemaMemoryCache] = None) -> Dict[str, Any]:
+    """
+    Convert a schema file, directory or glob in-process and return the
+    collection. `options` are as for conversion_args; with a memory_cache,
+    an unchanged schema is not parsed again.
+    """
+    args = conversion_args(options)
+    schema_content = load_graphql_schema(schema_file)
+    if memory_cache is not None:
+        parser = memory_cache.parser(schema_content, args)
+    else:
+        parser = parser_from_args(schema_content, args)
+    converter = GraphQLToPostmanConverter(parser, args.endpoint_url, budget_from_args(args), fragments=args.fragments)
+    return converter.create_postman_collection("Postman Collection (from GraphQL)", jobs=args.jobs)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Convert a GraphQL schema into a Postman collection",
+        epilog="Example: python graphql_to_postman.py schema.graphql collection.json https://api.example.com/graphql")
+    parser.add_argument('schema_file',
+                        help="GraphQL SDL file or introspection result (JSON) to convert, or a directory "
+                             "or quoted glob of schema files to merge")
+    parser.add_argument('output_file', nargs='?', default='graphql_collection.json', help="Output collection file")
+    parser.add_argument('endpoint_url', nargs='?', default='https://api.example.com/graphql',
+                        help="GraphQL endpoint the requests are sent to")
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help="Parse chunks of the schema and generate operations in N worker processes "
+                             "(default: 1, serial)")
+    parser.add_argument('--cache-dir', default=DEFAULT_SCHEMA_CACHE_DIR, metavar='DIR',
+                        help="Keep parsed schemas in DIR, keyed by a hash of the schema text "
+                             f"(default: {DEFAULT_SCHEMA_CACHE_DIR})")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_SCHEMA_CACHE_BYTES // (1024 * 1024), metavar='N',
+                        help="Evict the least recently used cached schemas beyond N megabytes (default: 256)")
+    parser.add_argument('--no-cache', action='store_true', help="Neither read nor write the schema cache")
+    parser.add_argument('--fragments', action='store_true',
+                        help="Select fields through named fragments (...UserFields) attached to each operation "
+                             "instead of inlining every nested selection")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Update the existing output_file, regenerating only operations affected by schema "
+                             "changes and copying the rest unchanged (state is kept in <output_file>.state.json)")
+    parser.add_argument('--previous-schema', metavar='FILE',
+                        help="With --incremental, the schema output_file was generated from (default: the cached "
+                             "copy recorded by the previous --incremental run)")
+    parser.add_argument('--include-operation', action='append', default=[], metavar='PATTERN',
+                        help="Only generate root fields whose name matches, e.g. 'orders*'. Only the types they "
+                             "reach are parsed. May be repeated")
+    parser.add_argument('--exclude-operation', action='append', default=[], metavar='PATTERN',
+                        help="Skip root fields whose name matches. May be repeated")
+    parser.add_argument('--max-fields', type=int, default=500, metavar='N',
+                        help="Select at most N fields per operation, preferring IDs and scalars over nested "
+                             "objects when the full selection is larger (default: 500, 0 for no limit)")
+    parser.add_argument('--max-list-nesting', type=int, metavar='N',
+                        help="Do not select list fields nested more than N lists deep")
+    parser.add_argument('--list-size', type=int, default=10, metavar='N',
+                        help="Items assumed per list when estimating operation cost (default: 10)")
+    parser.add_argument('--include', action='append', default=[], metavar='RULE',
+                        help="Only select matching fields of the types named, e.g. User.id or 'User.*Name'. "
+                             "May be repeated")
+    parser.add_argument('--exclude', action='append', default=[], metavar='RULE',
+                        help="Never select a field (Type.field) or fields returning a type (Type). "
+                             "Wildcards are allowed. May be repeated")
+    return parser.parse_args(argv)
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python graphql_to_postman.py <schema_file> [output_file] [endpoint_url]")
-        print("Example: python graphql_to_postman.py schema.graphql collection.json https://api.example.com/graphql")
-        sys.exit(1)
-    
-    schema_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else 'graphql_collection.json'
-    endpoint_url = sys.argv[3] if len(sys.argv) > 3 else 'https://api.example.com/graphql'
+    args = parse_args()
+    schema_file = args.schema_file
+    output_file = args.output_file
+    endpoint_url = args.endpoint_url
     
     try:
         print(f"[INFO] Loading GraphQL schema from: {schema_file}")
         schema_content = load_graphql_schema(schema_file)
+        if not isinstance(schema_content, str):
+            print(f"[INFO] Read {len(schema_content)} schema files")
         
         print("[INFO] Parsing GraphQL schema...")
-        parser = GraphQLSchemaParser(schema_content)
+        parser = parser_from_args(schema_content, args)
         
         print(f"[INFO] Found {len(parser.types)} types")
         print(f"[INFO] Found {len(parser.queries)} queries")
@@ -558,15 +2234,35 @@ def main():
         print(f"[INFO] Found {len(parser.subscriptions)} subscriptions")
         
         print("[INFO] Converting to Postman collection with GraphQL body type...")
-        converter = GraphQLToPostmanConverter(parser, endpoint_url)
-        collection = converter.create_postman_collection("Postman Collection (from GraphQL)")
+        budget = budget_from_args(args)
+        converter = GraphQLToPostmanConverter(parser, endpoint_url, budget, fragments=args.fragments)
+        collection_name = "Postman Collection (from GraphQL)"
+        cache_dir = None if args.no_cache else args.cache_dir
+        fingerprint = incremental_fingerprint(endpoint_url, budget, args.fragments)
+        previous = None
+        if args.incremental and os.path.exists(output_file):
+            previous = load_previous_schema(output_file, fingerprint, args.previous_schema, cache_dir)
         
-        print(f"[INFO] Saving collection to: {output_file}")
-        save_postman_collection(collection, output_file)
+        if previous is not None:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                collection_text = f.read()
+            collection_text, regenerated, folder_count, total_requests = update_postman_collection(
+                converter, collection_name, previous[0], previous[1], collection_text, jobs=args.jobs)
+            print(f"[INCREMENTAL] Regenerated {regenerated} of {total_requests} operations")
+            print(f"[INFO] Saving collection to: {output_file}")
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(collection_text)
+        else:
+            collection = converter.create_postman_collection(collection_name, jobs=args.jobs)
+            print(f"[INFO] Saving collection to: {output_file}")
+            save_postman_collection(collection, output_file)
+            folder_count = len(collection['item'])
+            total_requests = sum(len(folder.get('item', [])) for folder in collection['item'])
+        if args.incremental:
+            save_incremental_state(output_file, fingerprint, schema_content)
         
-        total_requests = sum(len(folder.get('item', [])) for folder in collection['item'])
         print(f"\n[SUCCESS] Conversion completed!")
-        print(f"[FOLDERS] Created {len(collection['item'])} folders")
+        print(f"[FOLDERS] Created {folder_count} folders")
         print(f"[REQUESTS] Generated {total_requests} requests")
         print(f"[OUTPUT] Saved to: {output_file}")
         print(f"[ENDPOINT] Configured for: {endpoint_url}")
@@ -1,72 +1,687 @@
+import argparse
+import copy
+import hashlib
 import json
+import mmap
+import os
+import pickle
 import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urljoin, urlparse
-from ruamel.yaml import YAML
+from ruamel.yaml import YAML, __version__ as ruamel_version
 
 yaml = YAML()
 
+# Safe loader building plain dicts/lists; ruamel uses its C parser for it
+# when ruamel.yaml.clib is installed and falls back to pure Python otherwise
+fast_yaml = YAML(typ='safe')
 
-def load_raml(raml_file):
-    """Load RAML file and return parsed data"""
-    with open(raml_file, 'r') as f:
-        return yaml.load(f)
+# Bump when the cached representation of a parsed RAML document changes
+RAML_CACHE_VERSION = 2
 
+# Included files at least this large are read through mmap
+MMAP_THRESHOLD = 1024 * 1024
 
-def raml_type_to_example(type_def, types, depth=0):
+# Sections a `uses:` library contributes to the root under "<name>.<key>"
+LIBRARY_SECTIONS = ('types', 'traits', 'resourceTypes', 'securitySchemes', 'annotationTypes')
+
+
+class RamlInclude:
+    """Placeholder for an `!include <path>` value until it is resolved"""
+
+    def __init__(self, path):
+        self.path = path
+
+
+def _construct_include(constructor, node):
+    return RamlInclude(constructor.construct_scalar(node))
+
+
+yaml.constructor.add_constructor('!include', _construct_include)
+fast_yaml.constructor.add_constructor('!include', _construct_include)
+
+# Process-wide cache of parsed include/library fragments:
+# (abs_path, fast, include_root) -> (fragment, dependency stats)
+_fragment_cache = {}
+
+
+def _file_stat(path):
+    st = os.stat(path)
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def _dependencies_unchanged(deps):
+    try:
+        return all(_file_stat(stat[0]) == stat for stat in deps)
+    except OSError:
+        return False
+
+
+def _read_text(path):
+    """Read a UTF-8 file, memory-mapping it when it is large"""
+    if os.path.getsize(path) >= MMAP_THRESHOLD:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            # Decode straight from the mapping without an intermediate bytes copy
+            return str(m, 'utf-8')
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def include_path(base_dir, path, include_root):
     """
-    Generate example JSON from RAML type definition.
-    Avoid infinite recursion by limiting depth.
+    Resolve an `!include` or `uses:` path against base_dir, refusing files
+    outside include_root (after following symlinks), or any file when
+    include_root is None
     """
-    if depth > 5:
-        return None
+    if include_root is None:
+        raise ValueError(f"Cannot include '{path}': includes are disabled")
+    full_path = os.path.realpath(os.path.join(base_dir, path))
+    if os.path.commonpath([full_path, include_root]) != include_root:
+        raise ValueError(f"Cannot include '{path}': it is outside '{include_root}'")
+    return full_path
+
+
+def load_raml_fragment(path, fast=False, _loading=(), include_root=None):
+    """
+    Load an included file or library, resolving its own includes relative to
+    its directory and within include_root. YAML/RAML fragments are parsed,
+    JSON is decoded and any other file is returned as text. Each file is
+    parsed once per process and reused until it (or anything it includes)
+    changes on disk. Callers get their own copy of the fragment, since
+    documents are modified in place once it is part of them.
+    Returns (fragment, dependency stats).
+    """
+    path = os.path.abspath(path)
+    if path in _loading:
+        raise ValueError(f"Circular !include of '{path}'")
     
-    if not type_def:
-        return None
-        
-    # Handle string type references
+    cache_key = (path, fast, include_root)
+    cached = _fragment_cache.get(cache_key)
+    if cached is not None and _dependencies_unchanged(cached[1]):
+        return copy.deepcopy(cached[0]), cached[1]
+    
+    deps = {_file_stat(path)}
+    text = _read_text(path)
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.raml', '.yaml', '.yml'):
+        fragment = (fast_yaml if fast else yaml).load(text)
+        fragment = resolve_raml_references(fragment, os.path.dirname(path), fast, deps, _loading + (path,),
+                                           include_root)
+    elif extension == '.json':
+        fragment = json.loads(text)
+    else:
+        fragment = text
+    
+    _fragment_cache[cache_key] = (fragment, frozenset(deps))
+    return copy.deepcopy(fragment), _fragment_cache[cache_key][1]
+
+
+def _resolve_includes(value, base_dir, fast, deps, loading, include_root):
+    if isinstance(value, RamlInclude):
+        fragment, fragment_deps = load_raml_fragment(include_path(base_dir, value.path, include_root), fast,
+                                                     loading, include_root)
+        deps.update(fragment_deps)
+        return fragment
+    if isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = _resolve_includes(item, base_dir, fast, deps, loading, include_root)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            value[index] = _resolve_includes(item, base_dir, fast, deps, loading, include_root)
+    return value
+
+
+def _qualify_type_refs(type_def, local_names, prefix):
+    """Rewrite references to a library's own types as '<prefix><name>'"""
     if isinstance(type_def, str):
-        # Check if it's a reference to a defined type
-        if type_def in types:
-            type_obj = types[type_def]
-            if isinstance(type_obj, dict) and 'properties' in type_obj:
-                return raml_type_to_example(type_obj['properties'], types, depth + 1)
-            elif isinstance(type_obj, dict) and 'type' in type_obj:
-                return raml_type_to_example(type_obj['type'], types, depth + 1)
-        
-        # Handle array types like "User[]"
-        if type_def.endswith('[]'):
-            element_type = type_def[:-2]
-            element_example = raml_type_to_example(element_type, types, depth + 1)
-            return [element_example] if element_example else []
+        base = type_def.rstrip('[]')
+        if base in local_names:
+            return prefix + base + type_def[len(base):]
+        return type_def
+    if isinstance(type_def, dict):
+        qualified = {}
+        for key, value in type_def.items():
+            if key in ('type', 'items'):
+                qualified[key] = _qualify_type_refs(value, local_names, prefix)
+            elif key == 'properties' and isinstance(value, dict):
+                qualified[key] = {prop: _qualify_type_refs(prop_def, local_names, prefix)
+                                  for prop, prop_def in value.items()}
+            else:
+                qualified[key] = value
+        return qualified
+    return type_def
+
+
+def _qualify_names(value, local_names, prefix):
+    """Rewrite a `type:`/`is:` value's references to a library's own definitions"""
+    if isinstance(value, list):
+        return [_qualify_names(entry, local_names, prefix) for entry in value]
+    if isinstance(value, str):
+        return prefix + value if value in local_names else value
+    if isinstance(value, dict):
+        return {prefix + name if name in local_names else name: params for name, params in value.items()}
+    return value
+
+
+def _qualify_body(body, local_types, prefix):
+    """Qualify the types of a body given directly or per media type"""
+    qualified = _qualify_type_refs(body, local_types, prefix)
+    if isinstance(qualified, dict):
+        for media_type, definition in qualified.items():
+            if isinstance(media_type, str) and '/' in media_type:
+                qualified[media_type] = _qualify_type_refs(definition, local_types, prefix)
+    return qualified
+
+
+def _qualify_method(method, local, prefix):
+    """Qualify the trait, body and parameter references of a library method or trait"""
+    if not isinstance(method, dict):
+        return method
+    qualified = {}
+    for key, value in method.items():
+        if key == 'is':
+            value = _qualify_names(value, local['traits'], prefix)
+        elif key == 'body':
+            value = _qualify_body(value, local['types'], prefix)
+        elif key == 'responses' and isinstance(value, dict):
+            value = {code: {**response, 'body': _qualify_body(response['body'], local['types'], prefix)}
+                     if isinstance(response, dict) and 'body' in response else response
+                     for code, response in value.items()}
+        elif key in ('queryParameters', 'headers', 'uriParameters') and isinstance(value, dict):
+            value = {name: _qualify_type_refs(parameter, local['types'], prefix) for name, parameter in value.items()}
+        qualified[key] = value
+    return qualified
+
+
+def _qualify_resource_type(resource_type, local, prefix):
+    """Qualify a library resourceType's references to the library's own definitions"""
+    if not isinstance(resource_type, dict):
+        return resource_type
+    qualified = _qualify_method(resource_type, local, prefix)
+    for key, value in qualified.items():
+        if key == 'type':
+            qualified[key] = _qualify_names(value, local['resourceTypes'], prefix)
+        elif isinstance(key, str) and key.rstrip('?').lower() in HTTP_METHODS:
+            qualified[key] = _qualify_method(value, local, prefix)
+    return qualified
+
+
+def _apply_libraries(document, base_dir, fast, deps, loading, include_root):
+    """Merge every `uses:` library into the document under its namespace"""
+    uses = document.get('uses')
+    if not isinstance(uses, dict):
+        return
+    
+    for namespace, library_path in uses.items():
+        library, library_deps = load_raml_fragment(include_path(base_dir, library_path, include_root), fast,
+                                                   loading, include_root)
+        deps.update(library_deps)
+        if not isinstance(library, dict):
+            continue
         
-        # Primitive types
-        primitive_examples = {
-            'string': "example string",
-            'integer': 123,
-            'number': 123.45,
-            'boolean': True,
-            'datetime': "2024-01-01T12:00:00Z",
-            'date': "2024-01-01",
-            'array': [],
-            'object': {},
-            'file': "file.txt"
-        }
-        return primitive_examples.get(type_def, f"example_{type_def}")
+        prefix = f"{namespace}."
+        # Definitions in a library refer to each other without the namespace
+        local = {section: set(_named_definitions(library.get(section)))
+                 for section in ('types', 'traits', 'resourceTypes')}
+        for section in LIBRARY_SECTIONS:
+            entries = _named_definitions(library.get(section)) if section in local else library.get(section)
+            if not isinstance(entries, dict):
+                continue
+            if not isinstance(document.get(section), dict):
+                document[section] = _named_definitions(document.get(section))
+            for name, definition in entries.items():
+                if section == 'types':
+                    definition = _qualify_type_refs(definition, local['types'], prefix)
+                elif section == 'traits':
+                    definition = _qualify_method(definition, local, prefix)
+                elif section == 'resourceTypes':
+                    definition = _qualify_resource_type(definition, local, prefix)
+                document[section][prefix + name] = definition
+
+
+def resolve_raml_references(document, base_dir, fast=False, deps=None, _loading=(), include_root=None):
+    """
+    Resolve `!include` values and `uses:` libraries of a parsed document in
+    place, relative to base_dir. Only files inside include_root can be
+    included; with include_root None, any include is an error. Files it
+    depends on are added to deps.
+    """
+    deps = set() if deps is None else deps
+    document = _resolve_includes(document, base_dir, fast, deps, _loading, include_root)
+    if isinstance(document, dict):
+        _apply_libraries(document, base_dir, fast, deps, _loading, include_root)
+    return document
+
+
+def raml_cache_path(content, fast, cache_dir, include_root=None):
+    """Return the cache file for RAML content parsed with the given loader and include root"""
+    digest = hashlib.sha256()
+    digest.update(f"{RAML_CACHE_VERSION}:{ruamel_version}:{'safe' if fast else 'rt'}:{include_root}:".encode('utf-8'))
+    digest.update(content)
+    return os.path.join(cache_dir, digest.hexdigest() + '.pickle')
+
+
+def _read_raml_cache(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # A truncated or stale entry is not fatal, the file is parsed again
+        print(f"[WARNING] Ignoring unreadable RAML cache entry '{cache_path}': {str(e)}")
+        return None
+
+
+def _write_raml_cache(cache_path, entry):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Atomic rename so concurrent conversions never see a partial entry
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"[WARNING] Could not write RAML cache entry '{cache_path}': {str(e)}")
+
+
+def load_raml(raml_file, fast=False, cache_dir=None, includes=True):
+    """
+    Load RAML file and return parsed data.
+    `!include` values and `uses:` libraries are resolved relative to the file,
+    with every referenced file parsed once (see load_raml_fragment). They may
+    only name files under the file's own directory; with includes=False,
+    for specs from untrusted sources, they are refused altogether.
+    With fast=True the safe loader is used instead of the round-trip loader,
+    skipping the comment-preserving CommentedMap objects the converter never
+    needs. With a cache_dir, the resolved document is pickled under a hash of
+    the file contents, and reused while none of its included files change.
+    """
+    with open(raml_file, 'rb') as f:
+        content = f.read()
+    
+    include_root = os.path.realpath(os.path.dirname(os.path.abspath(raml_file))) if includes else None
+    cache_path = raml_cache_path(content, fast, cache_dir, include_root) if cache_dir else None
+    if cache_path:
+        entry = _read_raml_cache(cache_path)
+        if entry is not None and _dependencies_unchanged(entry['deps']):
+            return entry['data']
     
-    # Handle object type definitions
-    elif isinstance(type_def, dict):
-        example = {}
-        for prop, prop_def in type_def.items():
-            if isinstance(prop_def, dict):
-                if 'type' in prop_def:
-                    example[prop] = raml_type_to_example(prop_def['type'], types, depth + 1)
+    deps = set()
+    raml_data = (fast_yaml if fast else yaml).load(content)
+    raml_data = resolve_raml_references(raml_data, os.path.dirname(os.path.abspath(raml_file)), fast, deps,
+                                        include_root=include_root)
+    
+    if cache_path:
+        _write_raml_cache(cache_path, {'deps': sorted(deps), 'data': raml_data})
+    return raml_data
+
+
+PRIMITIVE_EXAMPLES = {
+    'string': "example string",
+    'integer': 123,
+    'number': 123.45,
+    'boolean': True,
+    'datetime': "2024-01-01T12:00:00Z",
+    'date': "2024-01-01",
+    'array': [],
+    'object': {},
+    'file': "file.txt"
+}
+
+# Named types nested deeper than this are rendered as None, so examples of
+# wide acyclic type graphs stay small
+MAX_EXAMPLE_DEPTH = 5
+
+
+class RamlTypeResolver:
+    """
+    Per-conversion resolver that turns RAML type definitions into examples.
+    Recursive references are cut at types already being resolved, and named
+    types nested deeper than MAX_EXAMPLE_DEPTH are cut too; both are
+    rendered as None. A named type's example therefore only depends on its
+    nesting depth and on which of the types it can reach are being resolved
+    around it, so examples are cached per (type, depth, those types) and
+    come out the same whatever order the types are resolved in. Serialised
+    JSON examples are cached per (type, media type).
+    """
+
+    def __init__(self, types):
+        self.types = types or {}
+        self._examples = {}
+        self._serialized = {}
+        self._reachable = {}
+        # Names of the types being resolved
+        self._resolving = set()
+
+    def example(self, type_def):
+        """Return an example value for a type name or inline type definition"""
+        if not type_def:
+            return None
+        
+        # Handle string type references
+        if isinstance(type_def, str):
+            # Check if it's a reference to a defined type
+            if type_def in self.types:
+                type_obj = self.types[type_def]
+                if isinstance(type_obj, dict) and ('properties' in type_obj or 'type' in type_obj):
+                    return self._named_example(type_def, type_obj)
+            
+            # Handle array types like "User[]"
+            if type_def.endswith('[]'):
+                element_example = self.example(type_def[:-2])
+                return [element_example] if element_example else []
+            
+            # Primitive types
+            return PRIMITIVE_EXAMPLES.get(type_def, f"example_{type_def}")
+        
+        # Handle object type definitions
+        elif isinstance(type_def, dict):
+            example = {}
+            for prop, prop_def in type_def.items():
+                if isinstance(prop_def, dict) and 'type' in prop_def:
+                    example[prop] = self.example(prop_def['type'])
                 else:
-                    example[prop] = raml_type_to_example(prop_def, types, depth + 1)
+                    example[prop] = self.example(prop_def)
+            return example
+        
+        return None
+
+    def _named_type(self, type_def):
+        """Return the definition of a named type that example() expands, or None"""
+        type_obj = self.types.get(type_def) if isinstance(type_def, str) else None
+        if isinstance(type_obj, dict) and ('properties' in type_obj or 'type' in type_obj):
+            return type_obj
+        return None
+
+    def _references(self, type_def, names):
+        """Collect the named types example() expands directly for type_def"""
+        if isinstance(type_def, str):
+            if self._named_type(type_def) is not None:
+                names.add(type_def)
+            elif type_def.endswith('[]'):
+                self._references(type_def[:-2], names)
+        elif isinstance(type_def, dict):
+            for prop_def in type_def.values():
+                if isinstance(prop_def, dict) and 'type' in prop_def:
+                    prop_def = prop_def['type']
+                self._references(prop_def, names)
+
+    def _reachable_types(self, type_name):
+        """Named types reachable from a named type's definition, itself included when recursive"""
+        if type_name not in self._reachable:
+            reachable = set()
+            pending = [type_name]
+            while pending:
+                type_obj = self._named_type(pending.pop())
+                names = set()
+                self._references(type_obj['properties'] if 'properties' in type_obj else type_obj['type'], names)
+                pending.extend(names - reachable)
+                reachable |= names
+            self._reachable[type_name] = frozenset(reachable)
+        return self._reachable[type_name]
+
+    def _named_example(self, type_name, type_obj):
+        # Cycles are cut, so the types being resolved are the nesting depth
+        depth = len(self._resolving)
+        if type_name in self._resolving or depth >= MAX_EXAMPLE_DEPTH:
+            # Recursive reference or nested too deep: cut here
+            return None
+        
+        key = (type_name, depth, frozenset(self._resolving & self._reachable_types(type_name)))
+        if key in self._examples:
+            return self._examples[key]
+        
+        self._resolving.add(type_name)
+        try:
+            if 'properties' in type_obj:
+                example = self.example(type_obj['properties'])
             else:
-                example[prop] = raml_type_to_example(prop_def, types, depth + 1)
+                example = self.example(type_obj['type'])
+        finally:
+            self._resolving.discard(type_name)
+        
+        self._examples[key] = example
         return example
-    
-    return None
+
+    def serialized_example(self, type_def, media_type):
+        """Return the example as an indented JSON string, or None if it is empty"""
+        if not isinstance(type_def, str):
+            example_data = self.example(type_def)
+            return json.dumps(example_data, indent=2) if example_data else None
+        
+        key = (type_def, media_type)
+        if key not in self._serialized:
+            example_data = self.example(type_def)
+            self._serialized[key] = json.dumps(example_data, indent=2) if example_data else None
+        return self._serialized[key]
+
+
+def raml_type_to_example(type_def, types):
+    """Generate example JSON from RAML type definition"""
+    return RamlTypeResolver(types).example(type_def)
+
+
+HTTP_METHODS = ('get', 'post', 'put', 'delete', 'patch', 'head', 'options')
+
+# `<<name>>` or `<<name | !transform | !transform>>`
+PARAMETER_PATTERN = re.compile(r'<<\s*(\w+)((?:\s*\|\s*!\w+)*)\s*>>')
+
+
+def _split_words(value):
+    return [w for w in re.split(r'[\s_\-]+|(?<=[a-z0-9])(?=[A-Z])', value) if w]
+
+
+PARAMETER_TRANSFORMS = {
+    'singularize': lambda v: v[:-3] + 'y' if v.endswith('ies') else (v[:-1] if v.endswith('s') else v),
+    'pluralize': lambda v: v[:-1] + 'ies' if v.endswith('y') else (v if v.endswith('s') else v + 's'),
+    'uppercase': lambda v: v.upper(),
+    'lowercase': lambda v: v.lower(),
+    'lowercamelcase': lambda v: ''.join(w.lower() if i == 0 else w.title() for i, w in enumerate(_split_words(v))),
+    'uppercamelcase': lambda v: ''.join(w.title() for w in _split_words(v)),
+    'lowerunderscorecase': lambda v: '_'.join(w.lower() for w in _split_words(v)),
+    'upperunderscorecase': lambda v: '_'.join(w.upper() for w in _split_words(v)),
+    'lowerhyphencase': lambda v: '-'.join(w.lower() for w in _split_words(v)),
+    'upperhyphencase': lambda v: '-'.join(w.upper() for w in _split_words(v)),
+}
+
+
+def _named_definitions(section):
+    """Normalise a traits/resourceTypes section (RAML 1.0 map or 0.8 list of maps)"""
+    if isinstance(section, list):
+        merged = {}
+        for entry in section:
+            if isinstance(entry, dict):
+                merged.update(entry)
+        return merged
+    return section if isinstance(section, dict) else {}
+
+
+def _as_list(value):
+    if not value:
+        return []
+    return list(value) if isinstance(value, list) else [value]
+
+
+def _references(value):
+    """Turn a `type:`/`is:` value into a list of (name, parameters) pairs"""
+    references = []
+    for entry in _as_list(value):
+        if isinstance(entry, str):
+            references.append((entry, {}))
+        elif isinstance(entry, dict):
+            for name, params in entry.items():
+                references.append((name, dict(params) if isinstance(params, dict) else {}))
+    return references
+
+
+def _merge(base, override):
+    """Deep-merge two definitions without mutating either; override wins"""
+    if override is None:
+        return base
+    if not (isinstance(base, dict) and isinstance(override, dict)):
+        return override
+    merged = dict(override)
+    for key, value in base.items():
+        if key not in merged:
+            merged[key] = value
+        else:
+            merged[key] = _merge(value, merged[key])
+    return merged
+
+
+def _merge_method(base, override):
+    """Merge a method a resource type defines into the resource's own; both lists of traits apply"""
+    merged = _merge(base, override)
+    if isinstance(base, dict) and isinstance(override, dict) and 'is' in base and 'is' in override:
+        # The method's own traits apply before the resource type's
+        merged['is'] = _as_list(override['is']) + _as_list(base['is'])
+    return merged
+
+
+def resource_path_name(resource_path):
+    """Rightmost path segment that is not a URI parameter, as RAML defines it"""
+    for segment in reversed(resource_path.strip('/').split('/')):
+        if segment and '{' not in segment:
+            return segment
+    return ''
+
+
+class RamlExpander:
+    """
+    Applies `type:` (resourceTypes) and `is:` (traits) to resources and
+    methods, substituting `<<parameter>>` placeholders. Expanding a definition
+    is memoized on its name and the values of the parameters it actually
+    references, so a trait applied to hundreds of methods is expanded once per
+    distinct set of arguments.
+    """
+
+    def __init__(self, traits=None, resource_types=None):
+        self.traits = _named_definitions(traits)
+        self.resource_types = _named_definitions(resource_types)
+        self._placeholders = {}
+        self._expanded = {}
+
+    @classmethod
+    def from_raml(cls, raml_data):
+        return cls(raml_data.get('traits'), raml_data.get('resourceTypes'))
+
+    def __bool__(self):
+        return bool(self.traits or self.resource_types)
+
+    def _used_parameters(self, kind, name, definition):
+        key = (kind, name)
+        if key not in self._placeholders:
+            names = set()
+            stack = [definition]
+            while stack:
+                value = stack.pop()
+                if isinstance(value, str):
+                    names.update(match.group(1) for match in PARAMETER_PATTERN.finditer(value))
+                elif isinstance(value, dict):
+                    stack.extend(k for k in value.keys() if isinstance(k, str))
+                    stack.extend(value.values())
+                elif isinstance(value, list):
+                    stack.extend(value)
+            self._placeholders[key] = frozenset(names)
+        return self._placeholders[key]
+
+    def _expand_definition(self, kind, definitions, name, params):
+        definition = definitions.get(name)
+        if not isinstance(definition, dict):
+            print(f"[WARNING] Unknown {kind} '{name}'")
+            return {}
+        
+        used = self._used_parameters(kind, name, definition)
+        key = (kind, name, tuple(sorted((p, repr(params.get(p))) for p in used)))
+        if key not in self._expanded:
+            self._expanded[key] = self._substitute(definition, params)
+        return self._expanded[key]
+
+    def _substitute(self, value, params):
+        if isinstance(value, str):
+            return self._substitute_string(value, params)
+        if isinstance(value, dict):
+            return {self._substitute_string(k, params) if isinstance(k, str) else k: self._substitute(v, params)
+                    for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._substitute(v, params) for v in value]
+        return value
+
+    @staticmethod
+    def _substitute_string(value, params):
+        if '<<' not in value:
+            return value
+        
+        def replace(match):
+            name, transforms = match.group(1), match.group(2)
+            if name not in params:
+                return match.group(0)
+            result = str(params[name])
+            for transform in re.findall(r'!(\w+)', transforms):
+                result = PARAMETER_TRANSFORMS.get(transform.lower(), lambda v: v)(result)
+            return result
+        
+        whole = PARAMETER_PATTERN.fullmatch(value)
+        if whole and not whole.group(2) and whole.group(1) in params:
+            # A value that is only a placeholder keeps the argument's own type
+            return params[whole.group(1)]
+        return PARAMETER_PATTERN.sub(replace, value)
+
+    def trait(self, name, params):
+        return self._expand_definition('trait', self.traits, name, params)
+
+    def resource_type(self, name, params, _seen=()):
+        """Expand a resource type, including the resource types it inherits from"""
+        expanded = self._expand_definition('resource type', self.resource_types, name, params)
+        parent = expanded.get('type')
+        if parent and name not in _seen:
+            for parent_name, parent_params in _references(parent):
+                inherited = self.resource_type(parent_name, {**params, **parent_params}, _seen + (name,))
+                own = {k: v for k, v in expanded.items() if k != 'type'}
+                expanded = _merge(inherited, own)
+                for key in own.keys() & inherited.keys():
+                    if key.rstrip('?').lower() in HTTP_METHODS:
+                        expanded[key] = _merge_method(inherited[key], own[key])
+        return expanded
+
+    def expand(self, resource_path, resource_data, parent_path=""):
+        """Return a copy of a resource tree with resource types and traits applied"""
+        if not self or not isinstance(resource_data, dict):
+            return resource_data
+        
+        full_path = parent_path + resource_path
+        params = {'resourcePath': full_path, 'resourcePathName': resource_path_name(full_path)}
+        resource = dict(resource_data)
+        
+        for type_name, type_params in _references(resource.get('type')):
+            applied = self.resource_type(type_name, {**params, **type_params})
+            for key, value in applied.items():
+                optional = key.endswith('?')
+                key = key.rstrip('?')
+                if key == 'is':
+                    # Resource type traits apply after the resource's own
+                    resource['is'] = _as_list(resource.get('is')) + _as_list(value)
+                elif optional and key not in resource:
+                    continue
+                elif key.lower() in HTTP_METHODS and key in resource:
+                    resource[key] = _merge_method(value, resource[key])
+                else:
+                    resource[key] = _merge(value, resource.get(key)) if key in resource else value
+        
+        resource_traits = _references(resource.get('is'))
+        for key, value in resource.items():
+            if key.lower() in HTTP_METHODS:
+                method_data = value if isinstance(value, dict) else {}
+                method_params = {**params, 'methodName': key.lower()}
+                for trait_name, trait_params in _references(method_data.get('is')) + resource_traits:
+                    method_data = _merge(self.trait(trait_name, {**method_params, **trait_params}), method_data)
+                resource[key] = method_data
+            elif key.startswith('/') and isinstance(value, dict):
+                resource[key] = self.expand(key, value, full_path)
+        
+        return resource
 
 
 def parse_url(base_uri, resource_path):
@@ -97,8 +712,9 @@ def parse_url(base_uri, resource_path):
     }
 
 
-def build_postman_request(method, base_uri, resource_path, method_data, types):
+def build_postman_request(method, base_uri, resource_path, method_data, types, resolver=None):
     """Build a Postman request object from RAML method definition"""
+    resolver = resolver or RamlTypeResolver(types)
     req = {
         "method": method.upper(),
         "header": [],
@@ -153,20 +769,20 @@ def build_postman_request(method, base_uri, resource_path, method_data, types):
                         req['body']['formdata'].append(form_item)
             else:
                 # Handle JSON/raw body
-                example_data = None
+                raw_example = None
                 
                 # Try to get example from type
                 if isinstance(body_spec, dict):
                     if 'type' in body_spec:
-                        example_data = raml_type_to_example(body_spec['type'], types)
+                        raw_example = resolver.serialized_example(body_spec['type'], media_type)
                     elif 'properties' in body_spec:
-                        example_data = raml_type_to_example(body_spec['properties'], types)
-                    elif 'example' in body_spec:
-                        example_data = body_spec['example']
+                        raw_example = resolver.serialized_example(body_spec['properties'], media_type)
+                    elif 'example' in body_spec and body_spec['example']:
+                        raw_example = json.dumps(body_spec['example'], indent=2)
                 
                 req['body'] = {
                     "mode": "raw",
-                    "raw": json.dumps(example_data, indent=2) if example_data else "{}",
+                    "raw": raw_example or "{}",
                     "options": {
                         "raw": {
                             "language": "json" if 'json' in media_type else "text"
@@ -188,21 +804,33 @@ def build_postman_request(method, base_uri, resource_path, method_data, types):
     return req
 
 
-def extract_requests_from_resource(resource_path, resource_data, base_uri, types, parent_path=""):
-    """Extract all requests from a resource and its nested resources"""
-    requests = []
-    full_path = parent_path + resource_path
-    
-    # HTTP methods to look for
-    http_methods = ['get', 'post', 'put', 'delete', 'patch', 'head', 'options']
-    
-    # Process methods at current level
+ORIGINAL_REQUEST_MODES = ('full', 'slim', 'dedup')
+
+
+def original_request_for_response(request, mode):
+    """
+    Return what a response example should carry as 'originalRequest', or None
+    to leave the key out.
+    - full: the complete request (Postman's default)
+    - slim: only the method and URL
+    - dedup: nothing; the request is already written once on the parent item,
+      which importers use when a response has no originalRequest
+    """
+    if mode == 'slim':
+        return {"method": request["method"], "url": request["url"]}
+    if mode == 'dedup':
+        return None
+    return request
+
+
+def _iter_method_requests(full_path, resource_data, base_uri, types, resolver, original_request):
+    """Yield the request items for the methods defined directly on a resource"""
     for key, value in resource_data.items():
-        if key.lower() in http_methods:
+        if key.lower() in HTTP_METHODS:
             method_name = key.lower()
             method_data = value
             
-            request = build_postman_request(method_name, base_uri, full_path, method_data, types)
+            request = build_postman_request(method_name, base_uri, full_path, method_data, types, resolver)
             
             # Create request item
             request_item = {
@@ -213,20 +841,22 @@ def extract_requests_from_resource(resource_path, resource_data, base_uri, types
             # Add response examples if available
             if 'responses' in method_data and method_data['responses']:
                 request_item['response'] = []
+                response_request = original_request_for_response(request, original_request)
                 for status_code, response_data in method_data['responses'].items():
                     # Fix: Handle None response_data
                     if response_data is None:
                         response_data = {}
                     
-                    example_response = {
-                        "name": f"Response {status_code}",
-                        "originalRequest": request,
+                    example_response = {"name": f"Response {status_code}"}
+                    if response_request is not None:
+                        example_response["originalRequest"] = response_request
+                    example_response.update({
                         "status": response_data.get('description', '') if isinstance(response_data, dict) else '',
                         "code": int(status_code),
                         "_postman_previewlanguage": "json",
                         "header": [],
                         "body": ""
-                    }
+                    })
                     
                     # Add response body example
                     if isinstance(response_data, dict) and 'body' in response_data:
@@ -238,9 +868,9 @@ def extract_requests_from_resource(resource_path, resource_data, base_uri, types
                                 body_spec = body_data[media_type]
                                 
                                 if isinstance(body_spec, dict) and 'type' in body_spec:
-                                    example_data = raml_type_to_example(body_spec['type'], types)
-                                    if example_data:
-                                        example_response['body'] = json.dumps(example_data, indent=2)
+                                    example_body = resolver.serialized_example(body_spec['type'], media_type)
+                                    if example_body:
+                                        example_response['body'] = example_body
                                 
                                 example_response['header'].append({
                                     "key": "Content-Type",
@@ -249,116 +879,609 @@ def extract_requests_from_resource(resource_path, resource_data, base_uri, types
                     
                     request_item['response'].append(example_response)
             
-            requests.append(request_item)
+            yield request_item
+
+
+def iter_requests_from_resource(resource_path, resource_data, base_uri, types, parent_path="", resolver=None,
+                                original_request='full'):
+    """
+    Yield request items for a resource and its nested resources one at a time.
+    Only the request currently being built is held in memory.
+    """
+    resolver = resolver or RamlTypeResolver(types)
+    full_path = parent_path + resource_path
+    
+    yield from _iter_method_requests(full_path, resource_data, base_uri, types, resolver, original_request)
     
     # Process nested resources (keys starting with '/')
     for key, value in resource_data.items():
         if key.startswith('/') and isinstance(value, dict):
-            nested_requests = extract_requests_from_resource(key, value, base_uri, types, full_path)
-            requests.extend(nested_requests)
-    
-    return requests
+            yield from iter_requests_from_resource(key, value, base_uri, types, full_path, resolver, original_request)
 
 
-def organize_requests_into_folders(requests):
-    """Organize requests into folders based on their paths"""
-    folders = {}
+def extract_requests_from_resource(resource_path, resource_data, base_uri, types, parent_path="", resolver=None,
+                                   original_request='full'):
+    """Extract all requests from a resource and its nested resources"""
+    return list(iter_requests_from_resource(resource_path, resource_data, base_uri, types, parent_path, resolver,
+                                            original_request))
+
+
+def iter_resource_entries(resource_path, resource_data, base_uri, types, parent_path="", resolver=None,
+                          original_request='full', folder_levels=None):
+    """
+    Yield the contents of a resource's folder as the resource is traversed:
+    request items for its own methods, then a (folder_name, entries) pair for
+    each nested resource. Once folder_levels nested levels have been used up,
+    deeper resources are flattened into the current folder (None: no limit).
+    """
+    resolver = resolver or RamlTypeResolver(types)
+    full_path = parent_path + resource_path
     
-    for request in requests:
-        # Extract the main resource path (first part after the method)
-        request_name = request['name']
-        path_parts = request_name.split(' ', 1)[1].strip('/').split('/')
-        
-        if len(path_parts) > 0:
-            main_resource = path_parts[0]
-            
-            # Create folder if it doesn't exist
-            if main_resource not in folders:
-                folders[main_resource] = {
-                    "name": main_resource.replace('-', ' ').replace('_', ' ').title(),
-                    "item": []
-                }
-            
-            folders[main_resource]["item"].append(request)
+    yield from _iter_method_requests(full_path, resource_data, base_uri, types, resolver, original_request)
     
-    return list(folders.values())
+    for key, value in resource_data.items():
+        if key.startswith('/') and isinstance(value, dict):
+            if folder_levels is not None and folder_levels <= 0:
+                yield from iter_requests_from_resource(key, value, base_uri, types, full_path, resolver,
+                                                       original_request)
+            else:
+                nested_levels = None if folder_levels is None else folder_levels - 1
+                yield key, iter_resource_entries(key, value, base_uri, types, full_path, resolver, original_request,
+                                                 nested_levels)
+
+
+def iter_top_level_entries(resource_path, resource_data, base_uri, types, resolver=None, original_request='full',
+                           folder_depth=0):
+    """
+    Yield the entries a top-level resource contributes to its folder (see
+    folder_key_for_path). folder_depth limits the total folder nesting,
+    including the top-level folder itself; 0 means unlimited.
+    """
+    levels = folder_depth - 1 if folder_depth else None
+    remainder = resource_path.strip('/')[len(folder_key_for_path(resource_path)):]
+    if not remainder:
+        # e.g. /users: its methods go straight into the Users folder
+        yield from iter_resource_entries(resource_path, resource_data, base_uri, types, resolver=resolver,
+                                         original_request=original_request, folder_levels=levels)
+    elif levels is not None and levels <= 0:
+        yield from iter_requests_from_resource(resource_path, resource_data, base_uri, types, resolver=resolver,
+                                               original_request=original_request)
+    else:
+        # e.g. /users/{id}/settings becomes a '/{id}/settings' folder in Users
+        nested_levels = None if levels is None else levels - 1
+        yield remainder, iter_resource_entries(resource_path, resource_data, base_uri, types, resolver=resolver,
+                                               original_request=original_request, folder_levels=nested_levels)
+
+
+def materialize_entries(entries):
+    """Turn lazily produced folder entries into Postman items, dropping empty folders"""
+    items = []
+    for entry in entries:
+        if isinstance(entry, tuple):
+            folder_name, children = entry
+            children = materialize_entries(children)
+            if children:
+                items.append({"name": folder_name, "item": children})
+        else:
+            items.append(entry)
+    return items
+
+
+def count_requests(items):
+    """Count the requests in a list of Postman items, including nested folders"""
+    return sum(count_requests(item['item']) if 'item' in item else 1 for item in items)
+
+
+def iter_top_level_resources(raml_data):
+    """Yield (resource_path, resource_data) for every top-level resource"""
+    for resource_path, resource_data in raml_data.items():
+        if resource_path.startswith('/') and isinstance(resource_data, dict):
+            yield resource_path, resource_data
+
 
+def group_top_level_resources(raml_data):
+    """Group top-level resources by folder key, in order of first appearance"""
+    grouped = {}
+    for resource_path, resource_data in iter_top_level_resources(raml_data):
+        grouped.setdefault(folder_key_for_path(resource_path), []).append((resource_path, resource_data))
+    return grouped
 
-def build_postman_collection(raml_data):
-    """Build complete Postman collection from RAML data"""
+
+def assemble_folders(folder_keys, entry_lists):
+    """
+    Build the top-level folders from (folder_key, resource_count) pairs and the
+    per-resource entry lists, in the same order; empty folders are dropped.
+    """
+    entry_lists = iter(entry_lists)
+    folders = []
+    for folder_key, resource_count in folder_keys:
+        items = []
+        for _ in range(resource_count):
+            items.extend(next(entry_lists))
+        if items:
+            folders.append({"name": folder_display_name(folder_key), "item": items})
+    return folders
+
+
+# Per-process state for parallel extraction, set once by the pool initializer
+_worker_context = {}
+
+
+def _init_extraction_worker(base_uri, types, original_request, folder_depth, expander):
+    """Pool initializer: receive the shared conversion inputs once per worker"""
+    _worker_context['base_uri'] = base_uri
+    _worker_context['types'] = types
+    _worker_context['original_request'] = original_request
+    _worker_context['folder_depth'] = folder_depth
+    _worker_context['resolver'] = RamlTypeResolver(types)
+    _worker_context['expander'] = expander
+
+
+def _extract_in_worker(resource):
+    resource_path, resource_data = resource
+    resource_data = _worker_context['expander'].expand(resource_path, resource_data)
+    return materialize_entries(iter_top_level_entries(
+        resource_path, resource_data,
+        _worker_context['base_uri'], _worker_context['types'],
+        resolver=_worker_context['resolver'],
+        original_request=_worker_context['original_request'],
+        folder_depth=_worker_context['folder_depth']
+    ))
+
+
+def map_top_level_resources(resources, base_uri, types, original_request='full', jobs=1, expander=None,
+                            folder_depth=0):
+    """
+    Yield the folder entries (requests and nested folders) of each
+    (resource_path, resource_data) pair, in input order, after applying
+    resource types and traits. With jobs > 1 the resources are spread across
+    a process pool; type examples and expansions are context-independent, so
+    the output is identical to a serial run.
+    """
+    resources = list(resources)
+    expander = expander or RamlExpander()
+    if jobs <= 1 or len(resources) <= 1:
+        resolver = RamlTypeResolver(types)
+        for resource_path, resource_data in resources:
+            resource_data = expander.expand(resource_path, resource_data)
+            yield materialize_entries(iter_top_level_entries(resource_path, resource_data, base_uri, types, resolver,
+                                                             original_request, folder_depth))
+        return
+    
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_extraction_worker,
+                             initargs=(base_uri, types, original_request, folder_depth, expander)) as executor:
+        yield from executor.map(_extract_in_worker, resources)
+
+
+def folder_key_for_path(resource_path):
+    """Return the folder key (first path segment) a resource belongs to"""
+    return resource_path.strip('/').split('/')[0]
+
+
+def folder_display_name(folder_key):
+    """Turn a folder key such as 'user-accounts' into 'User Accounts'"""
+    return folder_key.replace('-', ' ').replace('_', ' ').title()
+
+
+def build_collection_info(raml_data):
+    """Build the collection 'info' block and 'variable' list from RAML data"""
     title = raml_data.get('title', 'API Collection')
     base_uri = raml_data.get('baseUri', 'https://api.example.com')
     version = raml_data.get('version', '')
     
+    info = {
+        "name": f"{title} {version}".strip(),
+        "description": f"Generated from RAML specification: {title}",
+        "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
+    }
+    variables = [
+        {
+            "key": "baseUrl",
+            "value": base_uri,
+            "type": "string"
+        }
+    ]
+    return info, variables
+
+
+def build_postman_collection(raml_data, original_request='full', jobs=1, folder_depth=0):
+    """
+    Build complete Postman collection from RAML data.
+    Each top-level path segment becomes a folder and nested resources become
+    nested folders, up to folder_depth levels in total (0: unlimited).
+    """
+    base_uri = raml_data.get('baseUri', 'https://api.example.com')
+    
     # Get type definitions
     types = raml_data.get('types', {})
     
-    # Extract all requests from all resources
-    all_requests = []
+    # Process all top-level resources (keys starting with '/'), grouped by folder
+    grouped = group_top_level_resources(raml_data)
+    resources = [resource for group in grouped.values() for resource in group]
+    expander = RamlExpander.from_raml(raml_data)
+    entry_lists = map_top_level_resources(resources, base_uri, types, original_request, jobs, expander,
+                                          folder_depth)
+    folders = assemble_folders(((key, len(group)) for key, group in grouped.items()), entry_lists)
     
-    # Process all top-level resources (keys starting with '/')
-    for resource_path, resource_data in raml_data.items():
-        if resource_path.startswith('/') and isinstance(resource_data, dict):
-            requests = extract_requests_from_resource(resource_path, resource_data, base_uri, types)
-            all_requests.extend(requests)
-    
-    # Organize requests into folders
-    folders = organize_requests_into_folders(all_requests)
+    info, variables = build_collection_info(raml_data)
     
     # Build final collection
     collection = {
-        "info": {
-            "name": f"{title} {version}".strip(),
-            "description": f"Generated from RAML specification: {title}",
-            "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
-        },
+        "info": info,
         "item": folders,
-        "variable": [
-            {
-                "key": "baseUrl",
-                "value": base_uri,
-                "type": "string"
-            }
-        ]
+        "variable": variables
     }
     
     return collection
 
 
+# Bump when a converter change makes previously generated requests stale
+INCREMENTAL_STATE_VERSION = 1
+
+
+def incremental_state_path(output_file):
+    """State file kept next to the output collection for --incremental runs"""
+    return output_file + '.state.json'
+
+
+def _content_hash(value):
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def referenced_types(value, types):
+    """Return the names of the types a definition uses, directly or indirectly"""
+    found = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            for name in item.split('|'):
+                name = name.strip().rstrip('[]')
+                if name in types and name not in found:
+                    found.add(name)
+                    stack.append(types[name])
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return found
+
+
+def _incremental_fingerprint(raml_data, original_request, folder_depth):
+    """Everything outside the resources that affects generated requests"""
+    return _content_hash([
+        INCREMENTAL_STATE_VERSION,
+        raml_data.get('baseUri', 'https://api.example.com'),
+        original_request,
+        folder_depth
+    ])
+
+
+def _previous_resource_items(state, collection):
+    """Map each top-level resource path of a previous run to its folder entries"""
+    grouped = {}
+    for entry in state['resources']:
+        grouped.setdefault(folder_key_for_path(entry['path']), []).append(entry)
+    
+    # Folders are only written when they have entries, in grouping order
+    folders = iter(collection['item'])
+    items_by_path = {}
+    for entries in grouped.values():
+        items = next(folders)['item'] if sum(entry['count'] for entry in entries) else []
+        offset = 0
+        for entry in entries:
+            items_by_path[entry['path']] = items[offset:offset + entry['count']]
+            offset += entry['count']
+    return items_by_path
+
+
+def _load_incremental_state(output_file, fingerprint):
+    try:
+        with open(incremental_state_path(output_file), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('fingerprint') != fingerprint:
+            return {}, {}
+        with open(output_file, 'r', encoding='utf-8') as f:
+            collection = json.load(f)
+        entries = {entry['path']: entry for entry in state['resources']}
+        return entries, _previous_resource_items(state, collection)
+    except FileNotFoundError:
+        return {}, {}
+    except Exception as e:
+        print(f"[WARNING] Ignoring previous incremental state: {str(e)}")
+        return {}, {}
+
+
+def build_postman_collection_incremental(raml_data, output_file, original_request='full', jobs=1, folder_depth=0):
+    """
+    Build the collection like build_postman_collection, re-extracting only the
+    top-level resources whose subtree (after resource types and traits) or
+    used types changed since the collection in output_file was generated.
+    Entries of unchanged resources are copied from the previous output.
+    Returns (collection, state, regenerated_count); the state should be
+    saved with save_incremental_state once the collection is written.
+    """
+    base_uri = raml_data.get('baseUri', 'https://api.example.com')
+    types = raml_data.get('types', {})
+    expander = RamlExpander.from_raml(raml_data)
+    fingerprint = _incremental_fingerprint(raml_data, original_request, folder_depth)
+    previous_entries, previous_items = _load_incremental_state(output_file, fingerprint)
+    
+    grouped = group_top_level_resources(raml_data)
+    entries = []
+    changed = []
+    for resource_path, resource_data in (resource for group in grouped.values() for resource in group):
+        resource_data = expander.expand(resource_path, resource_data)
+        entry = {
+            "path": resource_path,
+            "hash": _content_hash(resource_data),
+            "types": {name: _content_hash(types[name])
+                      for name in sorted(referenced_types(resource_data, types))}
+        }
+        previous = previous_entries.get(resource_path)
+        if (previous is None or resource_path not in previous_items
+                or previous['hash'] != entry['hash'] or previous['types'] != entry['types']):
+            changed.append((resource_path, resource_data))
+        entries.append(entry)
+    
+    # Resources are already expanded, so no expander is passed on
+    regenerated = dict(zip((path for path, _ in changed),
+                           map_top_level_resources(changed, base_uri, types, original_request, jobs,
+                                                   folder_depth=folder_depth)))
+    
+    entry_lists = []
+    for entry in entries:
+        items = regenerated.get(entry['path'])
+        if items is None:
+            items = previous_items[entry['path']]
+        entry['count'] = len(items)
+        entry_lists.append(items)
+    
+    info, variables = build_collection_info(raml_data)
+    collection = {
+        "info": info,
+        "item": assemble_folders(((key, len(group)) for key, group in grouped.items()), entry_lists),
+        "variable": variables
+    }
+    state = {"fingerprint": fingerprint, "resources": entries}
+    return collection, state, len(changed)
+
+
+def save_incremental_state(state, output_file):
+    """Save the per-resource hashes used by the next --incremental run"""
+    with open(incremental_state_path(output_file), 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+
+
+def iter_postman_folders(raml_data, original_request='full', jobs=1, folder_depth=0):
+    """
+    Yield (folder_name, entries) pairs without materialising requests, where
+    entries yields request items and nested (folder_name, entries) pairs.
+    Top-level resources are grouped by folder up front (only their keys are
+    inspected), so each folder's entries can be produced contiguously and in
+    the same order as build_postman_collection. Folders must be consumed in
+    the order they are yielded.
+    """
+    base_uri = raml_data.get('baseUri', 'https://api.example.com')
+    types = raml_data.get('types', {})
+    resolver = RamlTypeResolver(types)
+    expander = RamlExpander.from_raml(raml_data)
+    grouped = group_top_level_resources(raml_data)
+    
+    if jobs > 1:
+        # Extract every top-level resource in the pool, in folder order, and
+        # hand each folder the next len(resources) results
+        ordered = [resource for resources in grouped.values() for resource in resources]
+        results = map_top_level_resources(ordered, base_uri, types, original_request, jobs, expander, folder_depth)
+        for folder_key, resources in grouped.items():
+            def folder_entries(count=len(resources)):
+                for _ in range(count):
+                    yield from next(results)
+            yield folder_display_name(folder_key), folder_entries()
+        return
+    
+    for folder_key, resources in grouped.items():
+        def folder_entries(resources=resources):
+            for resource_path, resource_data in resources:
+                resource_data = expander.expand(resource_path, resource_data)
+                yield from iter_top_level_entries(resource_path, resource_data, base_uri, types, resolver,
+                                                  original_request, folder_depth)
+        yield folder_display_name(folder_key), folder_entries()
+
+
+def _dump_json_at_level(value, level):
+    """Serialise a value as json.dump(indent=2) would at the given nesting level"""
+    text = json.dumps(value, indent=2, ensure_ascii=False)
+    return text.replace('\n', '\n' + '  ' * level)
+
+
+def _write_entries(write, entries, level, pending):
+    """
+    Write the elements of a Postman 'item' array at the given nesting level.
+    Entries are request/folder dicts or lazy (folder_name, entries) pairs; a
+    lazy folder's opening is kept in `pending` and only written once something
+    inside it is, so empty folders never appear. Returns (written, requests).
+    """
+    written = 0
+    requests = 0
+    pad = '  ' * level
+    for entry in entries:
+        separator = ',' if written else ''
+        if isinstance(entry, tuple):
+            folder_name, children = entry
+            pending.append(f'{separator}\n{pad}{{\n{pad}  "name": {_dump_json_at_level(folder_name, level + 1)},'
+                           f'\n{pad}  "item": [')
+            child_count, child_requests = _write_entries(write, children, level + 2, pending)
+            if child_count:
+                write(f'\n{pad}  ]\n{pad}}}')
+                written += 1
+                requests += child_requests
+            else:
+                pending.pop()
+        else:
+            for text in pending:
+                write(text)
+            pending.clear()
+            write(f'{separator}\n{pad}{_dump_json_at_level(entry, level)}')
+            written += 1
+            requests += count_requests([entry])
+    return written, requests
+
+
+def write_postman_collection_stream(info, folders, variables, output_file):
+    """
+    Incrementally write a Postman collection to disk.
+    `folders` is an iterable of (folder_name, entries) pairs as produced by
+    iter_postman_folders; each request is serialised and written as soon as
+    it is produced. Output is byte-for-byte identical to
+    save_postman_collection on the same collection.
+    Returns a (folder_count, request_count) tuple.
+    """
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write('{\n  "info": ')
+        f.write(_dump_json_at_level(info, 1))
+        f.write(',\n  "item": [')
+        
+        folder_count, request_count = _write_entries(f.write, folders, 2, [])
+        
+        f.write('\n  ],\n' if folder_count else '],\n')
+        f.write('  "variable": ')
+        f.write(_dump_json_at_level(variables, 1))
+        f.write('\n}')
+    
+    return folder_count, request_count
+
+
+def stream_postman_collection(raml_data, output_file, original_request='full', jobs=1, folder_depth=0):
+    """Convert RAML data and stream the Postman collection straight to disk"""
+    info, variables = build_collection_info(raml_data)
+    folders = iter_postman_folders(raml_data, original_request, jobs, folder_depth)
+    return write_postman_collection_stream(info, folders, variables, output_file)
+
+
 def save_postman_collection(collection, output_file):
     """Save Postman collection to JSON file"""
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(collection, f, indent=2, ensure_ascii=False)
 
 
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Convert a RAML specification into a Postman collection")
+    parser.add_argument('raml_file', nargs='?', default='100_apis.raml', help="RAML file to convert")
+    parser.add_argument('output_file', nargs='?', default='postman_collection.json', help="Output collection file")
+    parser.add_argument('--stream', action='store_true',
+                        help="Write requests to disk as they are generated instead of building the whole collection in memory")
+    parser.add_argument('--original-request', choices=ORIGINAL_REQUEST_MODES, default='full',
+                        help="How response examples embed their request: full copy (default), "
+                             "slim (method and URL only) or dedup (omitted, taken from the parent request)")
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help="Extract top-level resources in N worker processes (default: 1, serial)")
+    parser.add_argument('--fast-load', action='store_true',
+                        help="Parse with the safe YAML loader (C-accelerated when ruamel.yaml.clib is installed)")
+    parser.add_argument('--cache-dir', metavar='DIR',
+                        help="Cache parsed RAML documents in DIR, keyed by a hash of the file contents")
+    parser.add_argument('--no-includes', action='store_true',
+                        help="Refuse !include and uses: (for specs from untrusted sources); otherwise they may only "
+                             "name files under the RAML file's directory")
+    parser.add_argument('--folder-depth', type=int, default=0, metavar='N',
+                        help="Nest folders for nested resources at most N levels deep; deeper resources are "
+                             "flattened into their folder (default: 0, unlimited; 1 gives one folder per "
+                             "top-level path segment)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only re-convert top-level resources that changed since the last run into the same "
+                             "output file (hashes are kept in <output_file>.state.json)")
+    args = parser.parse_args(argv)
+    if args.incremental and args.stream:
+        parser.error("--incremental cannot be combined with --stream")
+    return args
+
+
+# Command line options that only make sense when writing an output file
+FILE_ONLY_OPTIONS = ('raml_file', 'output_file', 'stream', 'incremental')
+
+# Types of the options whose command line default is None
+OPTION_TYPES = {'cache_dir': str}
+OPTION_TYPE_NAMES = {bool: "true or false", int: "an integer", str: "a string"}
+
+
+def check_option_type(name, value, default, expected=None):
+    """Raise ValueError unless value has the type of the option's default (or expected, when that is None)"""
+    expected = type(default) if default is not None else expected
+    if value is None and default is None:
+        return
+    # bool is an int subclass, but true is not a job count
+    if not isinstance(value, expected) or (expected is not bool and isinstance(value, bool)):
+        raise ValueError(f"Option '{name}' must be {OPTION_TYPE_NAMES[expected]}, got {value!r}")
+
+
+def conversion_args(options=None):
+    """
+    Return command line defaults overridden by `options`, keyed by the long
+    option names with underscores (e.g. {"original_request": "slim"})
+    """
+    args = parse_args(['spec.raml'])
+    options = options or {}
+    unknown = sorted(name for name in options if name not in vars(args) or name in FILE_ONLY_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unsupported RAML option(s): {', '.join(unknown)}")
+    for name, value in options.items():
+        check_option_type(name, value, getattr(args, name), OPTION_TYPES.get(name))
+        setattr(args, name, value)
+    if args.original_request not in ORIGINAL_REQUEST_MODES:
+        raise ValueError(f"original_request must be one of: {', '.join(ORIGINAL_REQUEST_MODES)}")
+    return args
+
+
+def convert_raml(raml_file, options=None):
+    """Convert a RAML file in-process and return the collection; `options` are as for conversion_args"""
+    args = conversion_args(options)
+    raml_data = load_raml(raml_file, fast=args.fast_load, cache_dir=args.cache_dir, includes=not args.no_includes)
+    return build_postman_collection(raml_data, args.original_request, args.jobs, args.folder_depth)
+
+
 def main():
     """Main function to convert RAML to Postman collection"""
-    import sys
-    
-    # Get file names from command line arguments
-    raml_file = sys.argv[1] if len(sys.argv) > 1 else '100_apis.raml'
-    output_file = sys.argv[2] if len(sys.argv) > 2 else 'postman_collection.json'
+    args = parse_args()
+    raml_file = args.raml_file
+    output_file = args.output_file
     
     try:
         print(f"Loading RAML file: {raml_file}")
-        raml_data = load_raml(raml_file)
+        raml_data = load_raml(raml_file, fast=args.fast_load, cache_dir=args.cache_dir, includes=not args.no_includes)
         
-        print("Converting RAML to Postman collection...")
-        collection = build_postman_collection(raml_data)
-        
-        print(f"Saving Postman collection to: {output_file}")
-        save_postman_collection(collection, output_file)
+        if args.stream:
+            print(f"Streaming Postman collection to: {output_file}")
+            folder_count, total_requests = stream_postman_collection(raml_data, output_file, args.original_request,
+                                                                     args.jobs, args.folder_depth)
+        else:
+            print("Converting RAML to Postman collection...")
+            if args.incremental:
+                collection, state, regenerated = build_postman_collection_incremental(
+                    raml_data, output_file, args.original_request, args.jobs, args.folder_depth)
+                print(f"[INCREMENTAL] Re-converted {regenerated} of {len(state['resources'])} top-level resources")
+            else:
+                collection = build_postman_collection(raml_data, args.original_request, args.jobs,
+                                                      args.folder_depth)
+            
+            print(f"Saving Postman collection to: {output_file}")
+            save_postman_collection(collection, output_file)
+            if args.incremental:
+                save_incremental_state(state, output_file)
+            
+            folder_count = len(collection['item'])
+            total_requests = count_requests(collection['item'])
         
         # Print summary (using ASCII characters to avoid encoding issues)
-        total_requests = sum(len(folder['item']) for folder in collection['item'])
         print(f"\n[SUCCESS] Conversion completed successfully!")
-        print(f"[FOLDERS] Created {len(collection['item'])} folders")
+        print(f"[FOLDERS] Created {folder_count} folders")
         print(f"[REQUESTS] Generated {total_requests} API requests")
         print(f"[OUTPUT] Saved to: {output_file}")
         
     except FileNotFoundError:
         print(f"[ERROR] RAML file '{raml_file}' not found.")
-        print("Usage: python raml_to_postman.py <raml_file> [output_file]")
+        print("Usage: python raml_to_postman.py <raml_file> [output_file] [options] (see --help)")
     except Exception as e:
         print(f"[ERROR] Error during conversion: {str(e)}")
         import traceback
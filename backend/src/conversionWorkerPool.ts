@@ -0,0 +1,172 @@
+// Pool of long-lived Python conversion workers (conversion_worker.py).
+// Each worker keeps its interpreter, imports and parsed schemas warm and
+// handles one conversion at a time; uploads beyond the pool size queue.
+//
+// Configuration (environment):
+//   CONVERSION_WORKERS     number of worker processes (default: CPU count, at most 4)
+//   CONVERSION_TIMEOUT_MS  kill a worker whose conversion takes longer (default: 300000)
+//   PYTHON_BIN             Python executable (default: python)
+//   RAML_CACHE_DIR         cache parsed RAML documents in this directory
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import os from 'os';
+import path from 'path';
+import readline from 'readline';
+
+export type ConversionKind = 'raml' | 'graphql';
+
+// src/ under ts-node-dev, dist/ once built; the scripts live one level up
+const BACKEND_DIR = path.join(__dirname, '..');
+const WORKER_SCRIPT = path.join(BACKEND_DIR, 'conversion_worker.py');
+const RESPAWN_DELAY_MS = 1000;
+
+interface ConversionJob {
+  id: number;
+  kind: ConversionKind;
+  input: string;
+  options: Record<string, unknown>;
+  resolve: (collection: any) => void;
+  reject: (error: Error) => void;
+}
+
+interface PoolWorker {
+  process: ChildProcessWithoutNullStreams;
+  job: ConversionJob | null;
+  timer: NodeJS.Timeout | null;
+}
+
+export class ConversionWorkerPool {
+  private workers: PoolWorker[] = [];
+  private queue: ConversionJob[] = [];
+  private nextId = 1;
+  private closed = false;
+
+  constructor(
+    private size: number,
+    private pythonBin = 'python',
+    private workerArgs: string[] = [],
+    private timeoutMs = 5 * 60 * 1000,
+  ) {
+    for (let i = 0; i < size; i++) {
+      this.workers.push(this.startWorker());
+    }
+  }
+
+  // Convert a file and resolve with the Postman collection
+  convert(kind: ConversionKind, input: string, options: Record<string, unknown> = {}): Promise<any> {
+    if (this.closed) {
+      return Promise.reject(new Error("Conversion worker pool is closed."));
+    }
+    return new Promise((resolve, reject) => {
+      this.queue.push({ id: this.nextId++, kind, input, options, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  // Let the workers exit once they see end of input
+  close() {
+    this.closed = true;
+    for (const job of this.queue.splice(0)) {
+      job.reject(new Error("Conversion worker pool is closed."));
+    }
+    for (const worker of this.workers) {
+      worker.process.stdin.end();
+    }
+  }
+
+  private startWorker(): PoolWorker {
+    const child = spawn(this.pythonBin, [WORKER_SCRIPT, ...this.workerArgs], { cwd: BACKEND_DIR });
+    const worker: PoolWorker = { process: child, job: null, timer: null };
+
+    readline.createInterface({ input: child.stdout }).on('line', (line) => this.onResponse(worker, line));
+    // Converter progress goes to stderr; only pass on its errors and warnings
+    readline.createInterface({ input: child.stderr }).on('line', (line) => {
+      if (line.startsWith('[ERROR]') || line.startsWith('[WARNING]')) {
+        console.error(`[conversion worker ${child.pid}] ${line}`);
+      }
+    });
+    // A write to a worker that just died; its exit handler rejects the job
+    child.stdin.on('error', () => {});
+    child.on('error', (error) => this.onExit(worker, error));
+    child.on('exit', (code, signal) => this.onExit(worker, new Error(`Conversion worker exited (${signal ?? code}).`)));
+    return worker;
+  }
+
+  private dispatch() {
+    for (const worker of this.workers) {
+      if (this.queue.length === 0) {
+        return;
+      }
+      if (worker.job) {
+        continue;
+      }
+      const job = this.queue.shift()!;
+      worker.job = job;
+      worker.timer = setTimeout(() => {
+        this.onExit(worker, new Error(`Conversion timed out after ${this.timeoutMs} ms.`));
+        worker.process.kill();
+      }, this.timeoutMs);
+      const request = { id: job.id, kind: job.kind, input: job.input, options: job.options };
+      worker.process.stdin.write(JSON.stringify(request) + "\n");
+    }
+  }
+
+  private release(worker: PoolWorker): ConversionJob | null {
+    const job = worker.job;
+    if (worker.timer) {
+      clearTimeout(worker.timer);
+    }
+    worker.job = null;
+    worker.timer = null;
+    return job;
+  }
+
+  private onResponse(worker: PoolWorker, line: string) {
+    let response: any;
+    try {
+      response = JSON.parse(line);
+    } catch (parseError) {
+      console.error("Ignoring malformed conversion worker output:", line.slice(0, 200));
+      return;
+    }
+    if (!worker.job || response.id !== worker.job.id) {
+      return;
+    }
+    const job = this.release(worker)!;
+    if (response.ok) {
+      job.resolve(response.collection);
+    } else {
+      job.reject(new Error(response.error));
+    }
+    this.dispatch();
+  }
+
+  // Fail the worker's current job and replace the worker
+  private onExit(worker: PoolWorker, error: Error) {
+    const index = this.workers.indexOf(worker);
+    if (index === -1) {
+      return;
+    }
+    this.workers.splice(index, 1);
+    this.release(worker)?.reject(error);
+    if (this.closed) {
+      return;
+    }
+    console.error("Conversion worker stopped:", error.message);
+    // Delay so a missing Python executable does not respawn in a tight loop
+    setTimeout(() => {
+      if (!this.closed) {
+        this.workers.push(this.startWorker());
+        this.dispatch();
+      }
+    }, RESPAWN_DELAY_MS);
+  }
+}
+
+const conversionPool = new ConversionWorkerPool(
+  Number(process.env.CONVERSION_WORKERS) || Math.max(1, Math.min(4, os.cpus().length)),
+  process.env.PYTHON_BIN || 'python',
+  process.env.RAML_CACHE_DIR ? ['--raml-cache-dir', process.env.RAML_CACHE_DIR] : [],
+  Number(process.env.CONVERSION_TIMEOUT_MS) || 5 * 60 * 1000,
+);
+
+export default conversionPool;
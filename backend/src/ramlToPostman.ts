@@ -5,7 +5,7 @@ import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import { dirname } from 'path';
-import { exec } from 'child_process';
+import conversionPool from './conversionWorkerPool';
 
 // const __filename = fileURLToPath(import.meta.url);
 // const __dirname = path.dirname(__filename);
@@ -19,41 +19,20 @@ router.post("/convertRamlToPostmanCollection", upload.single('ramlFile'), (req:a
   if (!req.file) {
     return res.status(400).json({ error: "No file uploaded." });
   }
-  const ramlPath = req.file.path;
-  const outputPath = `openapi-${Date.now()}.json`;
-
-  exec(`python raml_to_postman.py ${ramlPath} ${outputPath}`, (error, stdout, stderr) => {
-    if (error) {
-      console.error(stderr);
-      fs.unlinkSync(ramlPath); // Clean up RAML file even on error
-      return res.status(500).json({ error: "Conversion failed." });
-    }
-
-    // res.download(outputPath, () => {
-    //   fs.unlinkSync(ramlPath);
-    //   fs.unlinkSync(outputPath);
-    // });
-
-    fs.readFile(outputPath, "utf8", (err, data) => {
-      // Clean up files after reading
-      fs.unlinkSync(ramlPath);
-      fs.unlinkSync(outputPath);
-
-      if (err) {
-        console.error("Failed to read output file:", err);
-        return res.status(500).json({ error: "Failed to read output file." });
-      }
-
-      try {
-        const json = JSON.parse(data);
-        console.log("Parsed JSON:", json);
-        res.json(json);
-      } catch (parseError) {
-        console.error("Invalid JSON format:", parseError);
-        res.status(500).json({ error: "Invalid JSON format in output file." });
-      }
+  const ramlPath = path.resolve(req.file.path);
+
+  // Converted by a warm Python worker; the collection comes back over its stdout
+  conversionPool.convert('raml', ramlPath)
+    .then((json) => {
+      res.json(json);
+    })
+    .catch((error) => {
+      console.error("RAML conversion failed:", error.message);
+      res.status(500).json({ error: "Conversion failed." });
+    })
+    .finally(() => {
+      fs.unlink(ramlPath, () => {}); // Clean up the upload even on error
     });
-  });
 });
 
 export default router;
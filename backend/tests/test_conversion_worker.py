@@ -0,0 +1,98 @@
+import io
+import json
+
+import pytest
+
+import conversion_worker
+import graphql_to_postman
+
+SCHEMA = "type Book { id: ID! title: String }\ntype Query { book(id: ID!): Book }\n"
+
+SPEC = """#%RAML 1.0
+title: Books
+baseUri: https://api.example.com
+/books:
+  description: !include books.md
+  get:
+    description: List books
+"""
+
+
+@pytest.fixture
+def files(tmp_path):
+    (tmp_path / "schema.graphql").write_text(SCHEMA, encoding='utf-8')
+    (tmp_path / "spec.raml").write_text(SPEC, encoding='utf-8')
+    (tmp_path / "books.md").write_text("Books", encoding='utf-8')
+    return tmp_path
+
+
+def respond(request, **kwargs):
+    line = request if isinstance(request, str) else json.dumps(request)
+    return json.loads(conversion_worker.handle_request(line, graphql_to_postman.SchemaMemoryCache(2), **kwargs))
+
+
+def test_converts_graphql(files):
+    response = respond({"id": 7, "kind": "graphql", "input": str(files / "schema.graphql"),
+                        "options": {"max_fields": 10}})
+    assert response['id'] == 7 and response['ok']
+    assert response['collection'] == graphql_to_postman.convert_graphql(str(files / "schema.graphql"),
+                                                                        {"max_fields": 10})
+
+
+@pytest.mark.parametrize("request_line, error", [
+    ("{not json", "Expecting property name"),
+    ("[1, 2]", "Request must be a JSON object"),
+    ({"id": 1, "kind": "wsdl", "input": "a"}, "Unknown kind 'wsdl'"),
+    ({"id": 1, "kind": "graphql"}, "Request needs an 'input' file path"),
+    ({"id": 1, "kind": "graphql", "input": "a", "options": [1]}, "'options' must be a JSON object"),
+    ({"id": 1, "kind": "graphql", "input": "a", "options": {"output_file": "x"}},
+     "Unsupported GraphQL option(s): output_file"),
+    ({"id": 1, "kind": "raml", "input": "a", "options": {"bogus": 1}}, "Unsupported RAML option(s): bogus"),
+    ({"id": 1, "kind": "graphql", "input": "a", "options": {"jobs": "2"}}, "Option 'jobs' must be an integer, got '2'"),
+    ({"id": 1, "kind": "raml", "input": "a", "options": {"jobs": "2"}}, "Option 'jobs' must be an integer, got '2'"),
+    ({"id": 1, "kind": "graphql", "input": "a", "options": {"fragments": "yes"}},
+     "Option 'fragments' must be true or false"),
+    ({"id": 1, "kind": "graphql", "input": "a", "options": {"max_fields": True}},
+     "Option 'max_fields' must be an integer"),
+    ({"id": 1, "kind": "graphql", "input": "a", "options": {"include": "User.id"}},
+     "Option 'include' must be a list of strings"),
+    ({"id": 1, "kind": "raml", "input": "a", "options": {"original_request": "none"}},
+     "original_request must be one of"),
+])
+def test_invalid_requests_become_error_responses(request_line, error):
+    response = respond(request_line)
+    assert not response['ok']
+    assert error in response['error']
+    assert response['id'] == (None if isinstance(request_line, str) else 1)
+
+
+def test_missing_input_file_is_an_error_response(files):
+    response = respond({"id": 3, "kind": "graphql", "input": str(files / "missing.graphql")})
+    assert response['id'] == 3 and not response['ok']
+
+
+def test_null_options_keep_their_defaults(files):
+    response = respond({"id": 4, "kind": "graphql", "input": str(files / "schema.graphql"),
+                        "options": {"max_list_nesting": None}})
+    assert response['ok']
+
+
+def test_raml_includes_need_allow_includes(files):
+    request = {"id": 5, "kind": "raml", "input": str(files / "spec.raml")}
+    refused = respond(request)
+    assert not refused['ok'] and "includes are disabled" in refused['error']
+    assert respond(request, allow_includes=True)['ok']
+
+
+def test_serve_answers_every_line_in_order(files):
+    requests = io.StringIO("\n".join([
+        json.dumps({"id": 1, "kind": "graphql", "input": str(files / "schema.graphql")}),
+        "",
+        json.dumps({"id": 2, "kind": "graphql", "input": str(files / "schema.graphql"), "options": {"jobs": "2"}}),
+        json.dumps({"id": 3, "kind": "raml", "input": str(files / "spec.raml")}),
+    ]) + "\n")
+    responses = io.StringIO()
+    conversion_worker.serve(graphql_to_postman.SchemaMemoryCache(2), allow_includes=True,
+                            requests=requests, responses=responses)
+    answers = [json.loads(line) for line in responses.getvalue().splitlines()]
+    assert [(answer['id'], answer['ok']) for answer in answers] == [(1, True), (2, False), (3, True)]
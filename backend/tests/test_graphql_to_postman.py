@@ -0,0 +1,205 @@
+import json
+import sys
+import time
+
+import pytest
+
+import graphql_to_postman
+
+
+def test_trailing_whitespace_tokenizes_in_linear_time():
+    # Every tail used to make the skip prefix backtrack exponentially
+    for tail in ("\n" * 40, "   \n" * 40, "\n" * 200000, "# comment\n, ,\n" * 20000):
+        start = time.perf_counter()
+        tokens = graphql_to_postman.tokenize_schema("type Query { a: Int }" + tail)
+        assert time.perf_counter() - start < 1
+        assert tokens == ['type', 'Query', '{', 'a', ':', 'Int', '}', graphql_to_postman.EOF_TOKEN]
+
+
+def test_trailing_whitespace_still_reports_unexpected_end():
+    with pytest.raises(ValueError, match="Unexpected end of schema"):
+        graphql_to_postman.GraphQLSchemaParser("type Query { a: Int\n" + "   \n" * 40, cache_dir=None)
+
+
+def test_split_schema_definitions_is_linear_on_a_tail_without_boundaries():
+    # A tail without braces, strings or comments used to be rescanned from every position
+    content = "type A { a: Int }\n" + "scalar S\n" * 200000
+    start = time.perf_counter()
+    chunks = graphql_to_postman.split_schema_definitions(content, 4)
+    assert time.perf_counter() - start < 2
+    assert "".join(chunk for chunk, _ in chunks) == content
+
+
+def test_index_schema_definitions_is_linear_on_trailing_comments():
+    # Each comment after the last body used to rescan the rest of the tail
+    content = "type A { a: Int }\n" + "# comment\n   \n" * 50000
+    start = time.perf_counter()
+    definitions = graphql_to_postman.index_schema_definitions(content)
+    assert time.perf_counter() - start < 2
+    assert [(keyword, name) for _, keyword, name, _, _ in definitions] == [('type', 'A')]
+
+
+# B is first expanded under C, where its A cuts at C's A; on its own it must
+# still come out the same
+RECURSIVE_INPUTS = """
+input A { b: B! n: Int }
+input B { a: A! }
+input C { a: A! }
+type Query {
+  c(x: C): Int  b(y: B): Int  a(z: A): Int
+  c2(x: C!): Int  b2(y: B): Int  a2(z: A): Int
+}
+"""
+
+
+def test_input_examples_do_not_depend_on_expansion_order():
+    parser = graphql_to_postman.GraphQLSchemaParser(RECURSIVE_INPUTS, cache_dir=None)
+    converter = graphql_to_postman.GraphQLToPostmanConverter(parser)
+    in_order = [converter.generate_variables(field) for field in parser.queries]
+    converter = graphql_to_postman.GraphQLToPostmanConverter(parser)
+    reversed_order = [converter.generate_variables(field) for field in reversed(parser.queries)][::-1]
+    alone = [graphql_to_postman.GraphQLToPostmanConverter(parser).generate_variables(field)
+             for field in parser.queries]
+    assert in_order == alone == reversed_order
+
+
+def collection_text(schema, jobs, **options):
+    parser = graphql_to_postman.GraphQLSchemaParser(schema, cache_dir=None)
+    converter = graphql_to_postman.GraphQLToPostmanConverter(parser, **options)
+    return json.dumps(converter.create_postman_collection("Test", jobs), indent=2)
+
+
+@pytest.mark.parametrize("jobs", [2, 3])
+def test_parallel_conversion_matches_serial(jobs):
+    # Each worker expands only its own chunk of the root fields
+    assert collection_text(RECURSIVE_INPUTS, jobs) == collection_text(RECURSIVE_INPUTS, 1)
+
+
+USERS = """
+type User { id: ID! name: String posts: [Post] friend: User }
+type Post { id: ID! title: String author: User }
+type Query { user: User  users: [User]  post: Post }
+"""
+
+
+def test_fragments_cover_budgeted_selections():
+    parser = graphql_to_postman.GraphQLSchemaParser(USERS, cache_dir=None)
+    converter = graphql_to_postman.GraphQLToPostmanConverter(
+        parser, budget=graphql_to_postman.SelectionBudget(max_fields=6), fragments=True)
+    assert converter.build_query_string(parser.queries[0]) == """query query_user {
+  user {
+    ...UserBudget
+  }
+}
+
+fragment UserBudget on User {
+  id
+  name
+  posts {
+    ...UserBudgetPost
+  }
+}
+
+fragment UserBudgetPost on Post {
+  id
+  title
+}"""
+
+
+@pytest.mark.parametrize("max_fields", [None, 6])
+def test_parallel_fragments_match_serial(max_fields):
+    options = {'budget': graphql_to_postman.SelectionBudget(max_fields=max_fields), 'fragments': True}
+    assert collection_text(USERS, 2, **options) == collection_text(USERS, 1, **options)
+
+
+LIBRARY_SCHEMA = """
+interface Node { id: ID! }
+type Author implements Node { id: ID! name: String books: [Book] }
+type Book implements Node { id: ID! title: String author: Author }
+type Shelf { id: ID! label: String }
+union SearchResult = Author | Book
+input BookFilter { title: String author: ID }
+type Query {
+  author(id: ID!): Author
+  books(filter: BookFilter): [Book]
+  shelf(id: ID!): Shelf
+  node(id: ID!): Node
+  search(text: String!): [SearchResult]
+}
+type Mutation { renameShelf(id: ID!, label: String!): Shelf }
+"""
+
+# (text replaced, replacement, operations regenerated, operations in total)
+SCHEMA_EDITS = {
+    'type_field': ("type Book implements Node { id: ID! title: String",
+                   "type Book implements Node { id: ID! title: String isbn: String", 4, 6),
+    'input_field': ("input BookFilter { title: String", "input BookFilter { title: String year: Int", 1, 6),
+    'new_root_field': ("  shelf(id: ID!): Shelf\n", "  shelf(id: ID!): Shelf\n  shelves: [Shelf]\n", 1, 7),
+    'removed_root_field': ("  node(id: ID!): Node\n", "", 0, 5),
+}
+
+
+def run_graphql_main(monkeypatch, *argv):
+    monkeypatch.setattr(sys, 'argv', ['graphql_to_postman.py', *argv])
+    graphql_to_postman.main()
+
+
+@pytest.mark.parametrize("edit", sorted(SCHEMA_EDITS))
+def test_incremental_update_matches_full_rebuild(tmp_path, monkeypatch, capsys, edit):
+    schema_file = tmp_path / "schema.graphql"
+    output_file = tmp_path / "collection.json"
+    full_file = tmp_path / "full.json"
+    cache_dir = str(tmp_path / "cache")
+    schema_file.write_text(LIBRARY_SCHEMA, encoding='utf-8')
+    run_graphql_main(monkeypatch, str(schema_file), str(output_file), '--incremental', '--cache-dir', cache_dir)
+
+    old, new, regenerated, total = SCHEMA_EDITS[edit]
+    schema_file.write_text(LIBRARY_SCHEMA.replace(old, new), encoding='utf-8')
+    capsys.readouterr()
+    run_graphql_main(monkeypatch, str(schema_file), str(output_file), '--incremental', '--cache-dir', cache_dir)
+    assert f"Regenerated {regenerated} of {total} operations" in capsys.readouterr().out
+
+    run_graphql_main(monkeypatch, str(schema_file), str(full_file), '--no-cache')
+    assert output_file.read_bytes() == full_file.read_bytes()
+
+
+LAZY_EXTRA = """
+type Unused { id: ID! shelf: Shelf }
+extend type Book { pages: Int shelf: Shelf }
+input UnusedInput { id: ID }
+type Review { id: ID! book: Book query: Query }
+extend type Query { review(id: ID!): Review unused: Unused }
+"""
+
+
+# (include, exclude, types left unparsed); review's Review.query reaches the whole Query type
+LAZY_FILTERS = [
+    (["author", "search"], [], {'BookFilter', 'Node', 'Review', 'Unused', 'UnusedInput'}),
+    (["book*"], [], {'Node', 'Review', 'SearchResult', 'Unused', 'UnusedInput'}),
+    (["review"], [], {'UnusedInput'}),
+    ([], ["unused", "shelf", "review"], {'Review', 'Unused', 'UnusedInput'}),
+]
+
+
+@pytest.mark.parametrize("include, exclude, unparsed", LAZY_FILTERS)
+@pytest.mark.parametrize("multiple_files", [False, True])
+def test_lazy_filtered_parse_matches_full_parse(tmp_path, include, exclude, unparsed, multiple_files):
+    schema = [("a.graphql", LIBRARY_SCHEMA), ("b.graphql", LAZY_EXTRA)] if multiple_files \
+        else LIBRARY_SCHEMA + LAZY_EXTRA
+    operations = graphql_to_postman.OperationFilter(include, exclude)
+    cache_dir = str(tmp_path / "cache")
+    # A filtered parse of a cached schema starts from every type
+    graphql_to_postman.GraphQLSchemaParser(schema, cache_dir=cache_dir)
+    full = graphql_to_postman.GraphQLSchemaParser(schema, cache_dir=cache_dir, operations=operations)
+    lazy = graphql_to_postman.GraphQLSchemaParser(schema, cache_dir=None, operations=operations)
+    assert lazy.partial and not full.partial
+    assert set(full.types) - set(lazy.types) == unparsed
+    # Unselected root fields may name unparsed types unless the root type is reached from another type
+    root_types = set(lazy.root_type_names.values())
+    assert all(lazy.types[name] == full.types[name] for name in lazy.types
+               if name not in root_types or (name == 'Query' and include == ["review"]))
+    for operation in ('queries', 'mutations', 'subscriptions'):
+        assert getattr(lazy, operation) == getattr(full, operation)
+    full_collection = graphql_to_postman.GraphQLToPostmanConverter(full).create_postman_collection()
+    lazy_collection = graphql_to_postman.GraphQLToPostmanConverter(lazy).create_postman_collection()
+    assert json.dumps(lazy_collection, indent=2) == json.dumps(full_collection, indent=2)
@@ -0,0 +1,263 @@
+import json
+
+import pytest
+
+import raml_to_postman
+
+# Mutually recursive types, the case where cached examples used to depend on
+# which type was resolved first
+RECURSIVE_TYPES = {
+    'A': {'type': 'object', 'properties': {'b': 'B', 'name': 'string'}},
+    'B': {'type': 'object', 'properties': {'a': 'A', 'items': 'B[]'}},
+    'C': {'properties': {'a': 'A', 'count': {'type': 'integer'}}},
+}
+
+
+def test_type_examples_do_not_depend_on_resolution_order():
+    expected = {name: raml_to_postman.RamlTypeResolver(RECURSIVE_TYPES).example(name) for name in RECURSIVE_TYPES}
+    for order in (['A', 'B', 'C'], ['B', 'A', 'C'], ['C', 'B', 'A']):
+        resolver = raml_to_postman.RamlTypeResolver(RECURSIVE_TYPES)
+        for name in order:
+            assert resolver.example(name) == expected[name]
+    assert expected['B'] == {'a': {'b': None, 'name': "example string"}, 'items': []}
+
+
+def test_wide_acyclic_type_examples_stay_small():
+    # Each type points at the next one twice, so unbounded examples double in size per level
+    types = {f'T{index}': {'type': 'object', 'properties': {'left': f'T{index + 1}', 'right': f'T{index + 1}'}}
+             for index in range(21)}
+    types['T21'] = {'type': 'object', 'properties': {'name': 'string'}}
+    resolver = raml_to_postman.RamlTypeResolver(types)
+    example = resolver.example('T0')
+    for _ in range(raml_to_postman.MAX_EXAMPLE_DEPTH - 1):
+        example = example['left']
+    assert example == {'left': None, 'right': None}
+    assert len(resolver.serialized_example('T0', 'application/json')) < 10000
+    assert resolver.example('T3') == raml_to_postman.RamlTypeResolver(types).example('T3')
+
+
+RECURSIVE_SPEC = """#%RAML 1.0
+title: Recursive
+baseUri: https://api.example.com
+types:
+  A:
+    type: object
+    properties:
+      b: B
+      name: string
+  B:
+    type: object
+    properties:
+      a: A
+      items: B[]
+/aaa:
+  get:
+    responses:
+      200:
+        body:
+          application/json:
+            type: A
+/bbb:
+  post:
+    body:
+      application/json:
+        type: B
+    responses:
+      200:
+        body:
+          application/json:
+            type: B
+/ccc:
+  get:
+    responses:
+      200:
+        body:
+          application/json:
+            type: B
+"""
+
+
+def write_spec(tmp_path, text=RECURSIVE_SPEC):
+    spec_file = tmp_path / "spec.raml"
+    spec_file.write_text(text, encoding='utf-8')
+    return str(spec_file)
+
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    raml_data = raml_to_postman.load_raml(write_spec(tmp_path))
+    serial = json.dumps(raml_to_postman.build_postman_collection(raml_data), indent=2)
+    for jobs in (2, 3):
+        assert json.dumps(raml_to_postman.build_postman_collection(raml_data, jobs=jobs), indent=2) == serial
+
+
+def test_incremental_rebuild_matches_full_build(tmp_path):
+    spec_file = write_spec(tmp_path)
+    output_file = str(tmp_path / "collection.json")
+    collection, state, _ = raml_to_postman.build_postman_collection_incremental(
+        raml_to_postman.load_raml(spec_file), output_file)
+    raml_to_postman.save_postman_collection(collection, output_file)
+    raml_to_postman.save_incremental_state(state, output_file)
+
+    write_spec(tmp_path, RECURSIVE_SPEC.replace("/bbb:\n", "/bbb:\n  description: Edited\n"))
+    raml_data = raml_to_postman.load_raml(spec_file)
+    collection, state, regenerated = raml_to_postman.build_postman_collection_incremental(raml_data, output_file)
+    assert regenerated == 1
+    assert json.dumps(collection, indent=2) == json.dumps(raml_to_postman.build_postman_collection(raml_data),
+                                                          indent=2)
+
+
+def test_method_traits_add_to_resource_type_traits(tmp_path):
+    spec = """#%RAML 1.0
+title: Traits
+baseUri: https://api.example.com
+traits:
+  pageable:
+    queryParameters:
+      page:
+        type: integer
+  secured:
+    headers:
+      Authorization:
+        type: string
+  sortable:
+    queryParameters:
+      sort:
+        type: string
+resourceTypes:
+  base:
+    get:
+      is: [sortable]
+  collection:
+    type: base
+    get:
+      is: [pageable]
+/items:
+  type: collection
+  get:
+    is: [secured]
+"""
+    raml_data = raml_to_postman.load_raml(write_spec(tmp_path, spec))
+    method = raml_to_postman.RamlExpander.from_raml(raml_data).expand('/items', raml_data['/items'])['get']
+    assert method['is'] == ['secured', 'pageable', 'sortable']
+    assert set(method['queryParameters']) == {'page', 'sort'}
+    assert 'Authorization' in method['headers']
+
+
+INCLUDING_SPEC = """#%RAML 1.0
+title: Includes
+baseUri: https://api.example.com
+/items:
+  description: !include {path}
+  get:
+    description: List items
+"""
+
+
+def test_includes_stay_inside_the_spec_directory(tmp_path):
+    project = tmp_path / "project"
+    (project / "docs").mkdir(parents=True)
+    (project / "docs" / "items.md").write_text("Items", encoding='utf-8')
+    (tmp_path / "secret.txt").write_text("secret", encoding='utf-8')
+    spec_file = project / "spec.raml"
+
+    spec_file.write_text(INCLUDING_SPEC.format(path="docs/items.md"), encoding='utf-8')
+    assert raml_to_postman.load_raml(str(spec_file))['/items']['description'] == "Items"
+    with pytest.raises(ValueError, match="includes are disabled"):
+        raml_to_postman.convert_raml(str(spec_file), {'no_includes': True})
+
+    for path in ("../secret.txt", str(tmp_path / "secret.txt")):
+        spec_file.write_text(INCLUDING_SPEC.format(path=path), encoding='utf-8')
+        with pytest.raises(ValueError, match="outside"):
+            raml_to_postman.load_raml(str(spec_file))
+
+
+def test_cached_fragments_are_not_shared_between_documents(tmp_path):
+    (tmp_path / "types.raml").write_text("Local:\n  type: object\n  properties:\n    id: string\n", encoding='utf-8')
+    (tmp_path / "lib.raml").write_text("#%RAML 1.0 Library\ntypes:\n  Thing:\n    type: string\n", encoding='utf-8')
+    header = "#%RAML 1.0\ntitle: Shared\nbaseUri: https://api.example.com\n"
+    (tmp_path / "a.raml").write_text(header + "uses:\n  lib: lib.raml\ntypes: !include types.raml\n", encoding='utf-8')
+    (tmp_path / "b.raml").write_text(header + "types: !include types.raml\n", encoding='utf-8')
+
+    assert sorted(raml_to_postman.load_raml(str(tmp_path / "a.raml"))['types']) == ['Local', 'lib.Thing']
+    assert sorted(raml_to_postman.load_raml(str(tmp_path / "b.raml"))['types']) == ['Local']
+
+
+LIBRARY = """#%RAML 1.0 Library
+types:
+  Item:
+    type: object
+    properties:
+      id: string
+traits:
+  pageable:
+    queryParameters:
+      page:
+        type: integer
+resourceTypes:
+  base:
+    post:
+      body:
+        application/json:
+          type: Item
+  collection:
+    type: base
+    is: [pageable]
+    get:
+      responses:
+        200:
+          body:
+            application/json:
+              type: Item[]
+"""
+
+
+def test_library_resource_types_use_library_local_names(tmp_path):
+    (tmp_path / "lib.raml").write_text(LIBRARY, encoding='utf-8')
+    spec = """#%RAML 1.0
+title: Library
+baseUri: https://api.example.com
+uses:
+  lib: lib.raml
+/items:
+  type: lib.collection
+"""
+    raml_data = raml_to_postman.load_raml(write_spec(tmp_path, spec))
+    resource = raml_to_postman.RamlExpander.from_raml(raml_data).expand('/items', raml_data['/items'])
+    assert 'page' in resource['get']['queryParameters']
+    assert resource['get']['responses'][200]['body']['application/json']['type'] == 'lib.Item[]'
+    assert resource['post']['body']['application/json']['type'] == 'lib.Item'
+
+
+NESTED_SPEC = RECURSIVE_SPEC + """/users:
+  get:
+    description: List users
+  /{userId}:
+    uriParameters:
+      userId:
+        type: string
+    get:
+      responses:
+        200:
+          body:
+            application/json:
+              type: A
+        404:
+          description: Missing
+    /posts:
+      post:
+        body:
+          application/json:
+            type: B
+"""
+
+
+@pytest.mark.parametrize("original_request", raml_to_postman.ORIGINAL_REQUEST_MODES)
+@pytest.mark.parametrize("folder_depth", [0, 1])
+def test_streamed_output_matches_in_memory_output(tmp_path, original_request, folder_depth):
+    raml_data = raml_to_postman.load_raml(write_spec(tmp_path, NESTED_SPEC))
+    in_memory = tmp_path / "in_memory.json"
+    streamed = tmp_path / "streamed.json"
+    collection = raml_to_postman.build_postman_collection(raml_data, original_request, folder_depth=folder_depth)
+    raml_to_postman.save_postman_collection(collection, str(in_memory))
+    raml_to_postman.stream_postman_collection(raml_data, str(streamed), original_request, folder_depth=folder_depth)
+    assert streamed.read_bytes() == in_memory.read_bytes()